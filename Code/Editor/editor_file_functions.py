@@ -1,7 +1,8 @@
+import os
 import json
 from jsonschema import validate
 from __main__ import PATH
-from Code.utilities import path_exists, create_folder
+from Code.utilities import path_exists, create_folder, PROJECTS_FOLDER
 
 
 PROJECT_NAME_CHARACTER_LIMIT = 50
@@ -16,7 +17,7 @@ def create_project(project_name):
     if project_name > PROJECT_NAME_CHARACTER_LIMIT:
         return False, f'project name must be less than {PROJECT_NAME_CHARACTER_LIMIT} characters'
     
-    project_path = PATH + '\\Projects\\' + project_name
+    project_path = os.path.join(PATH, PROJECTS_FOLDER, project_name)
     if path_exists(project_path):
         return False, f'project named "{project_name}" already exists'
 
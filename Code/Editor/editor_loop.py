@@ -3,16 +3,16 @@ import random
 import pygame
 from copy import deepcopy
 from Code.utilities import rgba_to_glsl, percent_to_rgba, COLORS, get_text_height, get_text_width, point_is_in_ltwh, IMAGE_PATHS, loading_and_unloading_images_manager, get_rect_minus_borders, round_scaled, ceil_scaled, floor_scaled, LOADED_IN_EDITOR, LOADED_IN_GAME, LOADED_IN_MENU, OFF_SCREEN, move_number_to_desired_range, get_time, switch_to_base10, base10_to_hex, add_characters_to_front_of_string
-from Code.Editor.editor_update import update_palette, update_header, update_footer, update_tools, update_add_color, update_tool_attributes, update_collision_selector
+from Code.Editor.editor_update import update_palette, update_header, update_header_dropdown, update_footer, update_footer_information, update_tools, update_add_color, update_tool_attributes, update_collision_selector
 from Code.Editor.editor_utilities import TextInput, CurrentlySelectedColor, HeaderManager, ScrollBar, EditorMap, get_tf_circle
 from Code.Editor.editor_utilities import EditorTool, MarqueeRectangleTool, LassoTool, PencilTool, EraserTool, SprayTool, HandTool, BucketTool, LineTool, CurvyLineTool, RectangleEllipseTool, BlurTool, JumbleTool, EyedropTool
-from Code.Editor.editor_utilities import MapModes, EditorModes, CollisionSelector, CollisionMode
+from Code.Editor.editor_utilities import MapModes, EditorModes, CollisionSelector, CollisionMode, RetainedPanels
 import random
 
 
 
 class EditorSingleton():
-    def __init__(self, Render, Screen, gl_context, PATH):
+    def __init__(self, Render, Screen, gl_context, PATH, level_path: str):
         self.editor_enabled = True
         self.border_color = COLORS['BLACK']
         self.map_mode = MapModes.PRETTY
@@ -129,6 +129,7 @@ class EditorSingleton():
         self.footer_color = COLORS['BLUE']
         self.footer_ltwh = [0, 0, 0, self.header_height]
         self.footer_text_pixel_size = 3
+        self.footer_information = []  # FooterInfo shown by the current tool
         self.active_color_circle_padding = 3
         self.footer_active_color_outline_thickness = 1
         self.footer_active_color_circle_wh = self.footer_ltwh[3] - (2 * self.active_color_circle_padding)
@@ -253,7 +254,7 @@ class EditorSingleton():
         self.image_horizontal_scroll = ScrollBar(scroll_area_lt=[0, 0], is_vertical=False, scroll_thickness=22, scroll_length=50, scroll_area_border_thickness=self.image_large_border_thickness, scroll_border_thickness=5, border_color=COLORS['PINK'], background_color=COLORS['WHITE'], scroll_border_color=COLORS['RED'], unhighlighted_color=COLORS['WHITE'], shaded_color=COLORS['LIGHT_GREY'], highlighted_color=COLORS['GREY'])
         self.image_area_ltwh = [0, 0, 0, 0]
         self.window_resize_last_frame = False
-        self.map: EditorMap = EditorMap(PATH, Screen, gl_context, Render, PATH)
+        self.map: EditorMap = EditorMap(PATH, Screen, gl_context, Render, level_path)
         #
         # tool attribute area
         self.tool_attribute_ltwh = [0, 0, 0, 0]
@@ -282,6 +283,10 @@ class EditorSingleton():
         # other
         self.stored_draws = []
         self.xy = [0, 0]
+        self.retained_panels = RetainedPanels()
+
+    def quit(self):
+        self.map.quit()
 
     def get_color_spectrum_ltwh(self):
         return [self.palette_padding + self.add_color_spectrum_border_thickness, 
@@ -332,16 +337,53 @@ def update_image(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, C
 def editor_loop(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
     if Api.setup_required:
         loading_and_unloading_images_manager(Screen, Render, gl_context, IMAGE_PATHS, [LOADED_IN_EDITOR], [LOADED_IN_MENU, LOADED_IN_GAME])
-        Api.api_initiated_singletons['Editor'] = Api.api_singletons['Editor'](Render, Screen, gl_context, PATH)
+        Api.api_initiated_singletons['Editor'] = Api.api_singletons['Editor'](Render, Screen, gl_context, PATH, Api.get_level_path())
         Api.setup_required = False
     #
     Cursor.add_cursor_this_frame('cursor_arrow')
     Singleton = Api.api_initiated_singletons[Api.current_api]
+    # the map passes are timed separately inside update_image
+    Render.begin_pass('ui panels')
     update_image(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_palette(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_header(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_footer(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_add_color(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_collision_selector(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_tools(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-    update_tool_attributes(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    # panels are only drawn again when something that could change them happened; otherwise their texture from an earlier frame is drawn
+    Singleton.retained_panels.update(Screen, Keys)
+    text_input_selected = TextInput.any_selected()
+    header_ltwh = [0, 0, Screen.width, Singleton.header_bottom]
+    tool_attributes_ltwh = [0, Singleton.tool_attribute_ltwh[1], Screen.width, Singleton.tool_attribute_ltwh[3]]
+    # the color under the cursor shown in the footer changes while tiles load
+    if Singleton.map.has_pending_work():
+        Singleton.retained_panels.invalidate('footer_information')
+    update_retained_panel(Singleton, 'palette', update_palette, Singleton.palette_ltwh, Singleton.palette_ltwh, False, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    update_retained_panel(Singleton, 'header', update_header, header_ltwh, header_ltwh, Singleton.header_selected, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    # the open dropdown is a panel of its own so the header's texture is only as big as the header
+    if Singleton.header_selected:
+        header_dropdown_ltwh = Singleton.header_options[Singleton.header_string_selected].box_ltwh
+        update_retained_panel(Singleton, 'header_dropdown', update_header_dropdown, header_dropdown_ltwh, header_dropdown_ltwh, False, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+        # closing the dropdown changes the header, which has already been drawn this frame
+        if not Singleton.header_selected:
+            Singleton.retained_panels.invalidate('header')
+            Api.idle_frames.damage()
+    update_retained_panel(Singleton, 'footer', update_footer, Singleton.footer_ltwh, Singleton.footer_ltwh, False, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    update_retained_panel(Singleton, 'add_color', update_add_color, Singleton.add_color_ltwh, Singleton.add_color_ltwh, text_input_selected, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    update_retained_panel(Singleton, 'collision_selector', update_collision_selector, Singleton.collision_selector_ltwh, Singleton.collision_selector_ltwh, False, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    update_retained_panel(Singleton, 'tools', update_tools, Singleton.tool_bar_ltwh, Singleton.tool_bar_ltwh, False, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    update_retained_panel(Singleton, 'tool_attributes', update_tool_attributes, tool_attributes_ltwh, tool_attributes_ltwh, text_input_selected, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    # the information tool attributes show in the footer (e.g. the cursor position on the map)
+    update_retained_panel(Singleton, 'footer_information', update_footer_information, Singleton.footer_ltwh, Singleton.map.image_space_ltwh, False, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    Render.end_pass()
+    # the next frame has to be drawn even without input while tiles are loading or a text input's line is blinking
+    if Singleton.map.has_pending_work() or text_input_selected:
+        Api.idle_frames.damage()
+
+
+def update_retained_panel(Singleton, panel_name, update_function, ltwh, hover_ltwh, always_redraw, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
+    # the panel is always updated; it is only drawn when it needs to be
+    # ltwh is the area the panel draws in; some panels only work out their area while they are updated
+    drawn_ltwh = list(ltwh)
+    Render.begin_panel(Screen, gl_context, panel_name, drawn_ltwh, Singleton.retained_panels.needs_redraw(panel_name, hover_ltwh, always_redraw))
+    update_function(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    Render.end_panel(Screen, gl_context, panel_name)
+    # a panel whose area changed while it was updated was cut off; it is drawn into its new area next frame
+    if list(ltwh) != drawn_ltwh:
+        Singleton.retained_panels.invalidate(panel_name)
+        Api.idle_frames.damage()
@@ -288,7 +288,6 @@ def update_header(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys,
     # header banner
     header_ltwh = (0, 0, Screen.width, Singleton.header_height)
     Render.basic_rect_ltwh_with_color_to_quad(Screen, gl_context, 'blank_pixel', header_ltwh, Singleton.header_background_color)
-    mouse_in_header = point_is_in_ltwh(Keys.cursor_x_pos.value, Keys.cursor_y_pos.value, header_ltwh)
     #
     # header options
     already_highlighted_an_option = False
@@ -311,20 +310,10 @@ def update_header(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys,
     # header border
     Render.basic_rect_ltwh_with_color_to_quad(Screen, gl_context, 'blank_pixel', (0, Singleton.header_height, Screen.width, Singleton.header_border_thickness), Singleton.header_border_color)
     #
-    # selected header options
-    deselect_headers = False
+    # selected header option; its options are drawn by update_header_dropdown
     if Singleton.header_selected:
-        selected_header_manager = Singleton.header_options[Singleton.header_string_selected]
         Render.basic_rect_ltwh_with_color_to_quad(Screen, gl_context, 'blank_pixel', Singleton.header_hover_ltwh[Singleton.header_index_selected], Singleton.header_selected_color)
         Render.draw_string_of_characters(Screen, gl_context, list(Singleton.header_options.keys())[Singleton.header_index_selected], (Singleton.header_strings_lefts[Singleton.header_index_selected], Singleton.header_strings_top), Singleton.header_text_pixel_size, Singleton.header_text_pixel_color)
-        deselect_headers = selected_header_manager.update(Screen, gl_context, Keys, Render, Cursor)
-    #
-    # deselect header options
-    if not mouse_in_header and deselect_headers:
-        Singleton.header_selected = False
-        Singleton.header_which_selected = [False for _ in Singleton.header_which_selected]
-        Singleton.header_string_selected = ''
-        Singleton.header_index_selected = -1
     #
     # play button
     Singleton.play_button_box_ltwh[0] = Screen.width - Singleton.play_button_box_ltwh[2]
@@ -338,11 +327,25 @@ def update_header(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys,
     Render.draw_string_of_characters(Screen, gl_context, Singleton.play_text, Singleton.play_button_text_lt, Singleton.play_text_pixel_size, Singleton.play_text_color)
 
 
+def update_header_dropdown(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
+    #
+    # options of the selected header
+    deselect_headers = Singleton.header_options[Singleton.header_string_selected].update(Screen, gl_context, Keys, Render, Cursor)
+    #
+    # deselect header options
+    mouse_in_header = point_is_in_ltwh(Keys.cursor_x_pos.value, Keys.cursor_y_pos.value, (0, 0, Screen.width, Singleton.header_height))
+    if not mouse_in_header and deselect_headers:
+        Singleton.header_selected = False
+        Singleton.header_which_selected = [False for _ in Singleton.header_which_selected]
+        Singleton.header_string_selected = ''
+        Singleton.header_index_selected = -1
+
+
 
 def update_footer(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
     #
     # footer bar
-    Singleton.footer_ltwh = [0, Screen.height - Singleton.footer_ltwh[3], Screen.width, Singleton.footer_ltwh[3]]
+    Singleton.footer_ltwh[:] = [0, Screen.height - Singleton.footer_ltwh[3], Screen.width, Singleton.footer_ltwh[3]]
     Render.basic_rect_ltwh_with_color_to_quad(Screen, gl_context, 'blank_pixel', Singleton.footer_ltwh, Singleton.footer_color)
 
 
@@ -1204,10 +1207,13 @@ def update_tool_attributes(Singleton, Api, PATH, Screen, gl_context, Render, Tim
 
     except CaseBreak:
         pass
+    Singleton.footer_information = footer_information
+
 
-    # draw information stuff in the footer
+def update_footer_information(Singleton, Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
+    # draw information stuff in the footer; which information depends on the tool (see update_tool_attributes)
     information_lt = [Singleton.palette_padding, Singleton.footer_ltwh[1]]
-    for footer_info in footer_information:
+    for footer_info in Singleton.footer_information:
         try:
             match footer_info:
                 case FooterInfo.SEPARATOR:
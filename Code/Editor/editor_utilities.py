@@ -1,15 +1,27 @@
 from Code.utilities import CaseBreak, ONE_FRAME_AT_60_FPS, angle_in_range, atan2, rgba_to_glsl, get_blended_color, percent_to_rgba, point_is_in_ltwh, move_number_to_desired_range, get_text_width, get_text_height, get_time, str_can_be_int, str_can_be_float, str_can_be_hex, switch_to_base10, base10_to_hex, add_characters_to_front_of_string, get_rect_minus_borders, get_smallest_possible_float, calculate_percentage_difference_between_pygame_colors, COLORS
+import os
 import pygame
 import math
+import logging
+import weakref
 from copy import deepcopy
 from abc import ABC
 from array import array
 from bresenham import bresenham
+from Code.level_pack import LevelPack
+from Code.level_manifest import LevelManifest
+from Code.tile_blob_store import TileBlobStore
+from Code.tile_codec import TileCodec
+from Code.tile_cache import TileResidencyCache
+from Code.tile_writer import TileWriter
 from typing import Any
 from random import choice, shuffle, randint
 from enum import unique, Enum
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 @unique
 class FooterInfo(Enum):
     SEPARATOR = 0
@@ -59,6 +71,8 @@ class CollisionMode:
 
 class TextInput():
     _STOPPING_CHARACTERS = ' ,.?!:;/\\[](){}'
+    # every text input that exists; used to tell whether any of them has a blinking line
+    _INSTANCES = weakref.WeakSet()
     def __init__(self, 
                  background_ltwh: list[int], 
                  background_color: list[float], 
@@ -121,6 +135,11 @@ class TextInput():
         self.current_string = self.default_value
         self.should_update_spectrum = False
         self.ending_characters = ending_characters
+        TextInput._INSTANCES.add(self)
+    #
+    @staticmethod
+    def any_selected():
+        return any(text_input.currently_selected for text_input in TextInput._INSTANCES)
     #
     def deselect_box(self):
         self.currently_selected = False
@@ -1227,6 +1246,46 @@ class ScrollBar():
         self.scroll_percentage = scroll_percentage
 
 
+class RetainedPanels():
+    # decides which editor panels need to be drawn again this frame (see RenderObjects.begin_panel)
+    # a panel is drawn again when:
+    #     it has not been drawn yet, or its area moved or changed size
+    #     the window is resized, a button or key is pressed or released, or the mouse scrolls
+    #     the cursor moves over the area where it can change the panel
+    #     it was invalidated because something else it shows changed (its area changed while it was updated, tiles under the cursor loaded)
+    # panels that show something that changes on its own (blinking text input lines, the selected header) are always drawn
+
+    def __init__(self):
+        self.drawn_panels: set[str] = set()
+        self.invalidated_panels: set[str] = set()  # drawn again the next time they are updated
+        self.last_buttons: tuple[bool, bool, bool] | None = None
+        self.cursor_xy: tuple[int, int] | None = None
+        self.last_cursor_xy: tuple[int, int] | None = None
+        self.input_changed: bool = True
+        self.cursor_moved: bool = True
+    #
+    def update(self, Screen, Keys):
+        # called once per frame before any panel is drawn
+        buttons = (bool(Keys.left_click), bool(Keys.middle_click), bool(Keys.right_click))
+        self.last_cursor_xy = self.cursor_xy
+        self.cursor_xy = (Keys.cursor_x_pos.value, Keys.cursor_y_pos.value)
+        self.cursor_moved = self.cursor_xy != self.last_cursor_xy
+        self.input_changed = Screen.window_resize or any(buttons) or (buttons != self.last_buttons) or (Keys.scroll_x != 0) or (Keys.scroll_y != 0) or Keys.any_key_pressed()
+        self.last_buttons = buttons
+    #
+    def invalidate(self, panel_name: str):
+        self.invalidated_panels.add(panel_name)
+    #
+    def needs_redraw(self, panel_name: str, hover_ltwh: list[int] | None, always_redraw: bool = False):
+        # hover_ltwh is the area where moving the cursor can change the panel; None means anywhere
+        redraw = always_redraw or self.input_changed or (panel_name not in self.drawn_panels) or (panel_name in self.invalidated_panels)
+        if (not redraw) and self.cursor_moved:
+            redraw = (hover_ltwh is None) or (self.last_cursor_xy is None) or point_is_in_ltwh(*self.cursor_xy, hover_ltwh) or point_is_in_ltwh(*self.last_cursor_xy, hover_ltwh)
+        self.drawn_panels.add(panel_name)
+        self.invalidated_panels.discard(panel_name)
+        return redraw
+
+
 def get_tf_circle(diameter: int):
     tf_circle = []
     radius = (diameter - 0.5) / 2  # smaller than the actual radius for a better looking circle
@@ -1516,12 +1575,8 @@ class LassoTool(EditorTool):
         # copy the surface in the lasso object
         self.lasso_outline = new_lasso_surface.copy()
 
-        # update the pygame surface on the GPU
-        try:
-            render_instance.remove_moderngl_texture_from_renderable_objects_dict(LassoTool.LASSO_OUTLINE_REFERENCE)
-        except:
-            pass
-        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, self.lasso_outline, LassoTool.LASSO_OUTLINE_REFERENCE)
+        # update the pygame surface on the GPU; the texture is only made again when the lasso outline changes size
+        render_instance.update_moderngl_texture_with_surface(screen_instance, gl_context, self.lasso_outline, LassoTool.LASSO_OUTLINE_REFERENCE, owner=self)
 
         for x in range(lasso_width):
             for y in range(lasso_height):
@@ -1602,7 +1657,7 @@ class PencilTool(EditorTool):
                     pygame_circle_image.set_at((left, top), (0, 0, 0, 255))
                 else:
                     pygame_circle_image.set_at((left, top), (0, 0, 0, 0))
-        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, pygame_circle_image, PencilTool.CIRCLE_REFERENCE)
+        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, pygame_circle_image, PencilTool.CIRCLE_REFERENCE, owner=self)
 
     def brush_thickness_is_valid(self, brush_thickness: Any):
         try:
@@ -1859,7 +1914,7 @@ class SprayTool(EditorTool):
                 pygame_image.set_at((column-1, row), (0, 0, 0, 255))
                 pygame_image.set_at((column, row+1), (0, 0, 0, 255))
                 pygame_image.set_at((column, row-1), (0, 0, 0, 255))
-        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, pygame_image, SprayTool.SPEED_IS_DROPS_ATTRIBUTE_IMAGE_REFERENCE)
+        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, pygame_image, SprayTool.SPEED_IS_DROPS_ATTRIBUTE_IMAGE_REFERENCE, owner=self)
 
     def update_spray_time(self, spray_time):
         self._spray_time = int(spray_time)
@@ -2004,7 +2059,7 @@ class LineTool(EditorTool):
                     pygame_circle_image.set_at((left, top), (0, 0, 0, 255))
                 else:
                     pygame_circle_image.set_at((left, top), (0, 0, 0, 0))
-        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, pygame_circle_image, LineTool.CIRCLE_REFERENCE)
+        render_instance.add_moderngl_texture_with_surface(screen_instance, gl_context, pygame_circle_image, LineTool.CIRCLE_REFERENCE, owner=self)
 
     def brush_thickness_is_valid(self, brush_thickness: Any):
         try:
@@ -2299,6 +2354,8 @@ class EditorMap():
     CIRCLE_OUTLINE_THICKNESS_ZOOMED_IN = 1
     CIRCLE_OUTLINE_THICKNESS_ZOOMED_OUT = 2
     CIRCLE_OUTLINE_REFERENCE = 'editor_circle_outline'
+    # tool previews are drawn after the map
+    STORED_DRAW_LAYER = 0
     CURSOR_LASSO_REFERENCE = 'cursor_lasso_reference'
     OUTLINE_LASSO_REFERENCE = 'outline_lasso_reference'
     _MAX_LOAD_TIME = 0.02
@@ -2343,15 +2400,23 @@ class EditorMap():
                  render_instance,
                  base_path: str):
 
-        self.base_path: str = "C:\\Users\\Kayle\\Desktop\\Blight\\Hamster_Ball_Blight\\Projects\\Project1\\Level1\\"
-        self.initial_tile_wh: list[int, int] = list(pygame.image.load(f"{self.base_path}t0_0.png").get_size())
+        self.base_path: str = base_path
+        self.level_pack: LevelPack | None = LevelPack.open(self.base_path, writable=True)
+        self.level_manifest: LevelManifest = LevelManifest.open(self.base_path, self.level_pack, writable=True)
+        self.blob_store: TileBlobStore = TileBlobStore(TileBlobStore.get_store_path(self.base_path))
+        self.initial_tile_wh: list[int, int] = [self.level_manifest.tile_wh, self.level_manifest.tile_wh]
         self.tile_wh: list[int, int] = deepcopy(self.initial_tile_wh)
         # internal
         self.image_space_ltwh: list[int, int, int, int] = [0, 0, 0, 0]
-        self.original_map_wh: list[int, int] = [11776, 5888]
+        self.original_map_wh: list[int, int] = deepcopy(self.level_manifest.map_wh)
         self.map_wh: list[int, int] = deepcopy(self.original_map_wh)
         self.tile_array_shape: list[int, int] = [math.ceil(self.original_map_wh[0] / self.initial_tile_wh[0]), math.ceil(self.original_map_wh[1] / self.initial_tile_wh[1])]
         self.tile_array: list[list[EditorTile]] = []
+        self.residency_cache: TileResidencyCache = TileResidencyCache()
+        render_instance.texture_registry.add_evictor(self.residency_cache)
+        self.tile_writer: TileWriter = TileWriter(self.base_path, self.level_pack, self.level_manifest, EditorTile.COMPRESS_ON_SAVE)
+        self.level_of_detail: LevelOfDetail = LevelOfDetail(self.base_path, self.tile_array_shape, self.residency_cache, self.level_manifest)
+        self.tiles_pending_load: bool = False  # tiles on screen were left unloaded because the frame's load time ran out
         self._create_editor_tiles()
         self.pixel_scale: int | float = 1
         self.map_offset_xy: list[int, int] = [0, 0]
@@ -2389,7 +2454,6 @@ class EditorMap():
         self.current_tool: EditorTool = self.tools[5]
         self.map_edits: list[EditorMap.PixelChange | EditorMap.ObjectChange] = []
         #
-        self.stored_draw_keys: list = []
         self.stored_circle_outlines: dict = {}
       
     class PixelChange():
@@ -2436,14 +2500,34 @@ class EditorMap():
         # perform edits to the map
         self._tool(screen_instance, gl_context, keys_class_instance, render_instance, cursors, editor_singleton)
 
-        # draw the checkerboard background for erased pixels
-        self._draw_checkerboard_background(render_instance, screen_instance, gl_context)
+        # write edited tiles in the background once the current edit is finished, or periodically during long edits
+        if (not keys_class_instance.editor_primary.pressed) or (self.tile_writer.get_time_since_flush() > EditorMap._SAVE_PERIOD):
+            self.tile_writer.flush()
+
+        # rebuild the downsampled levels of edited tiles once the current edit is finished; levels that were never built are built here a few tiles per frame
+        if not keys_class_instance.editor_primary.pressed:
+            self.level_of_detail.rebuild_dirty(render_instance, self.tile_array)
+
+        # erased pixels show a checkerboard; it is drawn as part of the tiles
+        self._set_checkerboard_background(render_instance, screen_instance, gl_context)
 
         # iterate through tiles that should be loaded; load them; draw them
+        render_instance.begin_pass('map tiles')
         self._iterate_through_tiles(render_instance, screen_instance, gl_context, True, True, editor_singleton)
+        render_instance.end_pass()
 
         # execute stored draws
+        render_instance.begin_pass('stored draws')
         self._execute_stored_draws(render_instance, screen_instance, gl_context)
+        render_instance.end_pass()
+
+    def has_pending_work(self):
+        # the map changes on later frames without any input while tiles are still loading or levels of detail are being rebuilt
+        return self.tiles_pending_load or bool(self.level_of_detail.dirty_tiles)
+
+    def quit(self):
+        # write every edited tile before the application closes
+        self.tile_writer.close()
 
     def _zoom(self, render_instance, keys_class_instance, screen_instance, gl_context, window_resize, horizontal_scroll, vertical_scroll):
         if window_resize:
@@ -2480,10 +2564,7 @@ class EditorMap():
         # implement the new zoom
         self.tile_wh[0] = int(self.initial_tile_wh[0] * self.pixel_scale)
         self.tile_wh[1] = int(self.initial_tile_wh[1] * self.pixel_scale)
-        # reset map from zoom
-        for column in self.loaded_x:
-            for row in self.loaded_y:
-                self.tile_array[column][row].unload(render_instance)
+        # tiles stay loaded across zoom levels; the residency cache unloads them when it needs the memory
         self.map_wh[0] = self.original_map_wh[0] * self.pixel_scale
         self.map_wh[1] = self.original_map_wh[1] * self.pixel_scale
         self.loaded_x = []
@@ -2547,17 +2628,11 @@ class EditorMap():
                 load_y += [x for x in range(last_bottom_tile + 1, self.bottom_tile + 1)]
             else:
                 unload_y += [x for x in range(self.bottom_tile + 1, last_bottom_tile + 1)]
-        # update which tiles are unloaded and perform unloading
+        # update which tiles are out of view; they stay loaded until the residency cache needs the memory
         if (unload_x != []):
-            for column in unload_x:
-                for row in self.loaded_y:
-                    self.tile_array[column][row].unload(render_instance)
-                self.loaded_x = sorted([tile for tile in self.loaded_x if tile not in unload_x])
+            self.loaded_x = sorted([tile for tile in self.loaded_x if tile not in unload_x])
         if (unload_y != []):
-            for row in unload_y:
-                for column in self.loaded_x:
-                    self.tile_array[column][row].unload(render_instance)
-                self.loaded_y = sorted([tile for tile in self.loaded_y if tile not in unload_y])
+            self.loaded_y = sorted([tile for tile in self.loaded_y if tile not in unload_y])
         # update which tiles are loaded
         if (load_x != []):
             self.loaded_x += [x for x in load_x if x not in unload_x]
@@ -2567,6 +2642,13 @@ class EditorMap():
             self.loaded_y = sorted(self.loaded_y)
 
     def _iterate_through_tiles(self, render_instance, screen_instance, gl_context, draw_tiles: bool, load_tiles: bool, editor_singleton):
+        # zoomed out views draw the matching level of detail instead of every map tile
+        # levels that are still being built are not drawn
+        lod_level = min(LevelOfDetail.get_level(self.pixel_scale), self.level_of_detail.built_levels)
+        if lod_level > 0:
+            self._iterate_through_lod_tiles(render_instance, screen_instance, gl_context, draw_tiles, load_tiles, editor_singleton, lod_level)
+            self.residency_cache.end_frame(render_instance)
+            return
         # iterate through all loaded tiles
         load = True
         started_loading = False
@@ -2578,12 +2660,47 @@ class EditorMap():
                     if get_time() - start_load > EditorMap._MAX_LOAD_TIME:
                         load = False
                 tile = self.tile_array[column][row]
+                self.residency_cache.request(tile)
                 loaded = tile.draw_image(render_instance, screen_instance, gl_context, [left, top, self.tile_wh[0], self.tile_wh[1]], editor_singleton.map_mode, load and load_tiles, draw_tiles)
                 if loaded and not started_loading:
                     started_loading = True
                     start_load = get_time()
                 top += self.tile_wh[1]
             left += self.tile_wh[0]
+        self.tiles_pending_load = load_tiles and (not load)
+        self.residency_cache.end_frame(render_instance)
+
+    def _iterate_through_lod_tiles(self, render_instance, screen_instance, gl_context, draw_tiles: bool, load_tiles: bool, editor_singleton, lod_level: int):
+        # each lod tile covers (2 ** lod_level) x (2 ** lod_level) map tiles
+        lod_tile_array = self.level_of_detail.tile_arrays[lod_level]
+        lod_tile_wh = [self.tile_wh[0] << lod_level, self.tile_wh[1] << lod_level]
+        load = True
+        started_loading = False
+        for column in range(max(0, self.left_tile >> lod_level), min(len(lod_tile_array), (self.right_tile >> lod_level) + 1)):
+            left = self.image_space_ltwh[0] + self.map_offset_xy[0] + (column * lod_tile_wh[0])
+            for row in range(max(0, self.top_tile >> lod_level), min(len(lod_tile_array[column]), (self.bottom_tile >> lod_level) + 1)):
+                if started_loading:
+                    if get_time() - start_load > EditorMap._MAX_LOAD_TIME:
+                        load = False
+                top = self.image_space_ltwh[1] + self.map_offset_xy[1] + (row * lod_tile_wh[1])
+                tile = lod_tile_array[column][row]
+                self.residency_cache.request(tile)
+                loaded = tile.draw_image(render_instance, screen_instance, gl_context, [left, top, lod_tile_wh[0], lod_tile_wh[1]], editor_singleton.map_mode, load and load_tiles, draw_tiles)
+                if loaded and not started_loading:
+                    started_loading = True
+                    start_load = get_time()
+        self.tiles_pending_load = load_tiles and (not load)
+        # map tiles edited since the levels of detail were rebuilt are drawn over them
+        for column, row in self.level_of_detail.edited_map_tiles:
+            if not ((self.left_tile <= column <= self.right_tile) and (self.top_tile <= row <= self.bottom_tile)):
+                continue
+            tile = self.tile_array[column][row]
+            if not tile.loaded:
+                continue
+            self.residency_cache.request(tile)
+            left = self.image_space_ltwh[0] + self.map_offset_xy[0] + (column * self.tile_wh[0])
+            top = self.image_space_ltwh[1] + self.map_offset_xy[1] + (row * self.tile_wh[1])
+            tile.draw_image(render_instance, screen_instance, gl_context, [left, top, self.tile_wh[0], self.tile_wh[1]], editor_singleton.map_mode, False, draw_tiles)
 
     def _tool(self, screen_instance, gl_context, keys_class_instance, render_instance, cursors, editor_singleton):
         map_mode = editor_singleton.map_mode  # MapModes (PRETTY or COLLISION)
@@ -2655,6 +2772,7 @@ class EditorMap():
                                     reload_tiles[tile.image_reference] = tile
                                     # make the edit
                                     tile.pg_image.set_at((pixel_x, pixel_y), previous_color)
+                                    tile.mark_edited(pixel_x, pixel_y)
                                     # collision map edit
                                     tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = previous_collision
 
@@ -2665,8 +2783,7 @@ class EditorMap():
                             pass
 
                     for tile in reload_tiles.values():
-                        render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                        render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                        tile.update_textures(render_instance, screen_instance, gl_context)
                         tile.save()
 
                 case None, MarqueeRectangleTool.INDEX:
@@ -2706,8 +2823,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_dot')
-                        render_instance.store_draw(EditorMap.CURSOR_LASSO_REFERENCE, render_instance.draw_highlight_selected_pixel_for_lasso, {'pixel_ltwh': (int(pixel_x), int(pixel_y), single_pixel_wh, single_pixel_wh), 'line_thickness': line_thickness, 'line_length': line_length})
-                        self.stored_draw_keys.append(EditorMap.CURSOR_LASSO_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.draw_highlight_selected_pixel_for_lasso, {'pixel_ltwh': (int(pixel_x), int(pixel_y), single_pixel_wh, single_pixel_wh), 'line_thickness': line_thickness, 'line_length': line_length})
 
                     # change drawing state
                     if (self.current_tool.state == LassoTool.NOT_LASSOING) and keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -2780,8 +2896,7 @@ class EditorMap():
                     # draw the lasso tool
                     if self.current_tool.lasso_outline is not None:
                         # print(int(pixel_x), int(pixel_y), self.current_tool.lasso_outline.get_width() * single_pixel_wh, self.current_tool.lasso_outline.get_height() * single_pixel_wh)
-                        render_instance.store_draw(EditorMap.OUTLINE_LASSO_REFERENCE, render_instance.invert_white, {'object_name': LassoTool.LASSO_OUTLINE_REFERENCE, 'ltwh': (int(pixel_x), int(pixel_y), self.current_tool.lasso_outline.get_width() * single_pixel_wh, self.current_tool.lasso_outline.get_height() * single_pixel_wh)})
-                        self.stored_draw_keys.append(EditorMap.OUTLINE_LASSO_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.invert_white, {'object_name': LassoTool.LASSO_OUTLINE_REFERENCE, 'ltwh': (int(pixel_x), int(pixel_y), self.current_tool.lasso_outline.get_width() * single_pixel_wh, self.current_tool.lasso_outline.get_height() * single_pixel_wh)})
 
                 case None, PencilTool.INDEX:
                     cursor_on_map = point_is_in_ltwh(keys_class_instance.cursor_x_pos.value, keys_class_instance.cursor_y_pos.value, self.image_space_ltwh)
@@ -2811,8 +2926,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_big_crosshair')
-                        render_instance.store_draw(PencilTool.CIRCLE_REFERENCE, render_instance.basic_rect_ltwh_image_with_color, {'object_name': PencilTool.CIRCLE_REFERENCE, 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                        self.stored_draw_keys.append(PencilTool.CIRCLE_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.basic_rect_ltwh_image_with_color, {'object_name': PencilTool.CIRCLE_REFERENCE, 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
 
                     # change drawing state
                     if (self.current_tool.state == PencilTool.NOT_DRAWING) and keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -2849,8 +2963,8 @@ class EditorMap():
                                                     reload_tiles[tile.image_reference] = tile
                                                     # make the edit
                                                     original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                    tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                    tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                    tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                    tile.mark_edited(pixel_x, pixel_y)
                                                     # collision map edit
                                                     original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                     tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -2873,8 +2987,8 @@ class EditorMap():
                                                         reload_tiles[tile.image_reference] = tile
                                                         # make the edit
                                                         original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                        tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                        tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                        tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                        tile.mark_edited(pixel_x, pixel_y)
                                                         # collision map edit
                                                         original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                         tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -2896,8 +3010,8 @@ class EditorMap():
                                                         reload_tiles[tile.image_reference] = tile
                                                         # make the edit
                                                         original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                        tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                        tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                        tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                        tile.mark_edited(pixel_x, pixel_y)
                                                         # collision map edit
                                                         original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                         tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -2905,8 +3019,7 @@ class EditorMap():
                                                         map_edit[tile_name] = (original_pixel_color, original_collision)
 
                             for tile in reload_tiles.values():
-                                render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                                render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                                tile.update_textures(render_instance, screen_instance, gl_context)
                                 tile.save()
 
                     # update values to use next loop
@@ -2946,8 +3059,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_big_crosshair')
-                        render_instance.store_draw(EditorMap.CIRCLE_OUTLINE_REFERENCE, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.eraser_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale, 'is_a_square': True if self.current_tool.eraser_style == EraserTool.SQUARE_ERASER else False})
-                        self.stored_draw_keys.append(EditorMap.CIRCLE_OUTLINE_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.eraser_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale, 'is_a_square': True if self.current_tool.eraser_style == EraserTool.SQUARE_ERASER else False})
 
                     # change eraser state
                     if (self.current_tool.state == EraserTool.NOT_ERASING) and keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -2984,8 +3096,8 @@ class EditorMap():
                                                     reload_tiles[tile.image_reference] = tile
                                                     # make the edit
                                                     original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                    tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := (0.0, 0.0, 0.0, 0.0))
-                                                    tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                    tile.pg_image.set_at((pixel_x, pixel_y), (0.0, 0.0, 0.0, 0.0))
+                                                    tile.mark_edited(pixel_x, pixel_y)
                                                     # collision map edit
                                                     original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                     tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = CollisionMode.NO_COLLISION
@@ -3008,8 +3120,8 @@ class EditorMap():
                                                         reload_tiles[tile.image_reference] = tile
                                                         # make the edit
                                                         original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                        tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := (0.0, 0.0, 0.0, 0.0))
-                                                        tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                        tile.pg_image.set_at((pixel_x, pixel_y), (0.0, 0.0, 0.0, 0.0))
+                                                        tile.mark_edited(pixel_x, pixel_y)
                                                         # collision map edit
                                                         original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                         tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = CollisionMode.NO_COLLISION
@@ -3031,8 +3143,8 @@ class EditorMap():
                                                         reload_tiles[tile.image_reference] = tile
                                                         # make the edit
                                                         original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                        tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := (0.0, 0.0, 0.0, 0.0))
-                                                        tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                        tile.pg_image.set_at((pixel_x, pixel_y), (0.0, 0.0, 0.0, 0.0))
+                                                        tile.mark_edited(pixel_x, pixel_y)
                                                         # collision map edit
                                                         original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                         tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = CollisionMode.NO_COLLISION
@@ -3040,8 +3152,7 @@ class EditorMap():
                                                         map_edit[tile_name] = (original_pixel_color, original_collision)
 
                             for tile in reload_tiles.values():
-                                render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                                render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                                tile.update_textures(render_instance, screen_instance, gl_context)
                                 tile.save()
 
                     # update values to use next loop
@@ -3081,8 +3192,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_big_crosshair')
-                        render_instance.store_draw(EditorMap.CIRCLE_OUTLINE_REFERENCE, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.spray_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
-                        self.stored_draw_keys.append(EditorMap.CIRCLE_OUTLINE_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.spray_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
 
                     # change drawing state
                     if (self.current_tool.state == SprayTool.NOT_SPRAYING) and keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -3141,8 +3251,8 @@ class EditorMap():
                                                 reload_tiles[tile.image_reference] = tile
                                                 # make the edit
                                                 original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                tile.mark_edited(pixel_x, pixel_y)
                                                 # collision map edit
                                                 original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                 tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3150,8 +3260,7 @@ class EditorMap():
                                                 map_edit[tile_name] = (original_pixel_color, original_collision)
 
                                 for tile in reload_tiles.values():
-                                    render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                                    render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                                    tile.update_textures(render_instance, screen_instance, gl_context)
                                     tile.save()
 
                                 # update values to use next loop
@@ -3198,8 +3307,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_big_crosshair')
-                        render_instance.store_draw(EditorMap.CIRCLE_OUTLINE_REFERENCE, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': bucket_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
-                        self.stored_draw_keys.append(EditorMap.CIRCLE_OUTLINE_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': bucket_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
 
                     # use the bucket this frame
                     if keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -3254,6 +3362,7 @@ class EditorMap():
                                 continue
                             # all checks passed; change the current pixel values
                             tile.pg_image.set_at((pixel_x, pixel_y), current_color_rgba)
+                            tile.mark_edited(pixel_x, pixel_y)
                             tile.collision_bytearray[collision_index] = current_collision
                             # record what was edited for ctrl-Z
                             map_edit[(current_pixel_x, current_pixel_y)] = (original_pixel_color, original_collision)
@@ -3272,8 +3381,7 @@ class EditorMap():
                                 set_of_pixels_already_being_attempted.add(left)
 
                         for tile in reload_tiles.values():
-                            render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                            render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                            tile.update_textures(render_instance, screen_instance, gl_context)
                             tile.save()
 
                 case None, LineTool.INDEX:
@@ -3355,8 +3463,8 @@ class EditorMap():
                                                     reload_tiles[tile.image_reference] = tile
                                                     # make the edit
                                                     original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                    tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                    tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                    tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                    tile.mark_edited(pixel_x, pixel_y)
                                                     # collision map edit
                                                     original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                     tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3381,8 +3489,8 @@ class EditorMap():
                                                         reload_tiles[tile.image_reference] = tile
                                                         # make the edit
                                                         original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                        tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                        tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                        tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                        tile.mark_edited(pixel_x, pixel_y)
                                                         # collision map edit
                                                         original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                         tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3404,8 +3512,8 @@ class EditorMap():
                                                     reload_tiles[tile.image_reference] = tile
                                                     # make the edit
                                                     original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                    tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                    tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                    tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                    tile.mark_edited(pixel_x, pixel_y)
                                                     # collision map edit
                                                     original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                     tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3413,22 +3521,19 @@ class EditorMap():
                                                     map_edit[tile_name] = (original_pixel_color, original_collision)
 
                         for tile in reload_tiles.values():
-                            render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                            render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                            tile.update_textures(render_instance, screen_instance, gl_context)
                             tile.save()
 
                     match self.current_tool.state:
                         case LineTool.NOT_DRAWING:
-                            render_instance.store_draw(LineTool.CIRCLE_REFERENCE, render_instance.basic_rect_ltwh_image_with_color, {'object_name': LineTool.CIRCLE_REFERENCE, 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                            self.stored_draw_keys.append(LineTool.CIRCLE_REFERENCE)
+                            render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.basic_rect_ltwh_image_with_color, {'object_name': LineTool.CIRCLE_REFERENCE, 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
                         case LineTool.DRAWING:
                             reload_tiles = {}
                             x2 = int(pixel_x + (((self.current_tool.brush_thickness - 1) // 2) * self.pixel_scale))
                             y2 = int(pixel_y + (((self.current_tool.brush_thickness - 1) // 2) * self.pixel_scale))
                             x1 = int(x2 + ((self.current_tool.start_xy[0] - pos_x) * self.pixel_scale))
                             y1 = int(y2 + ((self.current_tool.start_xy[1] - pos_y) * self.pixel_scale))
-                            render_instance.store_draw(LineTool.LINE_REFERENCE, render_instance.draw_line, {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2, 'thickness': self.current_tool.brush_thickness, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color, 'pixel_size': self.pixel_scale, 'circle_for_line_drawing': self.current_tool.circle_for_line_drawing, 'brush_style': self.current_tool.brush_style})
-                            self.stored_draw_keys.append(LineTool.LINE_REFERENCE)
+                            render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.draw_line, {'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2, 'thickness': self.current_tool.brush_thickness, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color, 'pixel_size': self.pixel_scale, 'circle_for_line_drawing': self.current_tool.circle_for_line_drawing, 'brush_style': self.current_tool.brush_style})
 
                 case None, CurvyLineTool.INDEX:
                     pass
@@ -3498,8 +3603,8 @@ class EditorMap():
                                                 reload_tiles[tile.image_reference] = tile
                                                 # make the edit
                                                 original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                tile.mark_edited(pixel_x, pixel_y)
                                                 # collision map edit
                                                 original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                 tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3523,8 +3628,8 @@ class EditorMap():
                                                 reload_tiles[tile.image_reference] = tile
                                                 # make the edit
                                                 original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                tile.mark_edited(pixel_x, pixel_y)
                                                 # collision map edit
                                                 original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                 tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3553,8 +3658,8 @@ class EditorMap():
                                                     reload_tiles[tile.image_reference] = tile
                                                     # make the edit
                                                     original_pixel_color = tile.pg_image.get_at((pixel_x, pixel_y))
-                                                    tile.pg_image.set_at((pixel_x, pixel_y), resulting_color := percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
-                                                    tile.edits[(pixel_x, pixel_y)] = resulting_color
+                                                    tile.pg_image.set_at((pixel_x, pixel_y), percent_to_rgba(get_blended_color(rgba_to_glsl(original_pixel_color), current_color_glsl)))
+                                                    tile.mark_edited(pixel_x, pixel_y)
                                                     # collision map edit
                                                     original_collision = tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x]
                                                     tile.collision_bytearray[(pixel_y * EditorMap.TILE_WH) + pixel_x] = current_collision
@@ -3564,8 +3669,7 @@ class EditorMap():
                                 pass
 
                         for tile in reload_tiles.values():
-                            render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                            render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                            tile.update_textures(render_instance, screen_instance, gl_context)
                             tile.save()
 
                     match self.current_tool.state:
@@ -3574,14 +3678,11 @@ class EditorMap():
                             if cursor_on_map:
                                 match self.current_tool.brush_style:
                                     case RectangleEllipseTool.FULL_RECTANGLE:
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.basic_rect_ltwh_image_with_color, {'object_name': 'black_pixel', 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.basic_rect_ltwh_image_with_color, {'object_name': 'black_pixel', 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
                                     case RectangleEllipseTool.HOLLOW_RECTANGLE:
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.basic_rect_ltwh_image_with_color, {'object_name': 'black_pixel', 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.basic_rect_ltwh_image_with_color, {'object_name': 'black_pixel', 'ltwh': ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
                                     case RectangleEllipseTool.FULL_ELLIPSE:
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.draw_ellipse, {'ltwh': [round(dimension) for dimension in ltwh], 'ellipse_wh': [round(ltwh[2] / self.pixel_scale), round(ltwh[2] / self.pixel_scale)], 'pixel_size': self.pixel_scale, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.draw_ellipse, {'ltwh': [round(dimension) for dimension in ltwh], 'ellipse_wh': [round(ltwh[2] / self.pixel_scale), round(ltwh[2] / self.pixel_scale)], 'pixel_size': self.pixel_scale, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
                                     case RectangleEllipseTool.HOLLOW_ELLIPSE:
                                         pass
                         # shader showing how map will look once draw is released
@@ -3595,27 +3696,23 @@ class EditorMap():
                                 rectangle_ellipse_ltwh = [round(min(x1, x2) - (((self.current_tool.brush_thickness - 1) // 2) * self.pixel_scale)), round(min(y1, y2) - (((self.current_tool.brush_thickness - 1) // 2) * self.pixel_scale)), round(abs(x1 - x2) + (self.current_tool.brush_thickness * self.pixel_scale)), round(abs(y1 - y2) + (self.current_tool.brush_thickness * self.pixel_scale))]
                                 match self.current_tool.brush_style:
                                     case RectangleEllipseTool.FULL_RECTANGLE:
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.basic_rect_ltwh_image_with_color, {'object_name': 'black_pixel', 'ltwh': rectangle_ellipse_ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.basic_rect_ltwh_image_with_color, {'object_name': 'black_pixel', 'ltwh': rectangle_ellipse_ltwh, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
                                     case RectangleEllipseTool.HOLLOW_RECTANGLE:
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.draw_rectangle, {'ltwh': rectangle_ellipse_ltwh, 'border_thickness': round(self.current_tool.brush_thickness * self.pixel_scale), 'border_color': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color, 'coloring_border': True, 'inner_color': COLORS['WHITE'], 'coloring_inside': False})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.draw_rectangle, {'ltwh': rectangle_ellipse_ltwh, 'border_thickness': round(self.current_tool.brush_thickness * self.pixel_scale), 'border_color': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color, 'coloring_border': True, 'inner_color': COLORS['WHITE'], 'coloring_inside': False})
                                     case RectangleEllipseTool.FULL_ELLIPSE:
                                         x1 = min(self.current_tool.start_left_top_xy[0], leftest_brush_pixel)
                                         y1 = min(self.current_tool.start_left_top_xy[1], topest_brush_pixel)
                                         x2 = max(self.current_tool.start_left_top_xy[0], leftest_brush_pixel) + self.current_tool.brush_thickness - 1
                                         y2 = max(self.current_tool.start_left_top_xy[1], topest_brush_pixel) + self.current_tool.brush_thickness - 1
                                         ellipse_wh = [abs(x1 - x2) + 1, abs(y1 - y2) + 1]
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.draw_ellipse, {'ltwh': rectangle_ellipse_ltwh, 'ellipse_wh': ellipse_wh, 'pixel_size': self.pixel_scale, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.draw_ellipse, {'ltwh': rectangle_ellipse_ltwh, 'ellipse_wh': ellipse_wh, 'pixel_size': self.pixel_scale, 'rgba': editor_singleton.currently_selected_color.color if map_mode is MapModes.PRETTY else current_collision_color})
                                     case RectangleEllipseTool.HOLLOW_ELLIPSE:
                                         x1 = min(self.current_tool.start_left_top_xy[0], leftest_brush_pixel)
                                         y1 = min(self.current_tool.start_left_top_xy[1], topest_brush_pixel)
                                         x2 = max(self.current_tool.start_left_top_xy[0], leftest_brush_pixel) + self.current_tool.brush_thickness - 1
                                         y2 = max(self.current_tool.start_left_top_xy[1], topest_brush_pixel) + self.current_tool.brush_thickness - 1
                                         ellipse_wh = [abs(x1 - x2) + 1, abs(y1 - y2) + 1]
-                                        render_instance.store_draw(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE, render_instance.draw_hollow_ellipse, {'ltwh': rectangle_ellipse_ltwh, 'ellipse_wh': ellipse_wh, 'pixel_size': self.pixel_scale, 'ellipse_thickness': self.current_tool.brush_thickness, 'rgba': rgba_to_glsl(current_color_rgba)})
-                                        self.stored_draw_keys.append(RectangleEllipseTool.RECTANGLE_ELLIPSE_REFERENCE)
+                                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.draw_hollow_ellipse, {'ltwh': rectangle_ellipse_ltwh, 'ellipse_wh': ellipse_wh, 'pixel_size': self.pixel_scale, 'ellipse_thickness': self.current_tool.brush_thickness, 'rgba': rgba_to_glsl(current_color_rgba)})
 
                 case None, BlurTool.INDEX:
                     cursor_on_map = point_is_in_ltwh(keys_class_instance.cursor_x_pos.value, keys_class_instance.cursor_y_pos.value, self.image_space_ltwh)
@@ -3650,8 +3747,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_big_crosshair')
-                        render_instance.store_draw(EditorMap.CIRCLE_OUTLINE_REFERENCE, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.blur_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
-                        self.stored_draw_keys.append(EditorMap.CIRCLE_OUTLINE_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.blur_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
 
                     # change blurring state
                     if (self.current_tool.state == BlurTool.NOT_BLURRING) and keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -3908,7 +4004,7 @@ class EditorMap():
                                         center_tile.load(render_instance, screen_instance, gl_context)
                                     # set the resulting blended color
                                     center_tile.pg_image.set_at((divmod_center_pixel_x, divmod_center_pixel_y), resulting_color)
-                                    center_tile.edits[(divmod_center_pixel_x, divmod_center_pixel_y)] = resulting_color
+                                    center_tile.mark_edited(divmod_center_pixel_x, divmod_center_pixel_y)
                                     # collision map edit
                                     original_collision = center_tile.collision_bytearray[(divmod_center_pixel_y * EditorMap.TILE_WH) + divmod_center_pixel_x]
                                     center_tile.collision_bytearray[(divmod_center_pixel_y * EditorMap.TILE_WH) + divmod_center_pixel_x] = current_collision
@@ -3916,8 +4012,7 @@ class EditorMap():
                                     map_edit[tile_name] = (center_color, original_collision)
 
                             for tile in reload_tiles.values():
-                                render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                                render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                                tile.update_textures(render_instance, screen_instance, gl_context)
                                 tile.save()
 
                 case None, JumbleTool.INDEX:
@@ -3953,8 +4048,7 @@ class EditorMap():
                     # condition if cursor is on the map
                     if cursor_on_map:
                         cursors.add_cursor_this_frame('cursor_big_crosshair')
-                        render_instance.store_draw(EditorMap.CIRCLE_OUTLINE_REFERENCE, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.jumble_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
-                        self.stored_draw_keys.append(EditorMap.CIRCLE_OUTLINE_REFERENCE)
+                        render_instance.store_draw(EditorMap.STORED_DRAW_LAYER, render_instance.editor_circle_outline, {'ltwh': ltwh, 'circle_size': self.current_tool.jumble_size, 'circle_outline_thickness': circle_outline_thickness, 'circle_pixel_size': self.pixel_scale})
 
                     # change drawing state
                     if (self.current_tool.state == JumbleTool.NOT_JUMBLING) and keys_class_instance.editor_primary.newly_pressed and cursor_on_map:
@@ -4015,13 +4109,14 @@ class EditorMap():
                                         map_edit[(new_location_x, new_location_y)] = (color2, collision2)
                                     # make the swap
                                     tile1.pg_image.set_at((pixel_x1, pixel_y1), color2)
+                                    tile1.mark_edited(pixel_x1, pixel_y1)
                                     tile1.collision_bytearray[collision_index1] = collision2
                                     tile2.pg_image.set_at((pixel_x2, pixel_y2), color1)
+                                    tile2.mark_edited(pixel_x2, pixel_y2)
                                     tile2.collision_bytearray[collision_index2] = collision1
 
                                 for tile in reload_tiles.values():
-                                    render_instance.write_pixels_from_pg_surface(tile.image_reference, tile.pg_image)
-                                    render_instance.write_pixels_from_bytearray(tile.collision_image_reference, tile.collision_bytearray)
+                                    tile.update_textures(render_instance, screen_instance, gl_context)
                                     tile.save()
                     except CaseBreak:
                         pass
@@ -4174,19 +4269,18 @@ class EditorMap():
     def _update_current_tool(self, current_tool: tuple[str, int]):
         self.current_tool = self.tools[current_tool[1]]
 
-    def _draw_checkerboard_background(self, render_instance, screen_instance, gl_context):
+    def _set_checkerboard_background(self, render_instance, screen_instance, gl_context):
+        # the checkerboard moves with the map
         adjusted_checkerboard_pixel_size = EditorMap._CHECKERBOARD_PIXEL_SIZE * self.pixel_scale
-        render_instance.checkerboard(screen_instance, gl_context, 'black_pixel', self.image_space_ltwh, EditorMap._CHECKERBOARD_COLOR1, EditorMap._CHECKERBOARD_COLOR2, adjusted_checkerboard_pixel_size, adjusted_checkerboard_pixel_size, offset_x = -self.map_offset_xy[0], offset_y = -self.map_offset_xy[1])
+        render_instance.set_tile_checkerboard(screen_instance, gl_context, EditorMap._CHECKERBOARD_COLOR1, EditorMap._CHECKERBOARD_COLOR2, adjusted_checkerboard_pixel_size, (self.image_space_ltwh[0] + self.map_offset_xy[0], self.image_space_ltwh[1] + self.map_offset_xy[1]))
 
     def _execute_stored_draws(self, render_instance, screen_instance, gl_context):
-        for key in self.stored_draw_keys:
-            render_instance.execute_stored_draw(screen_instance, gl_context, key)
-        self.stored_draw_keys = []
+        render_instance.execute_stored_draws(screen_instance, gl_context)
 
     def _create_editor_tiles(self):
         self.tile_array = []
         for column in range(self.tile_array_shape[0]):
-            self.tile_array.append([EditorTile(self.base_path, column, row) for row in range(self.tile_array_shape[1])])
+            self.tile_array.append([EditorTile(self.base_path, column, row, self.level_pack, self.residency_cache, self.level_manifest, self.blob_store, self.level_of_detail, self.tile_writer) for row in range(self.tile_array_shape[1])])
 
     def _reset_map(self, render_instance):
         # reset map from zoom
@@ -4196,6 +4290,7 @@ class EditorMap():
                     self.tile_array[column][row].unload(render_instance)
                 except:
                     continue
+        self.level_of_detail.unload(render_instance)
 
         self.tile_wh = deepcopy(self.initial_tile_wh)
         self.image_space_ltwh = [0, 0, 0, 0]
@@ -4215,12 +4310,50 @@ class EditorMap():
         self.window_resize_last_frame = False
 
 
-class EditorTile():
+class EditorMapTile(ABC):
+    """Map tile base class"""
+    # subclasses have loaded, image_reference, collision_image_reference and load()
+
+    def get_texture_bytes(self):
+        # a pretty map and a collision map
+        return (EditorTile.PRETTY_MAP_BYTES_PER_PIXEL + EditorTile.COLLISION_MAP_BYTES_PER_PIXEL) * (EditorMap.TILE_WH ** 2)
+
+    def draw_image(self, render_instance, screen_instance, gl_context, ltwh: list[int, int, int, int], map_mode: MapModes, load: bool = False, draw_tiles: bool = True):
+        loaded = False
+        if load and not self.loaded:
+            # a tile that does not fit the texture budget is loaded once tiles it can replace leave the view
+            if not render_instance.can_load_textures(self.get_texture_bytes()):
+                return False
+            self.load(render_instance, screen_instance, gl_context)
+            loaded = True
+
+        if not self.loaded:
+            return loaded
+
+        if not draw_tiles:
+            return True
+
+        match map_mode:
+            case MapModes.PRETTY:
+                render_instance.basic_rect_ltwh_over_checkerboard(screen_instance, gl_context, self.image_reference, ltwh)
+            case MapModes.COLLISION:
+                render_instance.draw_collision_map_tile_in_editor(screen_instance, gl_context, self.collision_image_reference, ltwh)
+        return loaded
+
+
+class EditorTile(EditorMapTile):
     PYGAME_IMAGE_FORMAT = "RGBA"
+    # compressed tiles are much smaller on disk; they are encoded by the tile writer's thread so compressing costs no frame time
+    COMPRESS_ON_SAVE = True
     PRETTY_MAP_BYTES_PER_PIXEL = 4
     COLLISION_MAP_BYTES_PER_PIXEL = 1
+    # cpu byte arrays, pygame surface, and gpu textures
+    RESIDENT_BYTES = (3 * PRETTY_MAP_BYTES_PER_PIXEL * (EditorMap.TILE_WH ** 2)) + (2 * COLLISION_MAP_BYTES_PER_PIXEL * (EditorMap.TILE_WH ** 2))
+    # tiles with identical maps share one texture until one of them is edited
+    SHARED_PRETTY_REFERENCE = 'shared_pretty_{}'
+    SHARED_COLLISION_REFERENCE = 'shared_collision_{}'
 
-    def __init__(self, base_path: str, column: int, row: int):
+    def __init__(self, base_path: str, column: int, row: int, level_pack: LevelPack | None = None, residency_cache: TileResidencyCache | None = None, level_manifest: LevelManifest | None = None, blob_store: TileBlobStore | None = None, level_of_detail: 'LevelOfDetail | None' = None, tile_writer: TileWriter | None = None):
         self.column: int = column
         self.row: int = row
         self.loaded: bool = False
@@ -4228,63 +4361,334 @@ class EditorTile():
         self.collision_image_reference: str = f"c{self.column}_{self.row}"
         # self.image_path: str = f"{base_path}t{self.image_reference}.png"
         self.path: str = f"{base_path}t{self.image_reference}"
-        self.pg_image: pygame.Surface | None = None
+        self._pg_image: pygame.Surface | None = None
         self.collision_image: pygame.Surface | None = None
         self.pretty_bytearray: bytearray = None
         self.collision_bytearray: bytearray = None
-        self.edits: dict = {}
+        # [left, top, right, bottom] of pixels edited since the textures were last updated
+        self.edited_ltrb: list[int, int, int, int] | None = None
+        self.level_pack: LevelPack | None = level_pack
+        self.residency_cache: TileResidencyCache | None = residency_cache
+        self.level_manifest: LevelManifest | None = level_manifest
+        self.blob_store: TileBlobStore | None = blob_store
+        self.level_of_detail: LevelOfDetail | None = level_of_detail
+        self.tile_writer: TileWriter | None = tile_writer
+        self.shared_pretty_reference: str | None = None
+        self.shared_collision_reference: str | None = None
+
+    def get_resident_bytes(self):
+        return EditorTile.RESIDENT_BYTES
+
+    @property
+    def pg_image(self):
+        # the pygame surface is only made once something reads or edits the tile's pixels; from then on it holds the tile's pretty map
+        if (self._pg_image is None) and self.loaded:
+            self._pg_image = pygame.image.frombytes(bytes(self.pretty_bytearray), (EditorMap.TILE_WH, EditorMap.TILE_WH), EditorTile.PYGAME_IMAGE_FORMAT)
+        return self._pg_image
 
     def load(self, render_instance, screen_instance, gl_context):
         if not self.loaded:
             self._load_bytearray()
-            # load the pretty map
-            self.pg_image = render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.pretty_bytearray, EditorTile.PRETTY_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.image_reference)
-            # load the collision map
-            render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.collision_bytearray, EditorTile.COLLISION_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.collision_image_reference)
+            tile_metadata = {} if self.level_manifest is None else (self.level_manifest.get_tile(self.column, self.row) or {})
+            if (tile_metadata.get(LevelManifest.PRETTY_HASH) is not None) and (tile_metadata.get(LevelManifest.COLLISION_HASH) is not None):
+                # share textures with identical tiles until this tile is edited
+                self.shared_pretty_reference = EditorTile.SHARED_PRETTY_REFERENCE.format(tile_metadata[LevelManifest.PRETTY_HASH])
+                self.shared_collision_reference = EditorTile.SHARED_COLLISION_REFERENCE.format(tile_metadata[LevelManifest.COLLISION_HASH])
+                render_instance.acquire_shared_moderngl_texture(screen_instance, gl_context, self.pretty_bytearray, EditorTile.PRETTY_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.shared_pretty_reference, self.image_reference, owner=self)
+                render_instance.acquire_shared_moderngl_texture(screen_instance, gl_context, self.collision_bytearray, EditorTile.COLLISION_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.shared_collision_reference, self.collision_image_reference, owner=self)
+            else:
+                # load the pretty map
+                render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.pretty_bytearray, EditorTile.PRETTY_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.image_reference, owner=self)
+                # load the collision map
+                render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.collision_bytearray, EditorTile.COLLISION_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.collision_image_reference, owner=self)
         self.loaded = True
+        # also marks an already loaded tile as used, so a tool using it is not evicted to make room for another tile's textures
+        if self.residency_cache is not None:
+            self.residency_cache.add(self)
 
     def unload(self, render_instance):
         if self.loaded:
-            self.pg_image = None
+            if self.tile_writer is not None:
+                # edits must be copied out before the tile's maps are dropped
+                self.tile_writer.flush_tile(self)
+            self._pg_image = None
             self.pretty_bytearray = None
-            render_instance.remove_moderngl_texture_from_renderable_objects_dict(self.image_reference)
+            self._remove_textures(render_instance)
             self.collision_bytearray = None
             self.collision_image = None
+            self.edited_ltrb = None
+            if self.residency_cache is not None:
+                self.residency_cache.discard(self)
         self.loaded = False
 
+    def mark_edited(self, pixel_x: int, pixel_y: int):
+        if self.edited_ltrb is None:
+            self.edited_ltrb = [pixel_x, pixel_y, pixel_x, pixel_y]
+            return
+        if pixel_x < self.edited_ltrb[0]:
+            self.edited_ltrb[0] = pixel_x
+        elif pixel_x > self.edited_ltrb[2]:
+            self.edited_ltrb[2] = pixel_x
+        if pixel_y < self.edited_ltrb[1]:
+            self.edited_ltrb[1] = pixel_y
+        elif pixel_y > self.edited_ltrb[3]:
+            self.edited_ltrb[3] = pixel_y
+
+    def update_textures(self, render_instance, screen_instance, gl_context):
+        edited_ltrb, self.edited_ltrb = self.edited_ltrb, None
+        # copy on write; a tile sharing textures gets its own before they are changed
+        if (self.shared_pretty_reference is not None) or (self.shared_collision_reference is not None):
+            self._remove_textures(render_instance)
+            render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, pygame.image.tobytes(self.pg_image, EditorTile.PYGAME_IMAGE_FORMAT), EditorTile.PRETTY_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.image_reference, owner=self)
+            render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.collision_bytearray, EditorTile.COLLISION_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.collision_image_reference, owner=self)
+            return
+        if edited_ltrb is None:
+            render_instance.write_pixels_from_pg_surface(self.image_reference, self.pg_image)
+            render_instance.write_pixels_from_bytearray(self.collision_image_reference, self.collision_bytearray)
+            return
+        # only upload the rectangle of pixels that were edited
+        edited_ltwh = (edited_ltrb[0], edited_ltrb[1], edited_ltrb[2] - edited_ltrb[0] + 1, edited_ltrb[3] - edited_ltrb[1] + 1)
+        render_instance.write_pixels_from_pg_surface(self.image_reference, self.pg_image, edited_ltwh)
+        render_instance.write_pixels_from_bytearray(self.collision_image_reference, self.collision_bytearray, edited_ltwh)
+
+    def _remove_textures(self, render_instance):
+        if self.shared_pretty_reference is not None:
+            render_instance.release_shared_moderngl_texture(self.shared_pretty_reference, self.image_reference)
+            self.shared_pretty_reference = None
+        else:
+            render_instance.remove_moderngl_texture_from_renderable_objects_dict(self.image_reference)
+        if self.shared_collision_reference is not None:
+            render_instance.release_shared_moderngl_texture(self.shared_collision_reference, self.collision_image_reference)
+            self.shared_collision_reference = None
+        else:
+            render_instance.remove_moderngl_texture_from_renderable_objects_dict(self.collision_image_reference)
+
     def save(self):
+        # cheap enough to call on every frame of an edit; the tile is written when the tile writer is flushed
+        if self.level_of_detail is not None:
+            self.level_of_detail.mark_dirty(self.column, self.row)
+        if self.tile_writer is not None:
+            self.tile_writer.mark_dirty(self)
+            return
+        pretty_bytes = pygame.image.tobytes(self.pg_image, EditorTile.PYGAME_IMAGE_FORMAT)
+        tile_bytes = TileCodec.encode(pretty_bytes, self.collision_bytearray, EditorTile.COMPRESS_ON_SAVE)
+        if self.level_manifest is not None:
+            # also records whether the tile is uniform
+            self.level_manifest.update_tile(self.column, self.row, tile_bytes, pretty_bytes, self.collision_bytearray)
+        if self.level_pack is not None:
+            self.level_pack.write_tile(self.column, self.row, tile_bytes)
+            self.level_pack.flush()
+            return
         with open(self.path, "wb") as file:
-            # save the pretty image in png format
-            file.write(bytearray(pygame.image.tobytes(self.pg_image, EditorTile.PYGAME_IMAGE_FORMAT)))
-            # new line
-            file.write("\n".encode(CollisionMode.UTF_8))
-            # save the collision map
-            file.write(self.collision_bytearray)
+            file.write(tile_bytes)
 
     def _load_bytearray(self):
+        # both maps are copied so the tile can be edited
+        pretty_bytearray, collision_bytearray = self.read_maps()
+        self.pretty_bytearray = bytearray(pretty_bytearray)
+        self.collision_bytearray = bytearray(collision_bytearray)
+
+    def read_maps(self):
+        # returns (pretty map, collision map) without loading the tile; the maps may be read-only
+        if self.loaded:
+            if self._pg_image is None:
+                # never read or edited, so the loaded pretty map is still current
+                return self.pretty_bytearray, self.collision_bytearray
+            return pygame.image.tobytes(self._pg_image, EditorTile.PYGAME_IMAGE_FORMAT), self.collision_bytearray
+        pending_maps = None if self.tile_writer is None else self.tile_writer.get_pending_maps(self.column, self.row)
+        if pending_maps is not None:
+            return pending_maps
+        uniform = None if self.level_manifest is None else self.level_manifest.get_uniform(self.column, self.row)
+        if uniform is not None:
+            # uniform tiles are rebuilt from the manifest without reading the file
+            return bytes(uniform[:4]) * (EditorMap.TILE_WH ** 2), bytes(uniform[4:]) * (EditorMap.TILE_WH ** 2)
+        tile_metadata = {} if self.level_manifest is None else (self.level_manifest.get_tile(self.column, self.row) or {})
+        if tile_metadata.get(LevelManifest.BLOB) and (self.blob_store is not None):
+            # the tile is copied out of the shared blob; saving it later writes it back into this level
+            byte_array = self.blob_store.read_blob(tile_metadata[LevelManifest.PRETTY_HASH], tile_metadata[LevelManifest.COLLISION_HASH])
+        elif self.level_pack is not None:
+            byte_array = self.level_pack.get_tile(self.column, self.row)
+        else:
+            with open(self.path, mode='rb') as file:
+                # get the byte array
+                byte_array = file.read()
+        # separate the pretty map and collision map byte arrays; works for raw and compressed tiles
+        return TileCodec.decode(byte_array)
+
+
+class EditorLODTile(EditorMapTile):
+    # a downsampled tile covering (2 ** level) x (2 ** level) map tiles; see LevelOfDetail
+    RESIDENT_BYTES = 2 * (EditorTile.PRETTY_MAP_BYTES_PER_PIXEL + EditorTile.COLLISION_MAP_BYTES_PER_PIXEL) * (EditorMap.TILE_WH ** 2)
+    TEMPORARY_EXTENSION = '.tmp'
+
+    def __init__(self, base_path: str, level: int, column: int, row: int, residency_cache: TileResidencyCache | None = None, level_of_detail: 'LevelOfDetail | None' = None):
+        self.level: int = level
+        self.column: int = column
+        self.row: int = row
+        self.loaded: bool = False
+        self.image_reference: str = f"l{self.level}_{self.column}_{self.row}"
+        self.collision_image_reference: str = f"cl{self.level}_{self.column}_{self.row}"
+        self.path: str = f"{base_path}{self.image_reference}"
+        self.pretty_bytearray: bytes | None = None
+        self.collision_bytearray: bytes | None = None
+        self.residency_cache: TileResidencyCache | None = residency_cache
+        self.level_of_detail: LevelOfDetail | None = level_of_detail
+
+    def get_resident_bytes(self):
+        return EditorLODTile.RESIDENT_BYTES
+
+    def read_maps(self):
+        # returns None when the tile has not been built
+        if self.loaded:
+            return self.pretty_bytearray, self.collision_bytearray
+        if not os.path.isfile(self.path):
+            return None
         with open(self.path, mode='rb') as file:
-            # get the byte array
-            byte_array = bytearray(file.read())
-            # separate the pretty map byte array
-            self.pretty_bytearray = byte_array[0:(EditorMap.TILE_WH**2)*4]  # (256*256*4); 256 = tile width/height; 4 = number of bytes per pixel
-            # separate the collision map byte array
-            self.collision_bytearray = byte_array[((EditorMap.TILE_WH**2)*4)+1:((EditorMap.TILE_WH**2)*5)+1]
+            byte_array = file.read()
+        try:
+            return TileCodec.decode(byte_array)
+        except TileCodec.DECODE_ERRORS as error:
+            # a damaged tile is treated as not built and is built again
+            LOGGER.warning("could not read level of detail tile %s: %s", self.image_reference, error)
+            if self.level_of_detail is not None:
+                self.level_of_detail.mark_lod_tile_dirty(self.level, self.column, self.row)
+            return None
 
-    def draw_image(self, render_instance, screen_instance, gl_context, ltwh: list[int, int, int, int], map_mode: MapModes, load: bool = False, draw_tiles: bool = True):
-        loaded = False
-        if load and not self.loaded:
-            self.load(render_instance, screen_instance, gl_context)
-            loaded = True
+    def write(self, render_instance, pretty_bytearray: bytes, collision_bytearray: bytes):
+        # written to a temporary file and renamed so a crash never leaves a partly written tile
+        temporary_path = f"{self.path}{EditorLODTile.TEMPORARY_EXTENSION}"
+        with open(temporary_path, "wb") as file:
+            file.write(TileCodec.encode(pretty_bytearray, collision_bytearray))
+        os.replace(temporary_path, self.path)
+        if self.loaded:
+            self.pretty_bytearray = pretty_bytearray
+            self.collision_bytearray = collision_bytearray
+            render_instance.write_pixels_from_bytearray(self.image_reference, self.pretty_bytearray)
+            render_instance.write_pixels_from_bytearray(self.collision_image_reference, self.collision_bytearray)
 
+    def load(self, render_instance, screen_instance, gl_context):
         if not self.loaded:
-            return loaded
+            maps = self.read_maps()
+            if maps is None:
+                maps = bytes(EditorTile.PRETTY_MAP_BYTES_PER_PIXEL * (EditorMap.TILE_WH ** 2)), bytes(EditorTile.COLLISION_MAP_BYTES_PER_PIXEL * (EditorMap.TILE_WH ** 2))
+            self.pretty_bytearray, self.collision_bytearray = bytes(maps[0]), bytes(maps[1])
+            render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.pretty_bytearray, EditorTile.PRETTY_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.image_reference, owner=self)
+            render_instance.add_moderngl_texture_using_bytearray(screen_instance, gl_context, self.collision_bytearray, EditorTile.COLLISION_MAP_BYTES_PER_PIXEL, EditorMap.TILE_WH, EditorMap.TILE_WH, self.collision_image_reference, owner=self)
+            if self.residency_cache is not None:
+                self.residency_cache.add(self)
+        self.loaded = True
 
-        if not draw_tiles:
-            return True
+    def unload(self, render_instance):
+        if self.loaded:
+            self.pretty_bytearray = None
+            self.collision_bytearray = None
+            render_instance.remove_moderngl_texture_from_renderable_objects_dict(self.image_reference)
+            render_instance.remove_moderngl_texture_from_renderable_objects_dict(self.collision_image_reference)
+            if self.residency_cache is not None:
+                self.residency_cache.discard(self)
+        self.loaded = False
 
-        match map_mode:
-            case MapModes.PRETTY:
-                render_instance.basic_rect_ltwh_to_quad(screen_instance, gl_context, self.image_reference, ltwh)
-            case MapModes.COLLISION:
-                render_instance.draw_collision_map_tile_in_editor(screen_instance, gl_context, self.collision_image_reference, ltwh)
-        return loaded
+
+class LevelOfDetail():
+    # downsampled copies of the map, stored next to the map tiles as l{level}_{column}_{row}
+    # level n is drawn when zoomed out to 1/(2 ** n) so an overview of the whole map loads a few dozen tiles instead of every map tile
+    # each level is built from the one below it; 2x2 tiles are joined and scaled down to one tile
+    LEVELS = 3
+    _MAX_REBUILD_TIME = 0.01  # s
+
+    def __init__(self, base_path: str, tile_array_shape: list[int, int], residency_cache: TileResidencyCache, level_manifest: LevelManifest):
+        self.level_manifest: LevelManifest = level_manifest
+        # level 0 is the map itself
+        self.tile_arrays: list[list[list[EditorLODTile]]] = [[]]
+        for level in range(1, LevelOfDetail.LEVELS + 1):
+            columns = math.ceil(tile_array_shape[0] / (2 ** level))
+            rows = math.ceil(tile_array_shape[1] / (2 ** level))
+            self.tile_arrays.append([[EditorLODTile(base_path, level, column, row, residency_cache, self) for row in range(rows)] for column in range(columns)])
+        # (level, column, row) of lod tiles that are out of date
+        self.dirty_tiles: set[tuple[int, int, int]] = set()
+        # (column, row) of map tiles whose edits are not in every level yet
+        self.edited_map_tiles: set[tuple[int, int]] = set()
+        # levels 1 to built_levels are complete; levels saved before levels of detail existed are built by rebuild_dirty
+        self.built_levels: int = level_manifest.lod_levels
+        for level in range(self.built_levels + 1, LevelOfDetail.LEVELS + 1):
+            for column in range(len(self.tile_arrays[level])):
+                for row in range(len(self.tile_arrays[level][column])):
+                    self.dirty_tiles.add((level, column, row))
+
+    @staticmethod
+    def get_level(pixel_scale: int | float):
+        if pixel_scale >= 1:
+            return 0
+        return min(LevelOfDetail.LEVELS, round(math.log2(1 / pixel_scale)))
+
+    def mark_dirty(self, column: int, row: int):
+        self.edited_map_tiles.add((column, row))
+        for level in range(1, LevelOfDetail.LEVELS + 1):
+            self.dirty_tiles.add((level, column >> level, row >> level))
+
+    def mark_lod_tile_dirty(self, level: int, column: int, row: int):
+        # the tile and every tile built from it
+        for parent_level in range(level, LevelOfDetail.LEVELS + 1):
+            shift = parent_level - level
+            self.dirty_tiles.add((parent_level, column >> shift, row >> shift))
+
+    def rebuild_dirty(self, render_instance, tile_array: list[list[EditorTile]], max_time: float = _MAX_REBUILD_TIME):
+        # lower levels are rebuilt first since each level is built from the one below it
+        if not self.dirty_tiles:
+            return
+        start_rebuild = get_time()
+        for level, column, row in sorted(self.dirty_tiles):
+            # discarded first; a damaged child found while rebuilding marks this tile dirty again
+            self.dirty_tiles.discard((level, column, row))
+            self._rebuild_tile(render_instance, tile_array, level, column, row)
+            if get_time() - start_rebuild > max_time:
+                break
+        if self.built_levels < LevelOfDetail.LEVELS:
+            self._update_built_levels()
+        if not self.dirty_tiles:
+            self.edited_map_tiles = set()
+
+    def _update_built_levels(self):
+        # a level is complete once it and every level below it have no tiles left to build
+        self.built_levels = max(self.built_levels, (min(level for level, _, _ in self.dirty_tiles) - 1) if self.dirty_tiles else LevelOfDetail.LEVELS)
+        if self.built_levels > self.level_manifest.lod_levels:
+            self.level_manifest.lod_levels = self.built_levels
+            self.level_manifest.save()
+
+    def unload(self, render_instance):
+        for lod_tile_array in self.tile_arrays:
+            for lod_tile_column in lod_tile_array:
+                for lod_tile in lod_tile_column:
+                    lod_tile.unload(render_instance)
+
+    def _rebuild_tile(self, render_instance, tile_array: list[list[EditorTile]], level: int, column: int, row: int):
+        tile_wh = EditorMap.TILE_WH
+        half_tile_wh = tile_wh // 2
+        pretty_row_bytes = tile_wh * EditorTile.PRETTY_MAP_BYTES_PER_PIXEL
+        empty_pretty_row = bytes(pretty_row_bytes)
+        child_tile_array = tile_array if level == 1 else self.tile_arrays[level - 1]
+        # join the 2x2 child pretty maps into one (2 * tile_wh) x (2 * tile_wh) map; missing children are transparent
+        # collision values cannot be averaged, so every other collision pixel is kept
+        pretty_rows = []
+        collision_bytearray = bytearray(EditorTile.COLLISION_MAP_BYTES_PER_PIXEL * (tile_wh ** 2))
+        for child_y in range(2):
+            child_maps = []
+            for child_x in range(2):
+                child_column, child_row = (2 * column) + child_x, (2 * row) + child_y
+                maps = None
+                if (child_column < len(child_tile_array)) and (child_row < len(child_tile_array[child_column])):
+                    maps = child_tile_array[child_column][child_row].read_maps()
+                if maps is None:
+                    child_maps.append(None)
+                    continue
+                child_pretty, child_collision = bytes(maps[0]), bytes(maps[1])
+                child_maps.append(child_pretty)
+                for pixel_y in range(0, tile_wh, 2):
+                    start = (((child_y * half_tile_wh) + (pixel_y // 2)) * tile_wh) + (child_x * half_tile_wh)
+                    collision_bytearray[start:start + half_tile_wh] = child_collision[pixel_y * tile_wh:(pixel_y + 1) * tile_wh:2]
+            for pixel_y in range(tile_wh):
+                for child_pretty in child_maps:
+                    pretty_rows.append(empty_pretty_row if child_pretty is None else child_pretty[pixel_y * pretty_row_bytes:(pixel_y + 1) * pretty_row_bytes])
+        joined_image = pygame.image.frombytes(b''.join(pretty_rows), (2 * tile_wh, 2 * tile_wh), EditorTile.PYGAME_IMAGE_FORMAT)
+        pretty_bytearray = pygame.image.tobytes(pygame.transform.smoothscale(joined_image, (tile_wh, tile_wh)), EditorTile.PYGAME_IMAGE_FORMAT)
+        self.tile_arrays[level][column][row].write(render_instance, pretty_bytearray, bytes(collision_bytearray))
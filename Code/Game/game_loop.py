@@ -1,11 +1,11 @@
 from Code.utilities import loading_and_unloading_images_manager, IMAGE_PATHS, LOADED_IN_MENU, LOADED_IN_GAME, LOADED_IN_EDITOR, COLORS
-from Code.Game.game_utilities import Map, StoredDraws
+from Code.Game.game_utilities import Map
 from Code.Game.game_objects import Player
 from copy import deepcopy
 
 
 class GameSingleton():
-    def __init__(self, Render, Screen, gl_context, Time, Keys, Cursor, PATH):
+    def __init__(self, Render, Screen, gl_context, Time, Keys, Cursor, PATH, level_path: str):
         #
         # player
         self.player: Player = Player(PATH)
@@ -13,17 +13,20 @@ class GameSingleton():
         # map
         #self.map: Map = Map(Screen, gl_context, Render, PATH, "C:\\Users\\Kayle\\Desktop\\Blight\\Hamster_Ball_Blight\\Projects\\Project1\\Level1\\")
         self.map: Map = Map()
-        self.map.load_level(self, Render, gl_context, Screen, Time, Keys, Cursor, "C:\\Users\\Kayle\\Desktop\\Blight\\Hamster_Ball_Blight\\Projects\\Project1\\Level1\\", self.player.position_x, self.player.position_y)
-        #
-        # drawing
-        self.stored_draws: StoredDraws = StoredDraws()
+        self.map.load_level(self, Render, gl_context, Screen, Time, Keys, Cursor, level_path, self.player.position_x, self.player.position_y)
+
+    def quit(self):
+        self.map.quit()
 
 
 def game_loop(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
     # check whether the API should be something else
     if Api.setup_required:
         loading_and_unloading_images_manager(Screen, Render, gl_context, IMAGE_PATHS, [LOADED_IN_GAME], [LOADED_IN_MENU, LOADED_IN_EDITOR])
-        Api.api_initiated_singletons['Game'] = Api.api_singletons['Game'](Render, Screen, gl_context, Time, Keys, Cursor, PATH)
+        # stop the worker threads of a game that was started before
+        if Api.api_initiated_singletons['Game']:
+            Api.api_initiated_singletons['Game'].quit()
+        Api.api_initiated_singletons['Game'] = Api.api_singletons['Game'](Render, Screen, gl_context, Time, Keys, Cursor, PATH, Api.get_level_path())
         Api.setup_required = False
     Cursor.add_cursor_this_frame('classic_cursor')
     # get the singleton for the game
@@ -38,4 +41,6 @@ def game_loop(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor):
     Singleton.map.update_tile_loading(Singleton, Render, Screen, gl_context, Time, Keys, Cursor)
 
     # execute stored draws
-    Singleton.stored_draws.draw(Render, Screen, gl_context)
+    Render.begin_pass('stored draws')
+    Render.execute_stored_draws(Screen, gl_context)
+    Render.end_pass()
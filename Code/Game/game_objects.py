@@ -1,8 +1,8 @@
+import os
 import pygame
 import math
-from copy import deepcopy
 from Code.utilities import atan2, move_number_to_desired_range, difference_between_angles, angle_in_range, get_time
-from Code.Game.game_utilities import Map, get_vector_magnitude_in_direction, get_xy_vector_components
+from Code.Game.game_utilities import Map, BallCollisionMask, BallCollisionSampler, get_vector_magnitude_in_direction, get_xy_vector_components
 from bresenham import bresenham
 from Code.utilities import COLORS
 
@@ -27,8 +27,11 @@ class Player():
     # ball size
     BALL_WH = 69
 
-    # used for drawing
+    # used for drawing; draws in the same layer may be reordered so draws of the same kind are together
+    WATER_JET_ORDER = 4
     PRETTY_BALL_ORDER = 5
+    SPOUT_ORDER = 6
+    DEBUG_TEXT_ORDER = 9
 
     # used for force calculations
     MASS = 1
@@ -103,7 +106,7 @@ class Player():
         self.bouncing_low: bool = False
         #
         # pathing
-        self.player_image_folder_path: str = f'{PATH}\\Images\\not_always_loaded\\game\\player\\'
+        self.player_image_folder_path: str = os.path.join(PATH, 'Images', 'not_always_loaded', 'game', 'player', '')
         self.inner_ball_collision_path: str = 'inner_ball_collision.png'
         self.outer_ball_collision_path: str = 'outer_ball_collision.png'
         #
@@ -156,13 +159,13 @@ class Player():
         # inner collision
         self.inner_ball_collision_image: pygame.Surface | None = None
         self.inner_ball_collision_data: dict[tuple[int, int], tuple[float, float, float]] = {}
-        self.inner_ball_collisions: dict[tuple[int, int], bool] = {}
-        self.inner_ball_collisions_default: dict[tuple[int, int], bool] = self.inner_ball_collisions
+        self.inner_ball_mask: BallCollisionMask | None = None
         # outer collision
         self.outer_ball_collision_image: pygame.Surface | None = None
         self.outer_ball_collision_data: dict[tuple[int, int], tuple[float, float, float]] = {}
-        self.outer_ball_collisions: dict[tuple[int, int], bool] = {}
-        self.outer_ball_collisions_default: dict[tuple[int, int], bool] = self.outer_ball_collisions
+        self.outer_ball_mask: BallCollisionMask | None = None
+        # reads the collision map under the inner and outer ball
+        self.collision_sampler: BallCollisionSampler = BallCollisionSampler()
         #
         self.ball_width: int = None
         self.ball_width_index: int = None
@@ -279,7 +282,7 @@ class Player():
         self._calculate_position(Singleton, Render, Screen, gl_context, Keys, Cursor, Time)
         self._update_screen_position(Singleton.map, Screen, Time)
         self._reset_forces()
-        self._draw(Singleton.map, Singleton.stored_draws, Render, Screen, gl_context)
+        self._draw(Singleton.map, Render, Screen, gl_context)
     #
     def _update_player_controls(self, Keys):
         # movement controls
@@ -312,27 +315,8 @@ class Player():
         self.tool2.update(Singleton, Render, Screen, gl_context, Keys, Cursor, Time)
     #
     def _get_normal_force_angle(self, map_object):
-        number_of_collisions = 0
-        cumulative_x = 0
-        cumulative_y = 0
-        x_pos, y_pos = round(self.position_x), round(self.position_y)
-        for (offset_x, offset_y), (_, cos_angle, sin_angle) in self.outer_ball_collision_data.items():
-            # collision may have already been recorded from an object
-            if self.outer_ball_collisions[(offset_x, offset_y)]:
-                cumulative_x += cos_angle
-                cumulative_y += sin_angle
-                number_of_collisions += 1
-                continue
-            # get map collision pixel data
-            tile_x, pixel_x = divmod(x_pos+offset_x, Map.TILE_WH)
-            tile_y, pixel_y = divmod(y_pos+offset_y, Map.TILE_WH)
-            pixel_collision = map_object.tiles[tile_x][tile_y].collision_bytearray[(pixel_y * Map.TILE_WH) + pixel_x]
-            # record collisions from the map
-            if (pixel_collision == Map.COLLISION) or (pixel_collision == Map.GRAPPLEABLE):
-                cumulative_x += cos_angle
-                cumulative_y += sin_angle
-                number_of_collisions += 1
-                continue
+        # collisions recorded from objects are included
+        _, number_of_collisions, cumulative_x, cumulative_y = self.collision_sampler.sample(map_object, round(self.position_x), round(self.position_y), self.outer_ball_mask)
         # end the function if there was no collision
         if number_of_collisions == 0:
             self.normal_force_angle = None
@@ -418,8 +402,8 @@ class Player():
                 self.force_normal_y += Player.MASS * (final_velocity_y - self.velocity_y) / Time.delta_time
     #
     def _reset_ball_collisions(self):
-        self.inner_ball_collisions = deepcopy(self.inner_ball_collisions_default)
-        self.outer_ball_collisions = deepcopy(self.outer_ball_collisions_default)
+        self.inner_ball_mask.reset_recorded()
+        self.outer_ball_mask.reset_recorded()
     #
     def _calculate_force(self):
         self.force_x = self.force_gravity_x + self.force_movement_x + self.force_tool_x + self.force_normal_x + self.force_water_x
@@ -646,26 +630,20 @@ class Player():
         self.force_water_x = Player.DEFAULT_FORCE_WATER_X
         self.force_water_y = Player.DEFAULT_FORCE_WATER_Y
     #
-    def _draw(self, map_object, stored_draws, Render, Screen, gl_context):
+    def _draw(self, map_object, Render, Screen, gl_context):
         # draw tools
         for tool in [self.tool1]:
             if tool.being_used:
                 match type(tool).__name__:
                     case Player.WaterJet.__name__:
                         distance_from_ball = Render.compute_water_jet(Screen, gl_context, map_object, self)
-                        Render.store_draw("abc", Render.draw_string_of_characters, {"string": str(distance_from_ball), "lt": [20, 20], "text_pixel_size": 4, "rgba": COLORS['RED']})
-                        stored_draws.add_draw("abc", Player.PRETTY_BALL_ORDER)
+                        Render.store_draw(Player.DEBUG_TEXT_ORDER, Render.draw_string_of_characters, {"string": str(distance_from_ball), "lt": [20, 20], "text_pixel_size": 4, "rgba": COLORS['RED']})
 
-                        Render.store_draw(self.water_jet_reference, Render.draw_water_jet, {'object_name': 'black_pixel', 'ball_center': [self.screen_position_x + self.ball_radius, self.screen_position_y + self.ball_radius], 'ball_radius': self.ball_radius, 'max_length_from_center': self.ball_radius + Player.WaterJet.MAXIMUM_LENGTH, 'current_length_from_center': self.ball_radius + tool.length_float, 'rotation': self.spout.rotation, 'minimum_water_jet_thickness': Player.WaterJet.MINIMUM_WATER_JET_THICKNESS, 'moment_in_wave_period': ((get_time() - tool.started_being_used_time) % Player.WaterJet.WAVE_PERIOD_DURATION) / Player.WaterJet.WAVE_PERIOD_DURATION})
-                        stored_draws.add_draw(self.water_jet_reference, Player.PRETTY_BALL_ORDER)
-                    case Player.Grapple.__name__:
-                        Render.store_draw(self.water_jet_reference, Render.draw_water_jet, {'object_name': 'black_pixel', 'ball_center': [self.screen_position_x + self.ball_radius, self.screen_position_y + self.ball_radius], 'ball_radius': self.ball_radius, 'max_length_from_center': self.ball_radius + Player.WaterJet.MAXIMUM_LENGTH, 'current_length_from_center': self.ball_radius + tool.length_float, 'rotation': self.spout.rotation, 'minimum_water_jet_thickness': Player.WaterJet.MINIMUM_WATER_JET_THICKNESS, 'moment_in_wave_period': ((get_time() - tool.started_being_used_time) % Player.WaterJet.WAVE_PERIOD_DURATION) / Player.WaterJet.WAVE_PERIOD_DURATION})
+                        Render.store_draw(Player.WATER_JET_ORDER, Render.draw_water_jet, {'object_name': 'black_pixel', 'ball_center': [self.screen_position_x + self.ball_radius, self.screen_position_y + self.ball_radius], 'ball_radius': self.ball_radius, 'max_length_from_center': self.ball_radius + Player.WaterJet.MAXIMUM_LENGTH, 'current_length_from_center': self.ball_radius + tool.length_float, 'rotation': self.spout.rotation, 'minimum_water_jet_thickness': Player.WaterJet.MINIMUM_WATER_JET_THICKNESS, 'moment_in_wave_period': ((get_time() - tool.started_being_used_time) % Player.WaterJet.WAVE_PERIOD_DURATION) / Player.WaterJet.WAVE_PERIOD_DURATION})
         # draw the front of the ball
-        Render.store_draw(self.ball_front_reference, Render.basic_rect_ltwh_to_quad, {'object_name': self.ball_front_reference, 'ltwh': [round(self.screen_position_x), round(self.screen_position_y), self.ball_width, self.ball_height]})
-        stored_draws.add_draw(self.ball_front_reference, Player.PRETTY_BALL_ORDER)
+        Render.store_draw(Player.PRETTY_BALL_ORDER, Render.basic_rect_ltwh_to_quad, {'object_name': self.ball_front_reference, 'ltwh': [round(self.screen_position_x), round(self.screen_position_y), self.ball_width, self.ball_height]})
         # draw spout
-        Render.store_draw(self.spout_reference, Render.rotation_rect_ltwhr_to_quad, {'object_name': self.spout_reference, 'ltwhr': [round(self.screen_position_x), round(self.screen_position_y), self.ball_width, self.ball_height, self.spout.rotation]})
-        stored_draws.add_draw(self.spout_reference, Player.PRETTY_BALL_ORDER)
+        Render.store_draw(Player.SPOUT_ORDER, Render.rotation_rect_ltwhr_to_quad, {'object_name': self.spout_reference, 'ltwhr': [round(self.screen_position_x), round(self.screen_position_y), self.ball_width, self.ball_height, self.spout.rotation]})
     #
     def _initialize_ball_collision(self):
         # load the images
@@ -685,17 +663,15 @@ class Player():
                 if self.inner_ball_collision_image.get_at((index_x, index_y)) == (0, 0, 0, 255):
                     angle_from_center = atan2((index_x + 0.5 - self.ball_radius), -(index_y + 0.5 - self.ball_radius))
                     self.inner_ball_collision_data[(index_x, index_y)] = (angle_from_center, math.cos(math.radians(angle_from_center)), math.sin(math.radians(angle_from_center)))
-                    self.inner_ball_collisions[(index_x, index_y)] = False
         # outer
         for index_x in range(self.outer_ball_collision_image.get_width()):
             for index_y in range(self.outer_ball_collision_image.get_height()):
                 if self.outer_ball_collision_image.get_at((index_x, index_y)) == (0, 0, 0, 255):
                     angle_from_center = atan2((index_x + 0.5 - self.ball_radius - 1), -(index_y + 0.5 - self.ball_radius - 1))
                     self.outer_ball_collision_data[(index_x - 1, index_y - 1)] = (angle_from_center, math.cos(math.radians(angle_from_center)), math.sin(math.radians(angle_from_center)))
-                    self.outer_ball_collisions[(index_x - 1, index_y - 1)] = False
-        # define a default collision to revert active collisions each frame
-        self.inner_ball_collisions_default = deepcopy(self.inner_ball_collisions)
-        self.outer_ball_collisions_default = deepcopy(self.outer_ball_collisions)
+        # numpy copies of the collision pixels; collisions recorded from objects are reset each frame
+        self.inner_ball_mask = BallCollisionMask(self.inner_ball_collision_data)
+        self.outer_ball_mask = BallCollisionMask(self.outer_ball_collision_data)
         # get keys to ball collision pixels representing certain directions
         self.ball_left_key = (0, self.ball_center_index)
         self.ball_up_key = (self.ball_center_index, 0)
@@ -719,22 +695,8 @@ class Player():
         return elasticity
     #
     def _get_ball_collisions(self, Map, x_pos: int, y_pos: int, inner: bool):
-        # checking inner vs. outer ball collisions
-        if inner:
-            ball_collisions = deepcopy(self.inner_ball_collisions_default)
-        else:
-            ball_collisions = deepcopy(self.outer_ball_collisions_default)
-        number_of_collisions = 0
-        for (offset_x, offset_y) in ball_collisions.keys():
-            # get map collision pixel data
-            tile_x, pixel_x = divmod(x_pos+offset_x, Map.TILE_WH)
-            tile_y, pixel_y = divmod(y_pos+offset_y, Map.TILE_WH)
-            pixel_collision = Map.tiles[tile_x][tile_y].collision_bytearray[(pixel_y * Map.TILE_WH) + pixel_x]
-            # record collisions from the map
-            if (pixel_collision == Map.COLLISION) or (pixel_collision == Map.GRAPPLEABLE):
-                number_of_collisions += 1
-                ball_collisions[(offset_x, offset_y)] = True
-                continue
+        # checking inner vs. outer ball collisions; ball_collisions is in the order of the ball's collision data
+        ball_collisions, number_of_collisions, _, _ = self.collision_sampler.sample(Map, x_pos, y_pos, self.inner_ball_mask if inner else self.outer_ball_mask)
         return ball_collisions, number_of_collisions
     #
     def _validate_offset_position_on_slope(self, collision_map, x_pos, y_pos):
@@ -742,44 +704,15 @@ class Player():
         on_a_slope = True
         normal_angle = 0.0
 
-        # inner ball
-        for (offset_x, offset_y), (_, cos_angle, sin_angle) in self.inner_ball_collision_data.items():
-            # collision may have already been recorded from an object
-            if self.inner_ball_collisions[(offset_x, offset_y)]:
-                valid = False
-                on_a_slope = False
-                return valid, on_a_slope, normal_angle
-            # get map collision pixel data
-            tile_x, pixel_x = divmod(x_pos+offset_x, Map.TILE_WH)
-            tile_y, pixel_y = divmod(y_pos+offset_y, Map.TILE_WH)
-            pixel_collision = collision_map.tiles[tile_x][tile_y].collision_bytearray[(pixel_y * Map.TILE_WH) + pixel_x]
-            # record collisions from the map
-            if (pixel_collision == Map.COLLISION) or (pixel_collision == Map.GRAPPLEABLE):
-                valid = False
-                on_a_slope = False
-                return valid, on_a_slope, normal_angle
+        # inner ball; collisions recorded from objects are included
+        _, number_of_collisions, _, _ = self.collision_sampler.sample(collision_map, x_pos, y_pos, self.inner_ball_mask)
+        if number_of_collisions > 0:
+            valid = False
+            on_a_slope = False
+            return valid, on_a_slope, normal_angle
 
         # outer ball
-        number_of_collisions = 0
-        cumulative_x = 0
-        cumulative_y = 0
-        for (offset_x, offset_y), (_, cos_angle, sin_angle) in self.outer_ball_collision_data.items():
-            # collision may have already been recorded from an object
-            if self.outer_ball_collisions[(offset_x, offset_y)]:
-                cumulative_x += cos_angle
-                cumulative_y += sin_angle
-                number_of_collisions += 1
-                continue
-            # get map collision pixel data
-            tile_x, pixel_x = divmod(x_pos+offset_x, Map.TILE_WH)
-            tile_y, pixel_y = divmod(y_pos+offset_y, Map.TILE_WH)
-            pixel_collision = collision_map.tiles[tile_x][tile_y].collision_bytearray[(pixel_y * Map.TILE_WH) + pixel_x]
-            # record collisions from the map
-            if (pixel_collision == Map.COLLISION) or (pixel_collision == Map.GRAPPLEABLE):
-                cumulative_x += cos_angle
-                cumulative_y += sin_angle
-                number_of_collisions += 1
-                continue
+        _, number_of_collisions, cumulative_x, cumulative_y = self.collision_sampler.sample(collision_map, x_pos, y_pos, self.outer_ball_mask)
         # end the function if there was no collision
         if number_of_collisions == 0:
             on_a_slope = False
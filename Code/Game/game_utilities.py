@@ -1,10 +1,21 @@
 import pygame
-import io
 import math
+import queue
+import logging
+import numpy as np
 from array import array
 from copy import deepcopy
 from glob import glob
-from Code.utilities import move_number_to_desired_range, get_all_paths_in_directory, difference_between_angles, COLORS
+from concurrent.futures import ThreadPoolExecutor
+from Code.utilities import move_number_to_desired_range, difference_between_angles, get_time, COLORS
+from Code.level_pack import LevelPack
+from Code.level_manifest import LevelManifest
+from Code.tile_blob_store import TileBlobStore
+from Code.tile_codec import TileCodec
+from Code.tile_cache import TileResidencyCache
+
+
+LOGGER = logging.getLogger(__name__)
 
 
 class Map():
@@ -33,6 +44,9 @@ class Map():
 
     def __init__(self):
         self.level_path: str
+        self.level_pack: LevelPack | None = None
+        self.level_manifest: LevelManifest
+        self.blob_store: TileBlobStore
         self.map_wh: array[int, int]
         self.tiles_across: int
         self.tiles_high: int
@@ -51,32 +65,56 @@ class Map():
         self.offset_x: int = 0
         self.offset_y: int = 0
         self.tiles: list[list[Tile]]
+        self.prefetcher: TilePrefetcher = TilePrefetcher()
+        self.residency_cache: TileResidencyCache = TileResidencyCache()
+        self.tile_map = None  # TileMap; drawn in one pass
+        self.render_instance = None  # RenderObjects the level was loaded into; used to unload it
     #
     def load_level(self, Singleton, Render, gl_context, Screen, Time, Keys, Cursor, level_path: str, player_center_x: int | float, player_center_y: int | float):
+        # tiles still being read belong to the previous level
+        self.prefetcher.shutdown()
+        self.prefetcher = TilePrefetcher()
+        self.unload_level()
+        self.render_instance = Render
         self.level_path = level_path
+        self.level_pack = LevelPack.open(level_path)
         # get the map size
-        tile_size_generator = ([int(index_x), int(index_y)] for (index_x, index_y) in (str(path).split('\\')[-1][1:].split('_') for path in get_all_paths_in_directory(self.level_path) if path.suffix == Map.TILE_EXTENSION))
-        max_tile_x = 0
-        max_tile_y = 0
-        for (tile_x, tile_y) in tile_size_generator:
-            if tile_x > max_tile_x:
-                max_tile_x = tile_x
-            if tile_y > max_tile_y:
-                max_tile_y = tile_y
-        self.map_wh = array('i', [Map.TILE_WH + (max_tile_x * Map.TILE_WH), Map.TILE_WH + (max_tile_y * Map.TILE_WH)])
-        self.tiles_across = max_tile_x + 1
-        self.tiles_high = max_tile_y + 1
+        self.level_manifest = LevelManifest.open(level_path, self.level_pack)
+        self.blob_store = TileBlobStore(TileBlobStore.get_store_path(level_path))
+        Render.texture_registry.add_evictor(self.residency_cache)
+        self.map_wh = array('i', self.level_manifest.map_wh)
+        self.tiles_across = self.level_manifest.tiles_across
+        self.tiles_high = self.level_manifest.tiles_high
         self.min_tile_x = 0
         self.min_tile_y = 0
         self.max_tile_x = self.tiles_across - 1
         self.max_tile_y = self.tiles_high - 1
         # initialize tiles
-        self.tiles = [[Tile(level_path, index_x, index_y) for index_y in range(self.tiles_high)] for index_x in range(self.tiles_across)]
+        self.tile_map = Render.create_tile_map(gl_context, self.tiles_across, self.tiles_high, Map.TILE_WH)
+        self.tiles = [[Tile(level_path, index_x, index_y, self.level_pack, self.residency_cache, self.level_manifest.get_tile(index_x, index_y), self.blob_store, self.tile_map) for index_y in range(self.tiles_high)] for index_x in range(self.tiles_across)]
         # initialize map offset and loaded tiles
         self.offset_x = -round(player_center_x - (Screen.width // 2))
         self.offset_y = -round(player_center_y - (Screen.height // 2))
         self.update_tile_loading(Singleton, Render, Screen, gl_context, Time, Keys, Cursor)
     #
+    def quit(self):
+        self.prefetcher.shutdown()
+        self.unload_level()
+    #
+    def unload_level(self):
+        # unload every resident tile and release the tile map so nothing of this level stays in gpu memory or can be evicted by name later
+        if self.render_instance is None:
+            return
+        Render = self.render_instance
+        Render.texture_registry.remove_evictor(self.residency_cache)
+        for tile_column in self.tiles:
+            for tile in tile_column:
+                tile.unload(Render)
+        self.residency_cache = TileResidencyCache()
+        self.tile_map.release()
+        self.tile_map = None
+        self.render_instance = None
+    #
     def update_tile_loading(self, Singleton, Render, Screen, gl_context, Time, Keys, Cursor):
         # adjust the offset depending on the map edges
         self.reached_left_edge = self.offset_x >= 0
@@ -98,25 +136,33 @@ class Map():
         self.tiles_loaded_y[0] = move_number_to_desired_range(self.min_tile_y, loaded_tiles_top // Map.TILE_WH, self.max_tile_y)
         self.tiles_loaded_x[1] = move_number_to_desired_range(self.min_tile_x, loaded_tiles_right // Map.TILE_WH, self.max_tile_x)
         self.tiles_loaded_y[1] = move_number_to_desired_range(self.min_tile_y, loaded_tiles_bottom // Map.TILE_WH, self.max_tile_y)
-        # unload unneeded tiles
-        for index_x in range(self.last_tiles_loaded_x[0], self.last_tiles_loaded_x[1] + 1):
-            for index_y in range(self.last_tiles_loaded_y[0], self.last_tiles_loaded_y[1] + 1):
-                if (self.tiles_loaded_x[0] <= index_x <= self.tiles_loaded_x[1]) and (self.tiles_loaded_y[0] <= index_y <= self.tiles_loaded_y[1]):
-                    continue
-                self.tiles[index_x][index_y].unload(Render)
+        # read tiles ahead of the camera in the background and upload the ones that are ready
+        prefetch_tiles_x, prefetch_tiles_y = self.prefetcher.get_prefetch_range(self, Singleton.player)
+        self.prefetcher.request_tiles(self, prefetch_tiles_x, prefetch_tiles_y)
+        self.prefetcher.upload_tiles(Render, Screen, gl_context, prefetch_tiles_x, prefetch_tiles_y)
         # change how loading and drawing works depending on player direction
         range_x = range(self.tiles_loaded_x[0], self.tiles_loaded_x[1] + 1, 1) if (Singleton.player.velocity_x > 0) else range(self.tiles_loaded_x[1], self.tiles_loaded_x[0] - 1, -1)
         range_y = range(self.tiles_loaded_y[0], self.tiles_loaded_y[1] + 1, 1) if (Singleton.player.velocity_y < 0) else range(self.tiles_loaded_y[1], self.tiles_loaded_y[0] - 1, -1)
-        # load and draw needed tiles
-        load = True
+        # load needed tiles; tiles on screen that have not been prefetched yet are loaded immediately
         ltwh = [self.offset_x, self.offset_y, Map.TILE_WH, Map.TILE_WH]
         for index_x in range_x:
             ltwh[0] = self.offset_x + (Map.TILE_WH * index_x)
             for index_y in range_y:
                 ltwh[1] = self.offset_y + (Map.TILE_WH * index_y)
                 tile = self.tiles[index_x][index_y]
+                self.residency_cache.request(tile)
                 priority_load = rectangles_overlap(ltwh, [0, 0, Screen.width, Screen.height])
-                load = tile.draw(Render, Screen, gl_context, ltwh, load or priority_load)
+                if priority_load:
+                    self.prefetcher.record_tile_needed(tile)
+                # uniform tiles cost nothing to load, so they are always loaded
+                if (not tile.loaded) and (priority_load or (tile.uniform is not None)):
+                    tile.load(Render, Screen, gl_context)
+        # every loaded tile on screen is drawn in one pass
+        Render.begin_pass('map tiles')
+        Render.draw_tile_map(Screen, gl_context, self.tile_map, self.offset_x, self.offset_y)
+        Render.end_pass()
+        # tiles that left the view stay loaded until the residency cache needs the memory
+        self.residency_cache.end_frame(Render)
     #
     def get_collision_tile_references_for_ball(self, player_object):
         # get the current tile and pixel
@@ -244,68 +290,300 @@ class Tile():
     PRETTY_MAP_BYTES_PER_TILE = Map.TILE_WH * Map.TILE_WH * PRETTY_MAP_BYTES_PER_PIXEL
     COLLISION_MAP_BYTES_PER_TILE = Map.TILE_WH * Map.TILE_WH * COLLISION_MAP_BYTES_PER_PIXEL
     BYTES_PER_NEWLINE = 1
+    # cpu byte arrays plus gpu textures
+    RESIDENT_BYTES = 2 * (PRETTY_MAP_BYTES_PER_TILE + COLLISION_MAP_BYTES_PER_TILE)
+    # uniform tiles share these instead of each holding their own
+    UNIFORM_COLLISION_REFERENCE = 'uniform_collision_{}'
+    # tiles with identical maps share one texture
+    SHARED_PRETTY_REFERENCE = 'shared_pretty_{}'
+    SHARED_COLLISION_REFERENCE = 'shared_collision_{}'
+    _UNIFORM_COLLISION_BYTEARRAYS: dict[int, bytes] = {}
 
-    def __init__(self, level_path: str, index_x: int, index_y: int):
+    def __init__(self, level_path: str, index_x: int, index_y: int, level_pack: LevelPack | None = None, residency_cache: TileResidencyCache | None = None, tile_metadata: dict | None = None, blob_store: TileBlobStore | None = None, tile_map=None):
         self.loaded: bool = False
         self.index_x: int = index_x
         self.index_y: int = index_y
         self.tile_path: str = f"{level_path}t{index_x}_{index_y}"
         self.image_reference: str = f"{index_x}_{index_y}"
         self.collision_image_reference: str = f"c{self.image_reference}"
-        self.pretty_bytearray: bytearray = None
-        self.collision_bytearray: bytearray = None
-        self.file_reference: io.BufferedReader = open(self.tile_path, mode='rb')
+        self.pretty_bytearray: bytearray | memoryview = None
+        self.collision_bytearray: bytearray | memoryview = None
+        self.level_pack: LevelPack | None = level_pack
+        self.prefetched: bool = False
+        self.residency_cache: TileResidencyCache | None = residency_cache
+        tile_metadata = {} if tile_metadata is None else tile_metadata
+        # [red, green, blue, alpha, collision] when every pixel of the tile is the same
+        self.uniform: list[int, int, int, int, int] | None = tile_metadata.get(LevelManifest.UNIFORM)
+        # tiles with known hashes share textures with identical tiles; blob tiles are read from the shared blob store
+        self.shared_pretty_reference: str | None = None if tile_metadata.get(LevelManifest.PRETTY_HASH) is None else Tile.SHARED_PRETTY_REFERENCE.format(tile_metadata[LevelManifest.PRETTY_HASH])
+        self.shared_collision_reference: str | None = None if tile_metadata.get(LevelManifest.COLLISION_HASH) is None else Tile.SHARED_COLLISION_REFERENCE.format(tile_metadata[LevelManifest.COLLISION_HASH])
+        self.blob_hashes: tuple[str, str] | None = (tile_metadata[LevelManifest.PRETTY_HASH], tile_metadata[LevelManifest.COLLISION_HASH]) if tile_metadata.get(LevelManifest.BLOB) else None
+        self.blob_store: TileBlobStore | None = blob_store
+        # pretty maps are drawn from the tile map's texture array; uniform tiles are drawn with their color
+        self.tile_map = tile_map  # TileMap
+        if self.uniform is not None:
+            self.tile_map.set_uniform(index_x, index_y, self.uniform[:4])
     #
-    def load(self, Render, Screen, gl_context):
-        # reset reading from the file reference
-        self.file_reference.seek(0)
-        # get the pretty map
-        self.pretty_bytearray = self.file_reference.read(Tile.PRETTY_MAP_BYTES_PER_TILE)
-        # add the pretty map as a moderngl texture
-        Render.add_moderngl_texture_using_bytearray(Screen, gl_context, self.pretty_bytearray, Tile.PRETTY_MAP_BYTES_PER_PIXEL, Map.TILE_WH, Map.TILE_WH, self.image_reference)
-        # skip newline
-        self.file_reference.read(Tile.BYTES_PER_NEWLINE)
-        # separate the collision map byte array
-        self.collision_bytearray = self.file_reference.read(Tile.COLLISION_MAP_BYTES_PER_TILE)
+    def get_resident_bytes(self):
+        return 0 if self.uniform is not None else Tile.RESIDENT_BYTES
+    #
+    def read(self):
+        # safe to call from a worker thread; nothing here touches the gl context
+        if (self.blob_hashes is not None) and (self.blob_store is not None):
+            tile_bytes = self.blob_store.read_blob(*self.blob_hashes)
+        elif self.level_pack is not None:
+            # slice the tile out of the memory-mapped level pack
+            tile_bytes = self.level_pack.get_tile(self.index_x, self.index_y)
+        else:
+            with open(self.tile_path, mode='rb') as file_reference:
+                tile_bytes = file_reference.read()
+        # raw tiles are split into zero-copy slices; compressed tiles are decoded
+        return TileCodec.decode(tile_bytes)
+    #
+    def upload(self, Render, Screen, gl_context, pretty_bytearray, collision_bytearray):
+        self.pretty_bytearray = pretty_bytearray
+        self.collision_bytearray = collision_bytearray
+        # add the pretty map to the tile map
+        self.tile_map.add_tile(Render, gl_context, self.index_x, self.index_y, self.image_reference if self.shared_pretty_reference is None else self.shared_pretty_reference, self.pretty_bytearray)
         # add the collision map as a moderngl texture
-        Render.add_moderngl_texture_using_bytearray(Screen, gl_context, self.collision_bytearray, Tile.COLLISION_MAP_BYTES_PER_PIXEL, Map.TILE_WH, Map.TILE_WH, self.collision_image_reference)
+        if self.shared_collision_reference is not None:
+            Render.acquire_shared_moderngl_texture(Screen, gl_context, self.collision_bytearray, Tile.COLLISION_MAP_BYTES_PER_PIXEL, Map.TILE_WH, Map.TILE_WH, self.shared_collision_reference, self.collision_image_reference, owner=self)
+        else:
+            Render.add_moderngl_texture_using_bytearray(Screen, gl_context, self.collision_bytearray, Tile.COLLISION_MAP_BYTES_PER_PIXEL, Map.TILE_WH, Map.TILE_WH, self.collision_image_reference, owner=self)
         # report that the tile has been loaded
         self.loaded = True
+        if self.residency_cache is not None:
+            self.residency_cache.add(self)
+    #
+    def load(self, Render, Screen, gl_context):
+        if self.uniform is not None:
+            self._load_uniform(Render, Screen, gl_context)
+            return
+        self.upload(Render, Screen, gl_context, *self.read())
+    #
+    def _load_uniform(self, Render, Screen, gl_context):
+        # nothing is read from disk; the tile shares a collision map and collision texture with every uniform tile of the same collision
+        collision = self.uniform[LevelManifest.UNIFORM_COLLISION_INDEX]
+        uniform_collision_reference = Tile.UNIFORM_COLLISION_REFERENCE.format(collision)
+        if collision not in Tile._UNIFORM_COLLISION_BYTEARRAYS:
+            Tile._UNIFORM_COLLISION_BYTEARRAYS[collision] = bytes((collision,)) * Tile.COLLISION_MAP_BYTES_PER_TILE
+        if uniform_collision_reference not in Render.renderable_objects:
+            Render.add_moderngl_texture_using_bytearray(Screen, gl_context, Tile._UNIFORM_COLLISION_BYTEARRAYS[collision], Tile.COLLISION_MAP_BYTES_PER_PIXEL, Map.TILE_WH, Map.TILE_WH, uniform_collision_reference, subsystem=Tile.__name__)
+        self.pretty_bytearray = None
+        self.collision_bytearray = Tile._UNIFORM_COLLISION_BYTEARRAYS[collision]
+        Render.add_moderngl_texture_alias(self.collision_image_reference, uniform_collision_reference)
+        self.loaded = True
+        if self.residency_cache is not None:
+            self.residency_cache.add(self)
     #
     def unload(self, Render):
         if self.loaded:
             self.pretty_bytearray = None
             self.collision_bytearray = None
-            Render.remove_moderngl_texture_from_renderable_objects_dict(self.image_reference)
-            Render.remove_moderngl_texture_from_renderable_objects_dict(self.collision_image_reference)
-        self.loaded = False
-    #
-    def draw(self, Render, Screen, gl_context, ltwh, load):
-        if not self.loaded:
-            if load:
-                self.load(Render, Screen, gl_context)
-                load = False
+            if self.uniform is not None:
+                Render.remove_moderngl_texture_alias(self.collision_image_reference)
             else:
-                return False
+                self.tile_map.remove_tile(self.index_x, self.index_y, self.image_reference if self.shared_pretty_reference is None else self.shared_pretty_reference)
+                if self.shared_collision_reference is not None:
+                    Render.release_shared_moderngl_texture(self.shared_collision_reference, self.collision_image_reference)
+                else:
+                    Render.remove_moderngl_texture_from_renderable_objects_dict(self.collision_image_reference)
+        self.loaded = False
+        self.prefetched = False
+        if self.residency_cache is not None:
+            self.residency_cache.discard(self)
 
-        Render.basic_rect_ltwh_to_quad(Screen, gl_context, self.image_reference, ltwh)
-        return load
 
+class TilePrefetcher():
+    # worker threads read tiles ahead of the camera; the gl thread uploads them within a time budget each frame
+    WORKERS = 2
+    MAX_PENDING_TILES = 16
+    UPLOAD_TIME_BUDGET = 0.004  # s
+    LOOKAHEAD_TIME = 0.5  # s
+    MAX_LOOKAHEAD_TILES = 4
 
-class StoredDraws():
     def __init__(self):
-        # lower order is drawn first, higher order is drawn later
-        self.default_stored_draws = [[] for _ in range(10)]
-        self.stored_draws_references = deepcopy(self.default_stored_draws)
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=TilePrefetcher.WORKERS, thread_name_prefix='tile_prefetch')
+        # the queue can never fill up because no more than MAX_PENDING_TILES are requested at once
+        self.upload_queue: queue.Queue = queue.Queue(maxsize=TilePrefetcher.MAX_PENDING_TILES)
+        self.pending_tiles: set[Tile] = set()
+        # counters
+        self.hits: int = 0
+        self.misses: int = 0
+        self.tiles_uploaded: int = 0
+        self.tiles_discarded: int = 0
+        self.upload_milliseconds: float = 0.0
+        self.total_upload_milliseconds: float = 0.0
+    #
+    def get_prefetch_range(self, map_object, player_object):
+        # extend the loaded tiles in the direction the player is moving
+        lookahead_x = min(math.ceil(abs(player_object.velocity_x) * TilePrefetcher.LOOKAHEAD_TIME / Map.TILE_WH), TilePrefetcher.MAX_LOOKAHEAD_TILES)
+        lookahead_y = min(math.ceil(abs(player_object.velocity_y) * TilePrefetcher.LOOKAHEAD_TIME / Map.TILE_WH), TilePrefetcher.MAX_LOOKAHEAD_TILES)
+        prefetch_tiles_x = [map_object.tiles_loaded_x[0] - (lookahead_x if player_object.velocity_x < 0 else 0), map_object.tiles_loaded_x[1] + (lookahead_x if player_object.velocity_x > 0 else 0)]
+        prefetch_tiles_y = [map_object.tiles_loaded_y[0] - (lookahead_y if player_object.velocity_y < 0 else 0), map_object.tiles_loaded_y[1] + (lookahead_y if player_object.velocity_y > 0 else 0)]
+        prefetch_tiles_x[0] = move_number_to_desired_range(map_object.min_tile_x, prefetch_tiles_x[0], map_object.max_tile_x)
+        prefetch_tiles_x[1] = move_number_to_desired_range(map_object.min_tile_x, prefetch_tiles_x[1], map_object.max_tile_x)
+        prefetch_tiles_y[0] = move_number_to_desired_range(map_object.min_tile_y, prefetch_tiles_y[0], map_object.max_tile_y)
+        prefetch_tiles_y[1] = move_number_to_desired_range(map_object.min_tile_y, prefetch_tiles_y[1], map_object.max_tile_y)
+        return prefetch_tiles_x, prefetch_tiles_y
+    #
+    def request_tiles(self, map_object, prefetch_tiles_x: list[int, int], prefetch_tiles_y: list[int, int]):
+        # request the tiles closest to the screen first
+        center_x = (map_object.tiles_loaded_x[0] + map_object.tiles_loaded_x[1]) / 2
+        center_y = (map_object.tiles_loaded_y[0] + map_object.tiles_loaded_y[1]) / 2
+        wanted_tiles = [map_object.tiles[index_x][index_y] for index_x in range(prefetch_tiles_x[0], prefetch_tiles_x[1] + 1) for index_y in range(prefetch_tiles_y[0], prefetch_tiles_y[1] + 1)]
+        wanted_tiles.sort(key=lambda tile: abs(tile.index_x - center_x) + abs(tile.index_y - center_y))
+        for tile in wanted_tiles:
+            if len(self.pending_tiles) >= TilePrefetcher.MAX_PENDING_TILES:
+                return
+            if tile.loaded or (tile.uniform is not None) or (tile in self.pending_tiles):
+                continue
+            self.pending_tiles.add(tile)
+            self.executor.submit(self._read_tile, tile)
+    #
+    def _read_tile(self, tile):
+        # runs on a worker thread
+        try:
+            pretty_bytearray, collision_bytearray = tile.read()
+            # copy out of the memory map so the page faults happen here instead of on the gl thread
+            self.upload_queue.put((tile, bytes(pretty_bytearray), bytes(collision_bytearray)))
+        except (OSError, *TileCodec.DECODE_ERRORS) as error:
+            LOGGER.warning("could not read tile %d_%d: %s", tile.index_x, tile.index_y, error)
+            self.upload_queue.put((tile, None, None))
+        except Exception:
+            # nobody reads the future, so the tile must still leave pending tiles
+            LOGGER.exception("could not read tile %d_%d", tile.index_x, tile.index_y)
+            self.upload_queue.put((tile, None, None))
+    #
+    def upload_tiles(self, Render, Screen, gl_context, prefetch_tiles_x: list[int, int], prefetch_tiles_y: list[int, int]):
+        start_time = get_time()
+        self.upload_milliseconds = 0.0
+        while (get_time() - start_time) < TilePrefetcher.UPLOAD_TIME_BUDGET:
+            try:
+                tile, pretty_bytearray, collision_bytearray = self.upload_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_tiles.discard(tile)
+            # skip tiles that failed to read, were loaded on the gl thread, or are no longer wanted
+            if (pretty_bytearray is None) or tile.loaded or not ((prefetch_tiles_x[0] <= tile.index_x <= prefetch_tiles_x[1]) and (prefetch_tiles_y[0] <= tile.index_y <= prefetch_tiles_y[1])):
+                self.tiles_discarded += 1
+                continue
+            # prefetching is skipped while the collision map does not fit the texture budget; the tile is loaded when it comes on screen
+            if not Render.can_load_textures(Tile.COLLISION_MAP_BYTES_PER_TILE):
+                self.tiles_discarded += 1
+                continue
+            tile.upload(Render, Screen, gl_context, pretty_bytearray, collision_bytearray)
+            tile.prefetched = True
+            self.tiles_uploaded += 1
+        self.upload_milliseconds = (get_time() - start_time) * 1000
+        self.total_upload_milliseconds += self.upload_milliseconds
+    #
+    def record_tile_needed(self, tile):
+        # a hit is an on-screen tile that the prefetcher had ready; a miss must be loaded immediately
+        if tile.uniform is not None:
+            return
+        if not tile.loaded:
+            self.misses += 1
+        elif tile.prefetched:
+            self.hits += 1
+            tile.prefetched = False
+    #
+    def get_queue_depth(self):
+        return self.upload_queue.qsize()
+    #
+    def shutdown(self):
+        # tiles that have not started reading are dropped; reads in progress finish before this returns
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.pending_tiles.clear()
+    #
+    def get_hit_rate(self):
+        return self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 1.0
+    #
+    def get_counters(self):
+        return {'queue_depth': self.get_queue_depth(),
+                'pending_tiles': len(self.pending_tiles),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.get_hit_rate(),
+                'tiles_uploaded': self.tiles_uploaded,
+                'tiles_discarded': self.tiles_discarded,
+                'upload_milliseconds': self.upload_milliseconds,
+                'total_upload_milliseconds': self.total_upload_milliseconds}
+
+
+class BallCollisionMask():
+    # the pixels of a ball collision mask as numpy arrays
+    # collision_data is {(offset_x, offset_y): (angle from center, cos, sin)} like Player's collision data
+    def __init__(self, collision_data: dict[tuple[int, int], tuple[float, float, float]]):
+        offsets = np.array(list(collision_data.keys()), dtype=np.int64).reshape(-1, 2)
+        self.min_x: int = int(offsets[:, 0].min())
+        self.min_y: int = int(offsets[:, 1].min())
+        if (int(offsets[:, 0].max()) - self.min_x >= Map.TILE_WH) or (int(offsets[:, 1].max()) - self.min_y >= Map.TILE_WH):
+            raise ValueError(f"ball collision masks must be smaller than a tile ({Map.TILE_WH} pixels)")
+        # index of each pixel in a collision window when the top left of the mask is at the window's top left
+        self.window_indexes: np.ndarray = ((offsets[:, 1] - self.min_y) * BallCollisionSampler.WINDOW_WH) + (offsets[:, 0] - self.min_x)
+        self.cos_sin: np.ndarray = np.array([(cos_angle, sin_angle) for _, cos_angle, sin_angle in collision_data.values()], dtype=np.float64).reshape(-1, 2)
+        # collisions recorded from objects; reset every frame
+        self.recorded: np.ndarray = np.zeros(len(offsets), dtype=bool)
+    #
+    def reset_recorded(self):
+        self.recorded.fill(False)
 
-    def add_draw(self, reference: str, order: int):
-        self.stored_draws_references[order].append(reference)
 
-    def draw(self, Render, Screen, gl_context):
-        for current_level in self.stored_draws_references:
-            for reference in current_level:
-                Render.execute_stored_draw(Screen, gl_context, reference)
-        self.stored_draws_references = deepcopy(self.default_stored_draws)
+class BallCollisionSampler():
+    # reads the collision map under a ball mask in one numpy gather instead of pixel by pixel
+    # the collision maps of the 2x2 tiles around the ball are copied into one window; the window is only copied again
+    # when the ball moves onto other tiles or one of the tiles gets a different collision map
+    # tiles outside the map or without a collision map have no collision
+    WINDOW_TILES = 2
+    WINDOW_WH = WINDOW_TILES * Map.TILE_WH
+    # collision value: whether the ball collides with it
+    _SOLID = np.zeros(256, dtype=bool)
+    _SOLID[[Map.COLLISION, Map.GRAPPLEABLE]] = True
+
+    def __init__(self):
+        self.window: np.ndarray = np.zeros((BallCollisionSampler.WINDOW_WH, BallCollisionSampler.WINDOW_WH), dtype=np.uint8)
+        self.flat_window: np.ndarray = self.window.reshape(-1)
+        self.window_tile_xy: tuple[int, int] | None = None
+        # collision maps copied into the window; (column, row) order
+        self.window_sources: list = [None] * (BallCollisionSampler.WINDOW_TILES ** 2)
+        # statistics
+        self.samples: int = 0
+        self.window_copies: int = 0
+    #
+    def invalidate(self):
+        # call after a collision map is changed in place
+        self.window_tile_xy = None
+    #
+    def _update_window(self, map_object, tile_x: int, tile_y: int):
+        sources = []
+        for column in range(tile_x, tile_x + BallCollisionSampler.WINDOW_TILES):
+            for row in range(tile_y, tile_y + BallCollisionSampler.WINDOW_TILES):
+                in_map = (0 <= column < len(map_object.tiles)) and (0 <= row < len(map_object.tiles[column]))
+                sources.append(map_object.tiles[column][row].collision_bytearray if in_map else None)
+        if (self.window_tile_xy == (tile_x, tile_y)) and all(source is window_source for source, window_source in zip(sources, self.window_sources)):
+            return
+        for source_index, source in enumerate(sources):
+            column, row = divmod(source_index, BallCollisionSampler.WINDOW_TILES)
+            block = self.window[row * Map.TILE_WH:(row + 1) * Map.TILE_WH, column * Map.TILE_WH:(column + 1) * Map.TILE_WH]
+            if source is None:
+                block.fill(0)
+            else:
+                block[:] = np.frombuffer(source, dtype=np.uint8).reshape(Map.TILE_WH, Map.TILE_WH)
+        self.window_tile_xy = (tile_x, tile_y)
+        self.window_sources = sources
+        self.window_copies += 1
+    #
+    def sample(self, map_object, x_pos: int, y_pos: int, mask: BallCollisionMask):
+        # returns (collision of each mask pixel, number of collisions, summed cos, summed sin) with the ball's top left at (x_pos, y_pos)
+        left, top = x_pos + mask.min_x, y_pos + mask.min_y
+        tile_x, tile_y = left // Map.TILE_WH, top // Map.TILE_WH
+        self._update_window(map_object, tile_x, tile_y)
+        window_offset = ((top - (tile_y * Map.TILE_WH)) * BallCollisionSampler.WINDOW_WH) + (left - (tile_x * Map.TILE_WH))
+        collisions = BallCollisionSampler._SOLID[self.flat_window.take(mask.window_indexes + window_offset)] | mask.recorded
+        cumulative_x, cumulative_y = np.dot(collisions, mask.cos_sin)
+        self.samples += 1
+        return collisions, int(np.count_nonzero(collisions)), float(cumulative_x), float(cumulative_y)
 
 
 def rectangles_overlap(ltwh1, ltwh2):
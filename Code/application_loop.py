@@ -2,15 +2,21 @@ import pygame
 import sys
 from Code.utilities import move_number_to_desired_range
 from Code.drawing_functions import ScreenObject, RenderObjects
-from Code.application_setup import CursorClass, TimingClass, KeysClass, ApiObject
+from Code.application_setup import CursorClass, TimingClass, KeysClass, ApiObject, StartupTimer
 import moderngl
 
 
+GPU_PROFILE_LT = [10, 10]
+
+
 def update_events(Api: ApiObject, Screen: ScreenObject):
     Api.scroll_x, Api.scroll_y = 0, 0
     Screen.window_resize = False
     for event in pygame.event.get():
+        # any event may change what should be on screen
+        Api.idle_frames.damage()
         if event.type == pygame.QUIT:
+            Api.quit()
             pygame.quit()
             sys.exit()
         #
@@ -29,31 +35,62 @@ def update_events(Api: ApiObject, Screen: ScreenObject):
                 Api.scroll_x, Api.scroll_y = event.x, event.y
 
 
-def application_loop(Api: ApiObject, PATH: str, Screen: ScreenObject, gl_context: moderngl.Context, Render: RenderObjects, Time: TimingClass, Keys: KeysClass, Cursor: CursorClass):
+def application_loop(Api: ApiObject, PATH: str, Screen: ScreenObject, gl_context: moderngl.Context, Render: RenderObjects, Time: TimingClass, Keys: KeysClass, Cursor: CursorClass, Startup: StartupTimer | None = None):
     while True:
         #
         # update events
         update_events(Api, Screen)
         #
-        # update keys
-        Keys.update_controls(Api)
+        # update, draw and present one frame
+        application_frame(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
         #
-        # operate current API (e.g. Editor, Game, Menu)
-        #Api.api_options[Api.current_api](Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
-        Api.run_api(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+        # report how long startup took once the first frame is shown
+        if (Startup is not None) and (not Startup.reported):
+            Startup.mark('first frame')
+            Startup.report(Render)
         #
-        # update cursor
-        Cursor.update_cursor(Screen, gl_context, Render, Keys)
+        # update timing
+        Time.update()
 
 
-        #Time.display_fps(Screen, Render, gl_context, [220, 100])
+def application_frame(Api: ApiObject, PATH: str, Screen: ScreenObject, gl_context: moderngl.Context, Render: RenderObjects, Time: TimingClass, Keys: KeysClass, Cursor: CursorClass):
+    #
+    # update keys
+    Keys.update_controls(Api)
+    #
+    # debug keys
+    if Keys.debug_timing_overlay.newly_pressed:
+        Render.gpu_profiler.toggle()
+    if Keys.debug_strict_sync.newly_pressed:
+        Render.frame_pacer.toggle_strict_sync()
+    #
+    # leave the previous frame on screen when nothing could have changed it
+    if Keys.input_changed:
+        Api.idle_frames.damage()
+    if Api.idle_frames.skip_frame(Api):
+        Api.idle_frames.wait()
+        return
+    #
+    # operate current API (e.g. Editor, Game, Menu)
+    #Api.api_options[Api.current_api](Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    Api.run_api(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+    #
+    # update cursor
+    Render.begin_pass('cursor')
+    Cursor.update_cursor(Screen, gl_context, Render, Keys)
+    Render.end_pass()
+    #
+    # gpu time of each pass and frame pacing
+    if Render.gpu_profiler.enabled:
+        Render.draw_gpu_profile(Screen, gl_context, GPU_PROFILE_LT)
 
 
-        #
-        # update screen
-        gl_context.finish()
-        Screen.update()
-        Render.clear_buffer(gl_context)
-        #
-        # update timing
-        Time.update()
\ No newline at end of file
+    #Time.display_fps(Screen, Render, gl_context, [220, 100])
+
+
+    #
+    # update screen
+    Render.flush_batch()
+    Render.frame_pacer.present(Screen)
+    Render.clear_buffer(gl_context)
+    Render.end_frame()
\ No newline at end of file
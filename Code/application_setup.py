@@ -1,7 +1,7 @@
 import pygame
 import pyperclip
 from copy import deepcopy
-from Code.utilities import move_number_to_desired_range, get_time
+from Code.utilities import move_number_to_desired_range, get_time, get_level_path, DEFAULT_LEVEL
 from Code.Editor.editor_loop import editor_loop, EditorSingleton
 from Code.Game.game_loop import game_loop, GameSingleton
 from typing import Callable, Iterable
@@ -43,7 +43,13 @@ class ApiObject():
         self.api_initiated_singletons = {ApiObject.EDITOR: 0,
                                          ApiObject.GAME: 0, 
                                          ApiObject.MENU: 0,}
+        self.idle_frames = IdleFrames()
+        # level opened by the editor and the game
+        self.level: str = DEFAULT_LEVEL
     
+    def get_level_path(self):
+        return get_level_path(self.level)
+
     def initiate_api_switch(self, new_api: str):
         self.setup_required = True
         self.stored_api = new_api
@@ -54,6 +60,86 @@ class ApiObject():
             self.stored_api = None
         self.api_options[self.current_api](*args)
 
+    def quit(self):
+        # let singletons that have started finish their work before the application closes
+        for api_singleton in self.api_initiated_singletons.values():
+            if hasattr(api_singleton, 'quit'):
+                api_singleton.quit()
+        self.idle_frames.report()
+
+
+class IdleFrames():
+    # frames where nothing could change what is on screen are skipped; the previous frame stays on screen
+    # instead of drawing, the application waits for the next event so the cpu and gpu can sleep
+    # anything that changes the screen on its own (events, input, tiles still loading, blinking text) damages the frame
+    # only the editor idles; the game is always moving
+    FRAMES_BEFORE_IDLE = 2  # undamaged frames that are still drawn, for changes that show up a frame after the input that caused them
+    MAX_WAIT = 250  # ms; longest an idle frame waits for an event
+
+    def __init__(self, enabled: bool = True):
+        self.enabled: bool = enabled
+        self.damaged: bool = True
+        self.undamaged_frames: int = 0
+        # statistics
+        self.frames: int = 0
+        self.skipped_frames: int = 0
+    #
+    def damage(self):
+        self.damaged = True
+    #
+    def skip_frame(self, Api: ApiObject):
+        # called once per frame after input is read
+        self.frames += 1
+        if (not self.enabled) or (Api.current_api != ApiObject.EDITOR) or Api.setup_required or (Api.stored_api is not None):
+            self.damaged = True
+        if self.damaged:
+            self.damaged = False
+            self.undamaged_frames = 0
+            return False
+        self.undamaged_frames += 1
+        if self.undamaged_frames <= IdleFrames.FRAMES_BEFORE_IDLE:
+            return False
+        self.skipped_frames += 1
+        return True
+    #
+    @staticmethod
+    def wait():
+        # the event is put back so it is handled with the rest of the next frame's events
+        event = pygame.event.wait(IdleFrames.MAX_WAIT)
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
+    #
+    def get_skipped_fraction(self):
+        return (self.skipped_frames / self.frames) if self.frames > 0 else 0.0
+    #
+    def report(self):
+        if self.enabled:
+            print(f"{'frames skipped while idle:':<28}{self.skipped_frames} of {self.frames} ({self.get_skipped_fraction() * 100:.1f}%)")
+
+
+class StartupTimer():
+    # time spent in each step of starting the application, up to the end of the first frame
+    def __init__(self):
+        self.start_time: float = get_time()
+        self.last_step_time: float = self.start_time
+        self.step_milliseconds: dict[str, float] = {}  # 'step': time spent in the step
+        self.reported: bool = False
+    #
+    def mark(self, step: str):
+        current_time = get_time()
+        self.step_milliseconds[step] = (current_time - self.last_step_time) * 1000
+        self.last_step_time = current_time
+    #
+    def get_total_milliseconds(self):
+        return (self.last_step_time - self.start_time) * 1000
+    #
+    def report(self, Render):
+        self.reported = True
+        for step, milliseconds in self.step_milliseconds.items():
+            print(f"{step + ':':<28}{milliseconds:.1f} ms")
+        print(f"{'programs compiled:':<28}{len(Render.programs.compile_milliseconds)} of {len(Render.programs.program_classes)} ({Render.programs.get_total_compile_milliseconds():.1f} ms)")
+        print(f"{'startup total:':<28}{self.get_total_milliseconds():.1f} ms")
+
 
 class TimingClass():
     _TEXT_PIXEL_SIZE = 4
@@ -161,12 +247,15 @@ class IOKey():
         self.last_pressed = False
         self.newly_pressed = False
         self.released = False
+        self.changed = False
     #
     def update(self, new_value):
         self.last_pressed = self.pressed
         self.pressed = new_value
         self.newly_pressed = self.pressed and not self.last_pressed
         self.released = not self.pressed and self.last_pressed
+        # held keys count as changes since holding a key keeps doing something
+        self.changed = self.pressed or self.released
 
 
 class AnalogKey():
@@ -175,11 +264,13 @@ class AnalogKey():
         self.value = -1
         self.last_value = -1
         self.delta = -1
+        self.changed = False
     #
     def update(self, new_value):
         self.last_value = self.value
         self.value = new_value
         self.delta = self.value - self.last_value
+        self.changed = self.delta != 0
 
 
 class KeysClass():
@@ -190,6 +281,7 @@ class KeysClass():
         self.left_click, self.middle_click, self.right_click = -1, -1, -1
         self.mouse_x_pos, self.mouse_y_pos = -1, -1
         self.scroll_x, self.scroll_y = 0, 0
+        self.input_changed = True  # whether any input changed or is held this frame
         #
         self.update_io_and_analog: Callable
         self.get_update_function()
@@ -315,6 +407,9 @@ class KeysClass():
         self.select = IOKey(mapping=self.IO_MAPPING['RETURN'])
         self.interact = IOKey(mapping=self.IO_MAPPING['E'])
         self.pause = IOKey(mapping=self.IO_MAPPING['ESCAPE'])
+        # debug
+        self.debug_timing_overlay = IOKey(mapping=self.IO_MAPPING['F3'])
+        self.debug_strict_sync = IOKey(mapping=self.IO_MAPPING['F4'])
         #
         self.controls = [
             # common
@@ -323,6 +418,8 @@ class KeysClass():
             self.editor_primary, self.editor_secondary, self.editor_hand, self.editor_up, self.editor_left, self.editor_down, self.editor_right, self.editor_shift, self.editor_control, self.editor_tab, self.editor_scroll_x, self.editor_scroll_y,
             # main game
             self.primary, self.secondary, self.release_grapple, self.float_up, self.left, self.sink_down, self.right, self.select, self.interact, self.pause,
+            # debug
+            self.debug_timing_overlay, self.debug_strict_sync,
         ]
     #
     def copy_text(self, text: str):
@@ -346,9 +443,15 @@ class KeysClass():
         self.mouse_x_pos, self.mouse_y_pos = pygame.mouse.get_pos()
         self.scroll_x, self.scroll_y = Api.scroll_x, Api.scroll_y
     #
+    def any_key_pressed(self):
+        return any(self.keys)
+    #
     def apply_updates_to_controls(self):
+        input_changed = (self.scroll_x != 0) or (self.scroll_y != 0) or self.any_key_pressed()
         for control in self.controls:
             control.update(control.mapping())
+            input_changed = input_changed or control.changed
+        self.input_changed = input_changed
     #
     def keyboard_key_to_character(self):
         if self.keys[pygame.K_LCTRL] or self.keys[pygame.K_RCTRL]:
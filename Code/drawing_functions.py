@@ -1,49 +1,497 @@
 from array import array
 import math
-from Code.utilities import atan2, get_text_height, get_text_width, rgba_to_bgra, angle_in_range, difference_between_angles, get_time
+from Code.utilities import atan2, get_text_height, rgba_to_bgra, angle_in_range, difference_between_angles, get_time
 import pygame
 import moderngl
 import numpy as np
 from typing import Callable, Iterable
 from Code.Editor.editor_utilities import LineTool, get_perfect_circle_edge_angles_for_drawing_lines, get_perfect_square_edge_angles_for_drawing_lines
 from Code.Game.game_utilities import Map
-from Code.utilities import COLORS
+from Code.utilities import COLORS, TEXT_CHARACTERS
 from Code.Game.game_objects import Player
 import struct
+import weakref
+import logging
+from collections import deque
+from Code.render_queue import RenderQueue
 
 
-def initialize_display():
-    Screen = ScreenObject()
+LOGGER = logging.getLogger(__name__)
+
+
+def initialize_display(headless: bool = False, width: int = 1000, height: int = 700):
+    # headless draws into an offscreen framebuffer instead of a window; SDL_VIDEODRIVER should be 'dummy' before pygame starts
+    Screen = ScreenObject(headless, width, height)
     #
-    gl_context = moderngl.create_context()
+    gl_context = create_headless_context() if headless else moderngl.create_context()
+    if headless:
+        Screen.framebuffer = gl_context.simple_framebuffer((Screen.width, Screen.height))
+        Screen.framebuffer.use()
     gl_context.enable(moderngl.BLEND)
     Render = RenderObjects(gl_context)
     #
     return Screen, Render, gl_context
 
 
+def create_headless_context():
+    # egl works without any display server; other platforms fall back to moderngl's default standalone context
+    try:
+        return moderngl.create_context(standalone=True, backend='egl', require=460)
+    except Exception:
+        return moderngl.create_context(standalone=True, require=460)
+
+
 class ScreenObject():
-    def __init__(self):
+    def __init__(self, headless: bool = False, width: int = 1000, height: int = 700):
         self.window_resize: bool = False
         self.ACCEPTABLE_WIDTH_RANGE = [1000, 10000]
         self.ACCEPTABLE_HEIGHT_RANGE = [650, 10000]
-        self.width = 1000
-        self.height = 700
+        self.width = width
+        self.height = height
         self.aspect = self.width / self.height
-        self.screen = pygame.display.set_mode((self.width, self.height), flags=(pygame.OPENGL | pygame.DOUBLEBUF | pygame.RESIZABLE), vsync=True)
+        self.headless: bool = headless
+        if headless:
+            # pygame still needs a (hidden) display to convert images
+            self.screen = pygame.display.set_mode((self.width, self.height))
+        else:
+            self.screen = pygame.display.set_mode((self.width, self.height), flags=(pygame.OPENGL | pygame.DOUBLEBUF | pygame.RESIZABLE), vsync=True)
         #self.screen = pygame.display.set_mode((self.width, self.height), flags=(pygame.OPENGL), vsync=True)
         self.display = pygame.Surface((self.width, self.height))
+        # headless only; the framebuffer drawn into and where to save the next frame as a png
+        self.framebuffer = None
+        self.capture_path: str | None = None
     #
     def update_aspect(self):
         self.aspect = self.width / self.height
     #
+    def use_framebuffer(self, gl_context: moderngl.Context):
+        # draw into the window again (or the offscreen framebuffer when headless)
+        (gl_context.screen if self.framebuffer is None else self.framebuffer).use()
+    #
     def update(self):
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+            return
+        if self.capture_path is not None:
+            # framebuffer rows are stored bottom to top
+            pygame.image.save(pygame.image.frombytes(self.framebuffer.read(components=4), (self.width, self.height), 'RGBA', True), self.capture_path)
+            self.capture_path = None
+
+
+class FramePacer():
+    # presents frames without waiting for the gpu to finish each one, so the cpu works on the next frame while the gpu draws the last
+    # the end of every frame is marked with a query; before presenting, the cpu waits on the mark from FRAMES_IN_FLIGHT frames ago
+    # strict sync waits for the gpu to finish every frame before presenting; kept for debugging
+    FRAMES_IN_FLIGHT = 2
+    STRICT_SYNC = False
+    JITTER_SAMPLES = 120
+
+    def __init__(self, gl_context: moderngl.Context, frames_in_flight: int = FRAMES_IN_FLIGHT, strict_sync: bool = STRICT_SYNC):
+        self.gl_context: moderngl.Context = gl_context
+        self.frames_in_flight: int = frames_in_flight
+        self.strict_sync: bool = strict_sync
+        # moderngl has no fences; a query is only answered once the gpu has run every command before it, so it marks the end of a frame
+        self.frame_end_queries: list = [gl_context.query(samples=True) for _ in range(frames_in_flight + 1)]
+        self.frame: int = 0
+        # present-to-present intervals in seconds
+        self.last_present_time: float | None = None
+        self.present_intervals: deque = deque(maxlen=FramePacer.JITTER_SAMPLES)
+        # statistics
+        self.wait_milliseconds: float = 0.0
+    #
+    def toggle_strict_sync(self):
+        self.strict_sync = not self.strict_sync
+    #
+    def present(self, Screen: ScreenObject):
+        wait_start = get_time()
+        if self.strict_sync:
+            self.gl_context.finish()
+        else:
+            with self.frame_end_queries[self.frame % len(self.frame_end_queries)]:
+                pass
+            if self.frame >= self.frames_in_flight:
+                # reading the result waits until the gpu has finished that frame
+                self.frame_end_queries[(self.frame - self.frames_in_flight) % len(self.frame_end_queries)].samples
+        self.wait_milliseconds = (get_time() - wait_start) * 1000
+        Screen.update()
+        present_time = get_time()
+        if self.last_present_time is not None:
+            self.present_intervals.append(present_time - self.last_present_time)
+        self.last_present_time = present_time
+        self.frame += 1
+    #
+    def get_jitter_milliseconds(self):
+        # standard deviation of the time between presents
+        if len(self.present_intervals) < 2:
+            return 0.0
+        mean_interval = sum(self.present_intervals) / len(self.present_intervals)
+        return math.sqrt(sum((interval - mean_interval) ** 2 for interval in self.present_intervals) / len(self.present_intervals)) * 1000
+    #
+    def get_statistics(self):
+        return {'strict_sync': self.strict_sync,
+                'frames_in_flight': 0 if self.strict_sync else self.frames_in_flight,
+                'wait_milliseconds': self.wait_milliseconds,
+                'mean_present_interval_milliseconds': (sum(self.present_intervals) / len(self.present_intervals)) * 1000 if self.present_intervals else 0.0,
+                'worst_present_interval_milliseconds': max(self.present_intervals) * 1000 if self.present_intervals else 0.0,
+                'jitter_milliseconds': self.get_jitter_milliseconds()}
+
+
+class GpuProfiler():
+    # gpu time of each render pass, measured with timer queries
+    # timer queries cannot overlap, so a pass that starts inside another pass pauses it; every pass is timed without the passes inside it
+    # results are read FRAME_LATENCY frames later; FramePacer has already waited for those frames, so reading them never stalls
+    ENABLED = False
+    FRAME_LATENCY = FramePacer.FRAMES_IN_FLIGHT + 1
+
+    def __init__(self, gl_context: moderngl.Context, enabled: bool = ENABLED):
+        self.gl_context: moderngl.Context = gl_context
+        self.enabled: bool = enabled
+        self.free_queries: list = []
+        self.running_query = None
+        self.pass_stack: list[str] = []
+        # (pass_name, query) for every query made this frame
+        self.frame_queries: list[tuple[str, object]] = []
+        # frame_queries of frames that may still be on the gpu, oldest first
+        self.frames_in_flight: deque = deque()
+        # 'pass_name': gpu milliseconds of the newest frame that has been read
+        self.pass_milliseconds: dict[str, float] = {}
+        self.queries_created: int = 0
+    #
+    def toggle(self):
+        self.enabled = not self.enabled
+    #
+    def _start_query(self, pass_name: str):
+        query = self.free_queries.pop() if self.free_queries else self._create_query()
+        query.__enter__()
+        self.running_query = query
+        self.frame_queries.append((pass_name, query))
+    #
+    def _create_query(self):
+        self.queries_created += 1
+        return self.gl_context.query(time=True)
+    #
+    def _stop_query(self):
+        if self.running_query is not None:
+            self.running_query.__exit__(None, None, None)
+            self.running_query = None
+    #
+    def begin(self, pass_name: str):
+        if not self.enabled:
+            return
+        self._stop_query()
+        self.pass_stack.append(pass_name)
+        self._start_query(pass_name)
+    #
+    def end(self):
+        if not self.pass_stack:
+            return
+        self._stop_query()
+        self.pass_stack.pop()
+        # resume the pass this one was inside of
+        if self.pass_stack:
+            self._start_query(self.pass_stack[-1])
+    #
+    def end_frame(self):
+        self.frames_in_flight.append(self.frame_queries)
+        self.frame_queries = []
+        if len(self.frames_in_flight) <= GpuProfiler.FRAME_LATENCY:
+            return
+        pass_milliseconds = {}
+        for pass_name, query in self.frames_in_flight.popleft():
+            pass_milliseconds[pass_name] = pass_milliseconds.get(pass_name, 0.0) + (query.elapsed / 1000000)
+            self.free_queries.append(query)
+        if pass_milliseconds:
+            self.pass_milliseconds = pass_milliseconds
+    #
+    def get_pass_milliseconds(self):
+        return self.pass_milliseconds
+    #
+    def get_total_milliseconds(self):
+        return sum(self.pass_milliseconds.values())
+
+
+class TexturePool():
+    # textures of the sizes tiles use are borrowed and given back instead of being created and released every time a tile loads and unloads
+    # free textures are still gpu memory; they are registered as 'texture_pool_{glo}' until they are borrowed
+    # (width, height, components): textures made when the pool is created
+    PREALLOCATED = {(256, 256, 4): 32,
+                    (256, 256, 1): 32}
+    FREE_TEXTURE_NAME = 'texture_pool_{}'
+    SUBSYSTEM = 'texture_pool'
+
+    def __init__(self, gl_context: moderngl.Context, texture_registry: 'TextureRegistry', preallocated: dict[tuple[int, int, int], int] = PREALLOCATED):
+        self.gl_context: moderngl.Context = gl_context
+        self.texture_registry: TextureRegistry = texture_registry
+        self.free_textures: dict[tuple[int, int, int], list] = {}  # (width, height, components): textures not being used
+        # statistics
+        self.textures_created: int = 0
+        self.textures_borrowed: int = 0
+        self.textures_given_back: int = 0
+        self.textures_released: int = 0
+        for key, texture_count in preallocated.items():
+            self.free_textures[key] = []
+            for _ in range(texture_count):
+                self._add_free_texture(self._create_texture(*key))
+    #
+    def is_pooled(self, width: int, height: int, components: int):
+        return (width, height, components) in self.free_textures
+    #
+    def has_free_texture(self, width: int, height: int, components: int):
+        return bool(self.free_textures[(width, height, components)])
+    #
+    def _add_free_texture(self, texture):
+        self.free_textures[(texture.width, texture.height, texture.components)].append(texture)
+        self.texture_registry.register(TexturePool.FREE_TEXTURE_NAME.format(texture.glo), texture, subsystem=TexturePool.SUBSYSTEM)
+    #
+    def _create_texture(self, width: int, height: int, components: int):
+        texture = self.gl_context.texture((width, height), components)
+        texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        texture.swizzle = 'RGBA'
+        self.textures_created += 1
+        return texture
+    #
+    def borrow(self, width: int, height: int, components: int):
+        # a new texture is only made when every pooled texture of the size is in use
+        free_textures = self.free_textures[(width, height, components)]
+        self.textures_borrowed += 1
+        if not free_textures:
+            return self._create_texture(width, height, components)
+        texture = free_textures.pop()
+        self.texture_registry.unregister(TexturePool.FREE_TEXTURE_NAME.format(texture.glo))
+        return texture
+    #
+    def give_back(self, texture):
+        self._add_free_texture(texture)
+        self.textures_given_back += 1
+    #
+    def evict_bytes(self, render_instance, evict_bytes: int):
+        # free textures are released to keep within the texture budget; the pool makes new ones when it runs out
+        evicted_bytes = 0
+        for free_textures in self.free_textures.values():
+            while free_textures and (evicted_bytes < evict_bytes):
+                texture = free_textures.pop()
+                self.texture_registry.unregister(TexturePool.FREE_TEXTURE_NAME.format(texture.glo))
+                evicted_bytes += TextureRegistry.get_texture_bytes(texture)
+                texture.release()
+                self.textures_released += 1
+        return evicted_bytes
+    #
+    def get_statistics(self):
+        return {'textures_created': self.textures_created,
+                'textures_borrowed': self.textures_borrowed,
+                'textures_given_back': self.textures_given_back,
+                'textures_released': self.textures_released,
+                'textures_in_use': self.textures_borrowed - self.textures_given_back,
+                'free_textures': sum(len(free_textures) for free_textures in self.free_textures.values())}
+
+
+class TextureRegistry():
+    # every texture RenderObjects makes is recorded with the subsystem that made it, its size in bytes and when it was made
+    # the subsystem is the class name of the texture's owner; textures without an owner are counted as images
+    # a texture has outlived its owner when the owner was garbage collected or unloaded (loaded is False) without removing it
+    # with a budget, RenderObjects makes room before a texture is made (see RenderObjects.make_room_for_texture)
+    DEFAULT_SUBSYSTEM = 'images'
+    # texture name: [subsystem, bytes, time registered, weak reference to the owner or None]
+    _SUBSYSTEM = 0
+    _BYTES = 1
+    _TIME = 2
+    _OWNER = 3
+
+    def __init__(self, budget_bytes: int | None = None):
+        self.budget_bytes: int | None = budget_bytes
+        self.textures: dict[str, list] = {}
+        self.live_bytes: int = 0
+        self.peak_bytes: int = 0
+        # asked to free textures when a new one would go over the budget (e.g. TileResidencyCache); dropped when garbage collected
+        self.evictors: weakref.WeakSet = weakref.WeakSet()
+        # statistics
+        self.skipped_loads: int = 0
+        self.over_budget_textures: int = 0
+    #
+    @staticmethod
+    def get_texture_bytes(texture):
+        # dtype is 'f1', 'u2', 'f4', ...; texture arrays have layers
+        return texture.width * texture.height * getattr(texture, 'layers', 1) * texture.components * int(texture.dtype[1:])
+    #
+    def register(self, name: str, texture, owner=None, subsystem: str | None = None):
+        # a texture registered again under the same name replaces the old record
+        self.unregister(name)
+        texture_bytes = TextureRegistry.get_texture_bytes(texture)
+        if subsystem is None:
+            subsystem = TextureRegistry.DEFAULT_SUBSYSTEM if owner is None else type(owner).__name__
+        self.textures[name] = [subsystem, texture_bytes, get_time(), None if owner is None else weakref.ref(owner)]
+        self.live_bytes += texture_bytes
+        self.peak_bytes = max(self.peak_bytes, self.live_bytes)
+    #
+    def unregister(self, name: str):
+        record = self.textures.pop(name, None)
+        if record is not None:
+            self.live_bytes -= record[TextureRegistry._BYTES]
+    #
+    def add_evictor(self, evictor):
+        self.evictors.add(evictor)
+    #
+    def remove_evictor(self, evictor):
+        self.evictors.discard(evictor)
+    #
+    def get_bytes_over_budget(self, texture_bytes: int = 0):
+        # how many bytes must be freed before texture_bytes more fit
+        if self.budget_bytes is None:
+            return 0
+        return max(0, self.live_bytes + texture_bytes - self.budget_bytes)
+    #
+    def get_bytes_per_subsystem(self):
+        bytes_per_subsystem = {}
+        for record in self.textures.values():
+            bytes_per_subsystem[record[TextureRegistry._SUBSYSTEM]] = bytes_per_subsystem.get(record[TextureRegistry._SUBSYSTEM], 0) + record[TextureRegistry._BYTES]
+        return bytes_per_subsystem
+    #
+    def get_orphaned_textures(self):
+        # 'texture_name': seconds since it was registered; textures whose owner no longer exists or has been unloaded
+        current_time = get_time()
+        orphaned_textures = {}
+        for name, record in self.textures.items():
+            if record[TextureRegistry._OWNER] is None:
+                continue
+            owner = record[TextureRegistry._OWNER]()
+            if (owner is None) or (getattr(owner, 'loaded', True) is False):
+                orphaned_textures[name] = current_time - record[TextureRegistry._TIME]
+        return orphaned_textures
+    #
+    def get_oldest_texture_seconds(self):
+        return (get_time() - min(record[TextureRegistry._TIME] for record in self.textures.values())) if self.textures else 0.0
+    #
+    def get_statistics(self):
+        return {'textures': len(self.textures),
+                'live_bytes': self.live_bytes,
+                'peak_bytes': self.peak_bytes,
+                'budget_bytes': self.budget_bytes,
+                'skipped_loads': self.skipped_loads,
+                'over_budget_textures': self.over_budget_textures,
+                'bytes_per_subsystem': self.get_bytes_per_subsystem(),
+                'oldest_texture_seconds': self.get_oldest_texture_seconds(),
+                'orphaned_textures': self.get_orphaned_textures()}
+    #
+    def report(self):
+        print(f"gpu textures: {len(self.textures)}, {self.live_bytes / 1048576:.1f} MB live, {self.peak_bytes / 1048576:.1f} MB peak")
+        if self.budget_bytes is not None:
+            print(f"    budget {self.budget_bytes / 1048576:.1f} MB: {self.skipped_loads} loads skipped, {self.over_budget_textures} textures made over budget")
+        for subsystem, texture_bytes in sorted(self.get_bytes_per_subsystem().items(), key=lambda subsystem_bytes: -subsystem_bytes[1]):
+            print(f"    {subsystem}: {texture_bytes / 1048576:.1f} MB")
+        for name, seconds in self.get_orphaned_textures().items():
+            print(f"    '{name}' outlived its owner or its owner's unload ({seconds:.1f} s old)")
+
+
+class TileMap():
+    # a map of tiles drawn in one full screen pass, whatever the size of the window
+    # resident tiles are layers (slots) of one texture array; a tile index texture with one texel per map tile says which slot each tile uses
+    # tiles with identical maps share a slot
+    INITIAL_SLOTS = 64
+    NO_TILE = 0  # not loaded; nothing is drawn
+    UNIFORM_TILE = 0xFFFF  # drawn with the tile's color from the uniform color texture
+    # otherwise a tile index is its slot + 1
+
+    TILE_TEXTURES_NAME = 'tile_map_tiles'
+    TILE_INDEX_TEXTURE_NAME = 'tile_map_indexes'
+    UNIFORM_COLOR_TEXTURE_NAME = 'tile_map_uniform_colors'
+
+    def __init__(self, gl_context: moderngl.Context, tiles_across: int, tiles_high: int, tile_wh: int, texture_registry: TextureRegistry):
+        self.texture_registry: TextureRegistry = texture_registry
+        self.tiles_across: int = tiles_across
+        self.tiles_high: int = tiles_high
+        self.tile_wh: int = tile_wh
+        self.max_slots: int = min(gl_context.info['GL_MAX_ARRAY_TEXTURE_LAYERS'], TileMap.UNIFORM_TILE - 1)
+        self.slot_count: int = min(TileMap.INITIAL_SLOTS, self.max_slots)
+        self.tile_textures = self._create_tile_textures(gl_context, self.slot_count)
+        self.free_slots: list[int] = list(range(self.slot_count - 1, -1, -1))
+        self.slot_references: dict[str, list[int, int]] = {}  # 'texture_name': [slot, number of tiles using it]
+        self.slot_pretty_bytearrays: dict[int, bytes] = {}  # slot: pretty map; kept to fill a larger texture array
+        self.tile_indexes: array = array('H', [TileMap.NO_TILE]) * (tiles_across * tiles_high)
+        self.tile_index_texture = gl_context.texture((tiles_across, tiles_high), 1, dtype='u2')
+        self.tile_index_texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.uniform_colors: bytearray = bytearray(4 * tiles_across * tiles_high)
+        self.uniform_color_texture = gl_context.texture((tiles_across, tiles_high), 4)
+        self.uniform_color_texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        texture_registry.register(TileMap.TILE_TEXTURES_NAME, self.tile_textures, self)
+        texture_registry.register(TileMap.TILE_INDEX_TEXTURE_NAME, self.tile_index_texture, self)
+        texture_registry.register(TileMap.UNIFORM_COLOR_TEXTURE_NAME, self.uniform_color_texture, self)
+        self.tile_indexes_changed: bool = True
+        self.uniform_colors_changed: bool = True
+    #
+    def _create_tile_textures(self, gl_context: moderngl.Context, slot_count: int):
+        tile_textures = gl_context.texture_array((self.tile_wh, self.tile_wh, slot_count), 4)
+        tile_textures.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        return tile_textures
+    #
+    def set_uniform(self, index_x: int, index_y: int, rgba):
+        # rgba from 0 to 255
+        tile_number = (index_y * self.tiles_across) + index_x
+        self.tile_indexes[tile_number] = TileMap.UNIFORM_TILE
+        self.uniform_colors[4 * tile_number:4 * (tile_number + 1)] = bytes(rgba)
+        self.tile_indexes_changed = True
+        self.uniform_colors_changed = True
+    #
+    def add_tile(self, Render, gl_context: moderngl.Context, index_x: int, index_y: int, texture_name: str, pretty_bytearray):
+        slot_reference = self.slot_references.get(texture_name)
+        if slot_reference is None:
+            if not self.free_slots:
+                self._grow(Render, gl_context)
+            slot = self.free_slots.pop()
+            self.tile_textures.write(pretty_bytearray, viewport=(0, 0, slot, self.tile_wh, self.tile_wh, 1))
+            Render.uploaded_texture_bytes += len(pretty_bytearray)
+            self.slot_pretty_bytearrays[slot] = pretty_bytearray
+            slot_reference = self.slot_references[texture_name] = [slot, 0]
+        slot_reference[1] += 1
+        self.tile_indexes[(index_y * self.tiles_across) + index_x] = slot_reference[0] + 1
+        self.tile_indexes_changed = True
+    #
+    def remove_tile(self, index_x: int, index_y: int, texture_name: str):
+        slot_reference = self.slot_references[texture_name]
+        slot_reference[1] -= 1
+        if slot_reference[1] == 0:
+            del self.slot_references[texture_name]
+            del self.slot_pretty_bytearrays[slot_reference[0]]
+            self.free_slots.append(slot_reference[0])
+        self.tile_indexes[(index_y * self.tiles_across) + index_x] = TileMap.NO_TILE
+        self.tile_indexes_changed = True
+    #
+    def _grow(self, Render, gl_context: moderngl.Context):
+        # only happens until there are enough slots for the most tiles resident at once (a large window needs more)
+        if self.slot_count >= self.max_slots:
+            raise RuntimeError(f"tile map has no free slots; {self.max_slots} texture array layers are in use")
+        slot_count = min(2 * self.slot_count, self.max_slots)
+        Render.make_room_for_texture(TileMap.TILE_TEXTURES_NAME, 4 * (self.tile_wh ** 2) * slot_count)
+        tile_textures = self._create_tile_textures(gl_context, slot_count)
+        for slot, pretty_bytearray in self.slot_pretty_bytearrays.items():
+            tile_textures.write(pretty_bytearray, viewport=(0, 0, slot, self.tile_wh, self.tile_wh, 1))
+            Render.uploaded_texture_bytes += len(pretty_bytearray)
+        self.tile_textures.release()
+        self.tile_textures = tile_textures
+        self.texture_registry.register(TileMap.TILE_TEXTURES_NAME, tile_textures, self)
+        self.free_slots.extend(range(slot_count - 1, self.slot_count - 1, -1))
+        self.slot_count = slot_count
+        Render.gl_objects_created += 1
+    #
+    def upload_changes(self):
+        if self.tile_indexes_changed:
+            self.tile_index_texture.write(self.tile_indexes)
+            self.tile_indexes_changed = False
+        if self.uniform_colors_changed:
+            self.uniform_color_texture.write(self.uniform_colors)
+            self.uniform_colors_changed = False
+    #
+    def release(self):
+        self.tile_textures.release()
+        self.tile_index_texture.release()
+        self.uniform_color_texture.release()
+        for texture_name in [TileMap.TILE_TEXTURES_NAME, TileMap.TILE_INDEX_TEXTURE_NAME, TileMap.UNIFORM_COLOR_TEXTURE_NAME]:
+            self.texture_registry.unregister(texture_name)
 
 
 class RenderableObject():
     def __init__(self, Screen: ScreenObject, texture, width, height, rotation):
         self.texture = texture
+        self.pooled = False  # the texture is given back to the texture pool instead of being released
         self.ORIGINAL_WIDTH = width
         self.ORIGINAL_HEIGHT = height
         self.rotation = rotation
@@ -63,115 +511,372 @@ class RenderableObject():
         self.ORIGINAL_ROTATIONS = [topleft_rot, topright_rot, bottomleft_rot, bottomright_rot]
 
 
+class ProgramCache(dict):
+    # programs are compiled the first time they are used, so programs only used by the editor or the game are never compiled by the other
+    # program binaries are not cached on disk; moderngl has no way to read or load them
+    def __init__(self, gl_context: moderngl.Context):
+        super().__init__()
+        self.gl_context: moderngl.Context = gl_context
+        self.program_classes: dict = {}  # 'program_name': class that compiles the program
+        self.compile_milliseconds: dict[str, float] = {}  # 'program_name': time spent compiling
+    #
+    def add(self, program_name: str, program_class):
+        self.program_classes[program_name] = program_class
+    #
+    def __missing__(self, program_name: str):
+        start_time = get_time()
+        program = self.program_classes[program_name](self.gl_context)
+        self.compile_milliseconds[program_name] = (get_time() - start_time) * 1000
+        self[program_name] = program
+        return program
+    #
+    def get_total_compile_milliseconds(self):
+        return sum(self.compile_milliseconds.values())
+
+
 class RenderObjects():
+    # every quad is written into one persistent vertex buffer; each program has one vertex array that reads from it
+    # topleft, topright, bottomleft, bottomright; (x, y, u, v) each
+    QUAD_VERTEX_FORMAT = '2f 2f'
+    QUAD_VERTEX_ATTRIBUTES = ('vert', 'texcoord')
+    QUAD_VERTICES = 4
+    QUAD_BYTES = QUAD_VERTICES * 4 * 4
+    STREAMED_QUADS = 4096
+    # consecutive basic rects with the same texture are drawn together as one instanced draw
+    # per instance: quad (topleft x, topleft y, width, height), uv (left, top, right, bottom), color (added to the texture), rotation
+    SPRITE_INSTANCE_FORMAT = '4f 4f 4f 1f/i'
+    SPRITE_INSTANCE_ATTRIBUTES = ('quad', 'uv', 'color', 'rotation')
+    SPRITE_INSTANCE_FLOATS = 13
+    SPRITE_BATCH_INSTANCES = 4096
+    # every glyph is packed into one texture; glyphs are one pixel apart so they never bleed into each other
+    GLYPH_ATLAS_PADDING = 1
+    # laid out strings are kept so labels that are drawn every frame are only laid out once
+    TEXT_LAYOUT_CACHE_SIZE = 1024
+    _FULL_UV = (0.0, 0.0, 1.0, 1.0)
+    _NO_COLOR = (0.0, 0.0, 0.0, 0.0)
+    # panels are drawn into their textures with premultiplied alpha so they can be blended over the screen later
+    _PANEL_BLEND_FUNC = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA, moderngl.ONE, moderngl.ONE_MINUS_SRC_ALPHA)
+    _PREMULTIPLIED_BLEND_FUNC = (moderngl.ONE, moderngl.ONE_MINUS_SRC_ALPHA)
+    _DEFAULT_BLEND_FUNC = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA)
+
     def __init__(self, gl_context):
-        self.programs = {}
-        self.get_programs(gl_context)  # 'program_name': program
+        # per-frame counters
+        self.uploaded_texture_bytes = 0
+        self.uploaded_texture_bytes_last_frame = 0
+        self.gl_objects_created = 0
+        self.gl_objects_created_last_frame = 0
+        self.programs = ProgramCache(gl_context)  # 'program_name': program; compiled the first time it is used
+        self.get_programs(gl_context)
         self.renderable_objects = {}  # 'object_name': RenderableObject
-        self.stored_draws = {}  # 'draw_name': [render_function_reference, {kwargs: value}]
+        self.render_queue = RenderQueue()  # draws made after everything else in a frame
+        self.texture_registry = TextureRegistry()  # owner, size and age of every live texture
+        self.texture_pool = TexturePool(gl_context, self.texture_registry)  # tile sized textures
+        self.gl_objects_created += self.texture_pool.textures_created
+        self.gpu_profiler = GpuProfiler(gl_context)
+        self.frame_pacer = FramePacer(gl_context)
+        self.shared_texture_reference_counts = {}  # 'shared_object_name': number of names using it
+        self.quad_buffer = gl_context.buffer(reserve=RenderObjects.STREAMED_QUADS * RenderObjects.QUAD_BYTES, dynamic=True)
+        self.next_quad = 0
+        self.quad_vertex_arrays = {}  # id(program): vertex array
+        self.water_jet_counter_buffer = gl_context.buffer(reserve=struct.calcsize('2i'))
+        # sprite batch
+        self.sprite_corner_buffer = gl_context.buffer(data=array('f', [0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0]))
+        self.sprite_instance_buffer = gl_context.buffer(reserve=RenderObjects.SPRITE_BATCH_INSTANCES * RenderObjects.SPRITE_INSTANCE_FLOATS * 4, dynamic=True)
+        self.batch_vertex_arrays = {}  # 'program_name': vertex array; made on the program's first flush so its program is only compiled when used
+        self.batch_program = None
+        self.batch_texture = None
+        self.batch_aspect = None
+        self.batch_instances = array('f')
+        self.batch_quads = 0
+        self.gl_objects_created += 4
+        # text
+        self.glyph_atlas = None
+        self.glyph_uvs = {}  # 'character': (left, top, right, bottom)
+        self.text_layouts = {}  # (string, text_pixel_size): laid out sprite batch instances in pixels
+        # checkerboards shown through transparent tile pixels
+        self.checkerboard_textures = {}  # (rgba1, rgba2): 2x2 repeating texture
+        self.tile_checkerboard_texture = None
+        # retained panels
+        self.panels = {}  # 'panel_name': [texture, framebuffer, ltwh]
+        self.drawing_suppressed = False  # set while a panel that did not change is being updated; its texture is drawn instead
+        self.panels_redrawn = 0
+        self.panels_redrawn_last_frame = 0
+        self.panels_reused = 0
+        self.panels_reused_last_frame = 0
+        # per-frame counters
+        self.draw_calls = 0
+        self.draw_calls_last_frame = 0
+        self.batched_quads = 0
+        self.batched_quads_last_frame = 0
     #
     def get_programs(self, gl_context):
         # rendering
-        self.programs['basic_rect'] = DrawBasicRect(gl_context)
-        self.programs['rotation_rect'] = DrawRotationRect(gl_context)
-        self.programs['basic_image_with_color'] = DrawImageWithColor(gl_context)
-        self.programs['basic_rect_with_color'] = DrawBasicRectWithVariableColor(gl_context)
-        self.programs['basic_rect_glow'] = DrawBasicRectGlow(gl_context)
-        self.programs['basic_rect_circle_glow'] = DrawBasicRectCircleGlow(gl_context)
-        self.programs['basic_outline'] = DrawBasicOutline(gl_context)
-        self.programs['RGBA_picker'] = DrawRGBAPicker(gl_context)
-        self.programs['spectrum_x'] = DrawSpectrumX(gl_context)
-        self.programs['checkerboard'] = DrawCheckerboard(gl_context)
-        self.programs['text'] = DrawText(gl_context)
-        self.programs['invert_white'] = DrawInvertWhite(gl_context)
-        self.programs['circle_outline'] = DrawCircleOutline(gl_context)
-        self.programs['draw_circle'] = DrawCircle(gl_context)
-        self.programs['draw_ellipse'] = DrawEllipse(gl_context)
-        self.programs['draw_hollow_ellipse'] = DrawHollowEllipse(gl_context)
-        self.programs['draw_line'] = DrawLine(gl_context)
-        self.programs['draw_collision_tile'] = DrawCollisionTile(gl_context)
-        self.programs['draw_water_jet'] = DrawWaterJet(gl_context)
+        self.programs.add('sprite_batch', DrawSpriteBatch)
+        self.programs.add('rotation_rect', DrawRotationRect)
+        self.programs.add('basic_image_with_color', DrawImageWithColor)
+        self.programs.add('basic_rect_glow', DrawBasicRectGlow)
+        self.programs.add('basic_rect_circle_glow', DrawBasicRectCircleGlow)
+        self.programs.add('basic_outline', DrawBasicOutline)
+        self.programs.add('RGBA_picker', DrawRGBAPicker)
+        self.programs.add('spectrum_x', DrawSpectrumX)
+        self.programs.add('checkerboard', DrawCheckerboard)
+        self.programs.add('tile_batch', DrawTileBatch)
+        self.programs.add('text_batch', DrawTextBatch)
+        self.programs.add('invert_white', DrawInvertWhite)
+        self.programs.add('circle_outline', DrawCircleOutline)
+        self.programs.add('draw_circle', DrawCircle)
+        self.programs.add('draw_ellipse', DrawEllipse)
+        self.programs.add('draw_hollow_ellipse', DrawHollowEllipse)
+        self.programs.add('draw_line', DrawLine)
+        self.programs.add('draw_collision_tile', DrawCollisionTile)
+        self.programs.add('draw_water_jet', DrawWaterJet)
+        self.programs.add('panel', DrawPanel)
+        self.programs.add('tile_map', DrawTileMap)
         # compute shaders
-        self.programs['compute_water_jet'] = ComputeWaterJet(gl_context)
+        self.programs.add('compute_water_jet', ComputeWaterJet)
     #
     def write_pixels(self, name: str, ltwh: tuple[int, int, int, int], rgba: tuple[int, int, int, int]):
+        self.flush_batch()
         self.renderable_objects[name].texture.write(np.array(rgba_to_bgra(rgba), dtype=np.uint8).tobytes(), viewport=ltwh)
     #
-    def write_pixels_from_pg_surface(self, name: str, pg_surface: pygame.Surface):
-        self.renderable_objects[name].texture.write(pg_surface.get_buffer().raw)
+    def write_pixels_from_pg_surface(self, name: str, pg_surface: pygame.Surface, ltwh: tuple[int, int, int, int] | None = None):
+        # ltwh limits the upload to part of the texture; rows are sliced from a view of the surface's pixels so only the region is copied
+        self.flush_batch()
+        with memoryview(pg_surface.get_buffer()) as surface_bytes:
+            if ltwh is None:
+                self.renderable_objects[name].texture.write(surface_bytes)
+                self.uploaded_texture_bytes += surface_bytes.nbytes
+                return
+            pitch, bytes_per_pixel = pg_surface.get_pitch(), pg_surface.get_bytesize()
+            left, right = ltwh[0] * bytes_per_pixel, (ltwh[0] + ltwh[2]) * bytes_per_pixel
+            region_bytes = b''.join([surface_bytes[(row * pitch) + left:(row * pitch) + right] for row in range(ltwh[1], ltwh[1] + ltwh[3])])
+        self.renderable_objects[name].texture.write(region_bytes, viewport=ltwh)
+        self.uploaded_texture_bytes += len(region_bytes)
+    #
+    def write_pixels_from_bytearray(self, name: str, byte_array: bytearray, ltwh: tuple[int, int, int, int] | None = None):
+        # ltwh limits the upload to part of the texture; byte_array is always the whole texture
+        self.flush_batch()
+        texture = self.renderable_objects[name].texture
+        if ltwh is None:
+            texture.write(byte_array)
+            self.uploaded_texture_bytes += len(byte_array)
+            return
+        row_bytes = texture.width * texture.components
+        left, right = ltwh[0] * texture.components, (ltwh[0] + ltwh[2]) * texture.components
+        region_bytes = b''.join([byte_array[(row * row_bytes) + left:(row * row_bytes) + right] for row in range(ltwh[1], ltwh[1] + ltwh[3])])
+        texture.write(region_bytes, viewport=ltwh)
+        self.uploaded_texture_bytes += len(region_bytes)
     #
-    def write_pixels_from_bytearray(self, name: str, byte_array: bytearray):
-        self.renderable_objects[name].texture.write(byte_array)
+    def _evict_for_texture_budget(self, texture_bytes: int):
+        # tiles that were not used this frame are evicted from residency caches first; pooled tile textures go back to the pool, so free pooled textures are released last
+        for evictor in [*self.texture_registry.evictors, self.texture_pool]:
+            bytes_over_budget = self.texture_registry.get_bytes_over_budget(texture_bytes)
+            if bytes_over_budget == 0:
+                return True
+            evictor.evict_bytes(self, bytes_over_budget)
+        return self.texture_registry.get_bytes_over_budget(texture_bytes) == 0
     #
-    def add_moderngl_texture_with_surface(self, Screen: ScreenObject, gl_context: moderngl.Context, pygame_image: pygame.Surface, name):
+    def can_load_textures(self, texture_bytes: int):
+        # called before a load that can wait (e.g. a tile); when the textures cannot fit the budget the load is skipped and tried again later
+        if self._evict_for_texture_budget(texture_bytes):
+            return True
+        self.texture_registry.skipped_loads += 1
+        return False
+    #
+    def make_room_for_texture(self, name: str, texture_bytes: int):
+        # called before a texture is made; a texture that still does not fit the budget is made anyway
+        if not self._evict_for_texture_budget(texture_bytes):
+            self.texture_registry.over_budget_textures += 1
+            LOGGER.warning("texture '%s' (%d bytes) takes gpu memory %d bytes over the %d byte budget", name, texture_bytes, self.texture_registry.get_bytes_over_budget(texture_bytes), self.texture_registry.budget_bytes)
+    #
+    def add_moderngl_texture_with_surface(self, Screen: ScreenObject, gl_context: moderngl.Context, pygame_image: pygame.Surface, name, owner=None):
         width, height = pygame_image.get_size()
+        self.make_room_for_texture(name, width * height * 4)
         texture = gl_context.texture((width, height), 4)
+        self.gl_objects_created += 1
         texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
         texture.swizzle = 'BGRA'
         texture.write(pygame_image.get_view('1'))
         rotation = 0
         self.renderable_objects[name] = RenderableObject(Screen, texture, width, height, rotation)
+        self.texture_registry.register(name, texture, owner)
+        return pygame_image
+    #
+    def update_moderngl_texture_with_surface(self, Screen: ScreenObject, gl_context: moderngl.Context, pygame_image: pygame.Surface, name, owner=None):
+        # a texture of the same size is written over instead of being released and created again
+        renderable_object = self.renderable_objects.get(name)
+        if (renderable_object is None) or (renderable_object.texture.size != pygame_image.get_size()):
+            if renderable_object is not None:
+                self.remove_moderngl_texture_from_renderable_objects_dict(name)
+            return self.add_moderngl_texture_with_surface(Screen, gl_context, pygame_image, name, owner)
+        self.flush_batch()
+        renderable_object.texture.write(pygame_image.get_view('1'))
+        self.uploaded_texture_bytes += pygame_image.get_width() * pygame_image.get_height() * 4
         return pygame_image
     #
-    def add_moderngl_texture_to_renderable_objects_dict(self, Screen: ScreenObject, gl_context: moderngl.Context, path, name):
+    def add_moderngl_texture_to_renderable_objects_dict(self, Screen: ScreenObject, gl_context: moderngl.Context, path, name, owner=None):
         pygame_image = pygame.image.load(path).convert_alpha()
         width, height = pygame_image.get_size()
+        self.make_room_for_texture(name, width * height * 4)
         texture = gl_context.texture((width, height), 4)
+        self.gl_objects_created += 1
         texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
         texture.swizzle = 'BGRA'
         texture.write(pygame_image.get_view('1'))
         rotation = 0
         self.renderable_objects[name] = RenderableObject(Screen, texture, width, height, rotation)
+        self.texture_registry.register(name, texture, owner)
         return pygame_image
     #
-    def add_moderngl_texture_using_bytearray(self, Screen: ScreenObject, gl_context: moderngl.Context, byte_array: bytearray, bytes_per_pixel: int, width: int, height: int, name: str):
-        texture = gl_context.texture((width, height), bytes_per_pixel)
-        texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
-        texture.swizzle = 'RGBA'
+    def add_moderngl_texture_using_bytearray(self, Screen: ScreenObject, gl_context: moderngl.Context, byte_array: bytearray, bytes_per_pixel: int, width: int, height: int, name: str, return_surface: bool = False, owner=None, subsystem: str | None = None):
+        # tile sized textures come from the texture pool; a pygame surface copy of the image is only made when return_surface is set
+        pooled = self.texture_pool.is_pooled(width, height, bytes_per_pixel)
+        if (not pooled) or (not self.texture_pool.has_free_texture(width, height, bytes_per_pixel)):
+            self.make_room_for_texture(name, width * height * bytes_per_pixel)
+        if pooled:
+            textures_created = self.texture_pool.textures_created
+            texture = self.texture_pool.borrow(width, height, bytes_per_pixel)
+            self.gl_objects_created += self.texture_pool.textures_created - textures_created
+        else:
+            texture = gl_context.texture((width, height), bytes_per_pixel)
+            self.gl_objects_created += 1
+            texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+            texture.swizzle = 'RGBA'
         texture.write(byte_array)
+        self.uploaded_texture_bytes += len(byte_array)
         rotation = 0
-        self.renderable_objects[name] = RenderableObject(Screen, texture, width, height, rotation)
-        return pygame.image.frombytes(bytes(byte_array), (width, height), 'RGBA') if bytes_per_pixel == 4 else None
+        renderable_object = RenderableObject(Screen, texture, width, height, rotation)
+        renderable_object.pooled = pooled
+        self.renderable_objects[name] = renderable_object
+        self.texture_registry.register(name, texture, owner, subsystem)
+        if return_surface and (bytes_per_pixel == 4):
+            return pygame.image.frombytes(bytes(byte_array), (width, height), 'RGBA')
+        return None
     #
-    def add_moderngl_texture_scaled(self, Screen: ScreenObject, gl_context: moderngl.Context, path, name, scale):
+    def add_moderngl_texture_scaled(self, Screen: ScreenObject, gl_context: moderngl.Context, path, name, scale, owner=None):
         pygame_image = pygame.image.load(path).convert_alpha()
         width, height = [int(wh * scale) for wh in pygame_image.get_size()]
         pygame_image = pygame.transform.scale(pygame_image, (width, height))
+        self.make_room_for_texture(name, width * height * 4)
         texture = gl_context.texture((width, height), 4)
+        self.gl_objects_created += 1
         texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
         texture.swizzle = 'BGRA'
         texture.write(pygame_image.get_view('1'))
         rotation = 0
         self.renderable_objects[name] = RenderableObject(Screen, texture, width, height, rotation)
+        self.texture_registry.register(name, texture, owner)
         return pygame_image
     #
     def remove_moderngl_texture_from_renderable_objects_dict(self, name):
-        self.renderable_objects[name].texture.release()
+        self.flush_batch()
+        renderable_object = self.renderable_objects.pop(name)
+        self.texture_registry.unregister(name)
+        if renderable_object.pooled:
+            self.texture_pool.give_back(renderable_object.texture)
+        else:
+            renderable_object.texture.release()
+    #
+    def add_moderngl_texture_alias(self, name, existing_name):
+        # another name for an existing texture; the texture is shared, not copied
+        self.renderable_objects[name] = self.renderable_objects[existing_name]
+    #
+    def remove_moderngl_texture_alias(self, name):
+        # the shared texture is not released
         del self.renderable_objects[name]
-    #:
-    def store_draw(self, draw_name: str, render_function_reference: Callable, kwargs_dict: dict):
-        self.stored_draws[draw_name] = [render_function_reference, kwargs_dict]
     #
-    def execute_stored_draw(self, Screen: ScreenObject, gl_context: moderngl.Context, draw_name: str):
-        # 'draw_name': [render_function_reference, {kwargs: value}]
-        self.stored_draws[draw_name][0](Screen, gl_context, **self.stored_draws[draw_name][1])
-        del self.stored_draws[draw_name]
+    def acquire_shared_moderngl_texture(self, Screen: ScreenObject, gl_context: moderngl.Context, byte_array: bytearray, bytes_per_pixel: int, width: int, height: int, shared_name: str, name: str, owner=None):
+        # textures with identical contents are uploaded once; every name using it holds a reference
+        # a shared texture has no single owner, so it is only counted under the subsystem of the owner that uploaded it
+        if shared_name not in self.shared_texture_reference_counts:
+            self.add_moderngl_texture_using_bytearray(Screen, gl_context, byte_array, bytes_per_pixel, width, height, shared_name, subsystem=None if owner is None else type(owner).__name__)
+            self.shared_texture_reference_counts[shared_name] = 0
+        self.shared_texture_reference_counts[shared_name] += 1
+        self.add_moderngl_texture_alias(name, shared_name)
     #
-    def basic_rect_ltwh_to_quad(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh):
-        # 'basic_rect', DrawBasicRect
-        program = self.programs['basic_rect'].program
-        renderable_object = self.renderable_objects[object_name]
+    def release_shared_moderngl_texture(self, shared_name: str, name: str):
+        self.remove_moderngl_texture_alias(name)
+        self.shared_texture_reference_counts[shared_name] -= 1
+        if self.shared_texture_reference_counts[shared_name] == 0:
+            del self.shared_texture_reference_counts[shared_name]
+            self.remove_moderngl_texture_from_renderable_objects_dict(shared_name)
+    #
+    def store_draw(self, layer: int, render_function_reference: Callable, kwargs_dict: dict):
+        self.render_queue.add(layer, render_function_reference, kwargs_dict)
+    #
+    def execute_stored_draws(self, Screen: ScreenObject, gl_context: moderngl.Context):
+        self.render_queue.draw(Screen, gl_context)
+    #
+    def _render_quad(self, gl_context: moderngl.Context, program, texture, topleft_x: float, topleft_y: float, topright_x: float, bottomleft_y: float):
+        # once the buffer is full it is orphaned; the driver gives it new storage so drawing never waits on quads the gpu is still reading
+        if self.drawing_suppressed:
+            return
+        self.flush_batch()
+        if self.next_quad == RenderObjects.STREAMED_QUADS:
+            self.quad_buffer.orphan()
+            self.next_quad = 0
+        self.quad_buffer.write(array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]), offset=self.next_quad * RenderObjects.QUAD_BYTES)
+        vertex_array = self.quad_vertex_arrays.get(id(program))
+        if vertex_array is None:
+            vertex_array = gl_context.vertex_array(program, [(self.quad_buffer, RenderObjects.QUAD_VERTEX_FORMAT, *RenderObjects.QUAD_VERTEX_ATTRIBUTES)])
+            self.quad_vertex_arrays[id(program)] = vertex_array
+            self.gl_objects_created += 1
+        texture.use(0)
+        vertex_array.render(mode=moderngl.TRIANGLE_STRIP, vertices=RenderObjects.QUAD_VERTICES, first=self.next_quad * RenderObjects.QUAD_VERTICES)
+        self.next_quad += 1
+        self.draw_calls += 1
+    #
+    def _start_batch(self, Screen: ScreenObject, program_name: str, texture, quads: int):
+        # quads are only drawn when the program or texture changes, another kind of draw happens, a texture is changed, or the frame ends
+        if (program_name != self.batch_program) or (texture is not self.batch_texture) or (Screen.aspect != self.batch_aspect) or ((self.batch_quads + quads) > RenderObjects.SPRITE_BATCH_INSTANCES):
+            self.flush_batch()
+            self.batch_program = program_name
+            self.batch_texture = texture
+            self.batch_aspect = Screen.aspect
+    #
+    def _batch_quad(self, Screen: ScreenObject, texture, ltwh, rgba, uv=_FULL_UV, rotation: float = 0.0, program_name: str = 'sprite_batch'):
+        if self.drawing_suppressed:
+            return
+        self._start_batch(Screen, program_name, texture, 1)
         topleft_x = (-1.0 + ((2 * ltwh[0]) / Screen.width)) * Screen.aspect
         topleft_y = 1.0 - ((2 * ltwh[1]) / Screen.height)
-        topright_x = topleft_x + ((2 * ltwh[2] * Screen.aspect) / Screen.width)
-        bottomleft_y = topleft_y - ((2 * ltwh[3]) / Screen.height)
-        program['aspect'] = Screen.aspect
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self.batch_instances.extend((topleft_x, topleft_y, (2 * ltwh[2] * Screen.aspect) / Screen.width, (2 * ltwh[3]) / Screen.height, *uv, *rgba, rotation))
+        self.batch_quads += 1
+    #
+    def flush_batch(self):
+        if self.batch_quads == 0:
+            return
+        # orphan the instance buffer so writing never waits on the previous batch
+        self.sprite_instance_buffer.orphan()
+        self.sprite_instance_buffer.write(self.batch_instances)
+        self.programs[self.batch_program].program['aspect'] = self.batch_aspect
+        self.batch_texture.use(0)
+        if self.batch_program == 'tile_batch':
+            self.tile_checkerboard_texture.use(1)
+        self._get_batch_vertex_array(self.batch_program).render(mode=moderngl.TRIANGLE_STRIP, vertices=RenderObjects.QUAD_VERTICES, instances=self.batch_quads)
+        self.draw_calls += 1
+        self.batched_quads += self.batch_quads
+        self.batch_instances = array('f')
+        self.batch_quads = 0
+        self.batch_program = None
+        self.batch_texture = None
+    #
+    def _get_batch_vertex_array(self, program_name: str):
+        vertex_array = self.batch_vertex_arrays.get(program_name)
+        if vertex_array is None:
+            vertex_array = self.programs.gl_context.vertex_array(self.programs[program_name].program, [(self.sprite_corner_buffer, '2f', 'corner'), (self.sprite_instance_buffer, RenderObjects.SPRITE_INSTANCE_FORMAT, *RenderObjects.SPRITE_INSTANCE_ATTRIBUTES)])
+            self.batch_vertex_arrays[program_name] = vertex_array
+            self.gl_objects_created += 1
+        return vertex_array
+    #
+    def basic_rect_ltwh_to_quad(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh):
+        # 'sprite_batch', DrawSpriteBatch
+        self._batch_quad(Screen, self.renderable_objects[object_name].texture, ltwh, RenderObjects._NO_COLOR)
+    #
+    def basic_rect_ltwh_over_checkerboard(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh):
+        # 'tile_batch', DrawTileBatch
+        # transparent pixels show the checkerboard from set_tile_checkerboard
+        self._batch_quad(Screen, self.renderable_objects[object_name].texture, ltwh, RenderObjects._NO_COLOR, program_name='tile_batch')
     #
     def rotation_rect_ltwhr_to_quad(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwhr):
         # 'rotation_rect', DrawRotationRect
@@ -185,12 +890,7 @@ class RenderObjects():
         program['offset_x'] = (topleft_x + topright_x) / 2
         program['offset_y'] = (topleft_y + bottomleft_y) / 2
         program['aspect'] = Screen.aspect
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def basic_rect_ltwh_image_with_color(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba):
         # 'basic_image_with_color', DrawImageWithColor
@@ -205,32 +905,11 @@ class RenderObjects():
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
         program['alpha'] = rgba[3]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def basic_rect_ltwh_with_color_to_quad(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba):
-        # 'basic_rect_with_color', DrawBasicRectWithVariableColor
-        program = self.programs['basic_rect_with_color'].program
-        renderable_object = self.renderable_objects[object_name]
-        topleft_x = (-1.0 + ((2 * ltwh[0]) / Screen.width)) * Screen.aspect
-        topleft_y = 1.0 - ((2 * ltwh[1]) / Screen.height)
-        topright_x = topleft_x + ((2 * ltwh[2] * Screen.aspect) / Screen.width)
-        bottomleft_y = topleft_y - ((2 * ltwh[3]) / Screen.height)
-        program['aspect'] = Screen.aspect
-        program['red'] = rgba[0]
-        program['green'] = rgba[1]
-        program['blue'] = rgba[2]
-        program['alpha'] = rgba[3]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        # 'sprite_batch', DrawSpriteBatch
+        self._batch_quad(Screen, self.renderable_objects[object_name].texture, ltwh, rgba)
     #
     def basic_rect_ltwh_glow(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba, glowing_pixels):
         # 'basic_rect_glow', DrawBasicRectGlow
@@ -246,12 +925,7 @@ class RenderObjects():
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
         program['glowing_pixels'] = abs(1 - (ltwh[2] / new_ltwh[2]))
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def basic_rect_circle_ltwh_glow(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba, glowing_pixels, brightness):
         # 'basic_rect_circle_glow', DrawBasicRectCircleGlow
@@ -267,12 +941,7 @@ class RenderObjects():
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
         program['brightness'] = brightness
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def basic_outline_ltwh(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba, outline_pixels):
         # 'basic_outline', DrawBasicOutline
@@ -287,12 +956,7 @@ class RenderObjects():
         program['red'] = rgba[0]
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def rgba_picker(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, saturation):
         # 'RGBA_picker', DrawRGBAPicker
@@ -311,12 +975,7 @@ class RenderObjects():
                 bottomleft_y = topleft_y - ((2 * height) / Screen.height)
                 program['aspect'] = Screen.aspect
                 program['saturation'] = saturation
-                quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-                renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-                renderable_object.texture.use(0)
-                renderer.render(mode=moderngl.TRIANGLE_STRIP)
-                quads.release()
-                renderer.release()
+                self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def spectrum_x(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba1, rgba2):
         # 'spectrum_x', DrawSpectrumX
@@ -335,12 +994,7 @@ class RenderObjects():
         program['green2'] = rgba2[1]
         program['blue2'] = rgba2[2]
         program['alpha2'] = rgba2[3]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def checkerboard(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh, rgba1, rgba2, repeat_x, repeat_y, offset_x: int = 0, offset_y: int = 0):
         # 'checkerboard', DrawCheckerboard
@@ -363,36 +1017,90 @@ class RenderObjects():
         program['offset_y'] = float(offset_y) / ltwh[3]
         program['two_tiles_x'] = 2 / (ltwh[2] / repeat_x)
         program['two_tiles_y'] = 2 / (ltwh[3] / repeat_y)
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
-    def draw_string_of_characters(self, Screen: ScreenObject, gl_context: moderngl.Context, string, lt, text_pixel_size, rgba):
-        # 'text', DrawText
-        ltwh = [lt[0], lt[1], 0, get_text_height(text_pixel_size)]
-        for character in string:
-            ltwh[2] = get_text_width(self, character, text_pixel_size)
-            program = self.programs['text'].program
+    def set_tile_checkerboard(self, Screen: ScreenObject, gl_context: moderngl.Context, rgba1, rgba2, square_size: float, origin_xy):
+        # the checkerboard drawn behind transparent pixels of tiles drawn with basic_rect_ltwh_over_checkerboard
+        # it is a repeating 2x2 texture only sampled where a tile is not opaque, so nothing is drawn under opaque tiles
+        # origin_xy is where the top left square starts on the screen
+        self.flush_batch()
+        key = (tuple(rgba1), tuple(rgba2))
+        texture = self.checkerboard_textures.get(key)
+        if texture is None:
+            texture = gl_context.texture((2, 2), 4, data=bytes(round(channel * 255) for channel in (*rgba1, *rgba2, *rgba2, *rgba1)))
+            texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+            self.gl_objects_created += 1
+            self.texture_registry.register(f"checkerboard_{len(self.checkerboard_textures)}", texture, subsystem='checkerboards')
+            self.checkerboard_textures[key] = texture
+        self.tile_checkerboard_texture = texture
+        program = self.programs['tile_batch'].program
+        program['checkerboard'] = 1
+        program['screen_height'] = Screen.height
+        program['checkerboard_origin'] = (float(origin_xy[0]), float(origin_xy[1]))
+        program['square_size'] = float(square_size)
+    #
+    def build_glyph_atlas(self, Screen: ScreenObject, gl_context: moderngl.Context):
+        # pack every loaded character into one texture; the characters keep their widths but share the atlas texture
+        characters = [character for character in TEXT_CHARACTERS if character in self.renderable_objects]
+        atlas_width = sum(self.renderable_objects[character].ORIGINAL_WIDTH + RenderObjects.GLYPH_ATLAS_PADDING for character in characters)
+        atlas_height = max(self.renderable_objects[character].ORIGINAL_HEIGHT for character in characters)
+        self.glyph_atlas = gl_context.texture((atlas_width, atlas_height), 4)
+        self.gl_objects_created += 1
+        self.glyph_atlas.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.glyph_atlas.swizzle = 'BGRA'
+        self.glyph_atlas.write(bytes(atlas_width * atlas_height * 4))
+        self.texture_registry.register('glyph_atlas', self.glyph_atlas, subsystem='text')
+        left = 0
+        for character in characters:
             renderable_object = self.renderable_objects[character]
-            topleft_x = (-1.0 + ((2 * ltwh[0]) / Screen.width)) * Screen.aspect
-            topleft_y = 1.0 - ((2 * ltwh[1]) / Screen.height)
-            topright_x = topleft_x + ((2 * ltwh[2] * Screen.aspect) / Screen.width)
-            bottomleft_y = topleft_y - ((2 * ltwh[3]) / Screen.height)
-            program['aspect'] = Screen.aspect
-            program['red'] = rgba[0]
-            program['green'] = rgba[1]
-            program['blue'] = rgba[2]
-            program['alpha'] = rgba[3]
-            quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-            renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-            renderable_object.texture.use(0)
-            renderer.render(mode=moderngl.TRIANGLE_STRIP)
-            quads.release()
-            renderer.release()
-            ltwh[0] += ltwh[2] + text_pixel_size
+            width, height = renderable_object.ORIGINAL_WIDTH, renderable_object.ORIGINAL_HEIGHT
+            # textures are stored in the same byte order, so the atlas uses the same swizzle
+            self.glyph_atlas.write(renderable_object.texture.read(), viewport=(left, 0, width, height))
+            self.uploaded_texture_bytes += width * height * 4
+            self.glyph_uvs[character] = (left / atlas_width, 0.0, (left + width) / atlas_width, height / atlas_height)
+            renderable_object.texture.release()
+            self.texture_registry.unregister(character)
+            self.renderable_objects[character] = RenderableObject(Screen, self.glyph_atlas, width, height, renderable_object.rotation)
+            left += width + RenderObjects.GLYPH_ATLAS_PADDING
+        self.text_layouts = {}
+    #
+    def _get_text_layout(self, string, text_pixel_size):
+        # instances for the string drawn at (0, 0) in pixels; only the color and position change between draws
+        key = (string, text_pixel_size)
+        text_layout = self.text_layouts.get(key)
+        if text_layout is not None:
+            return text_layout
+        text_layout = np.zeros((len(string), RenderObjects.SPRITE_INSTANCE_FLOATS), dtype=np.float32)
+        left = 0
+        for index, character in enumerate(string):
+            width = self.renderable_objects[character].ORIGINAL_WIDTH * text_pixel_size
+            text_layout[index, 0:4] = (left, 0, width, get_text_height(text_pixel_size))
+            text_layout[index, 4:8] = self.glyph_uvs[character]
+            left += width + text_pixel_size
+        if len(self.text_layouts) == RenderObjects.TEXT_LAYOUT_CACHE_SIZE:
+            del self.text_layouts[next(iter(self.text_layouts))]
+        self.text_layouts[key] = text_layout
+        return text_layout
+    #
+    def draw_string_of_characters(self, Screen: ScreenObject, gl_context: moderngl.Context, string, lt, text_pixel_size, rgba):
+        # 'text_batch', DrawTextBatch
+        if self.drawing_suppressed:
+            return
+        if self.glyph_atlas is None:
+            self.build_glyph_atlas(Screen, gl_context)
+        text_layout = self._get_text_layout(string, text_pixel_size)
+        instances = text_layout.copy()
+        instances[:, 0] = (-1.0 + ((2 * (lt[0] + text_layout[:, 0])) / Screen.width)) * Screen.aspect
+        instances[:, 1] = 1.0 - ((2 * lt[1]) / Screen.height)
+        instances[:, 2] = (2 * text_layout[:, 2] * Screen.aspect) / Screen.width
+        instances[:, 3] = (2 * text_layout[:, 3]) / Screen.height
+        instances[:, 8:12] = rgba
+        # strings longer than a batch are split over several batches
+        for first_quad in range(0, len(string), RenderObjects.SPRITE_BATCH_INSTANCES):
+            quads = instances[first_quad:first_quad + RenderObjects.SPRITE_BATCH_INSTANCES]
+            self._start_batch(Screen, 'text_batch', self.glyph_atlas, len(quads))
+            self.batch_instances.frombytes(quads.tobytes())
+            self.batch_quads += len(quads)
     #
     def invert_white(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh):
         """
@@ -412,12 +1120,7 @@ class RenderObjects():
         topright_x = topleft_x + ((2 * ltwh[2] * Screen.aspect) / Screen.width)
         bottomleft_y = topleft_y - ((2 * ltwh[3]) / Screen.height)
         program['aspect'] = Screen.aspect
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
         #gl_context.blend_func = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA, moderngl.ONE, moderngl.ZERO)
         #gl_context.blend_func = moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA
     #
@@ -437,12 +1140,7 @@ class RenderObjects():
         program['circle_pixel_size'] = circle_pixel_size
         program['circle_outline_thickness'] = circle_outline_thickness
         program['is_a_square'] = is_a_square
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
         #gl_context.blend_func = (moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA, moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA)
     #
     def draw_circle(self, Screen: ScreenObject, gl_context: moderngl.Context, ltwh: list[int, int, int, int], circle_size: int, circle_pixel_size: float, rgba):
@@ -462,12 +1160,7 @@ class RenderObjects():
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
         program['alpha'] = rgba[3]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def draw_ellipse(self, Screen: ScreenObject, gl_context: moderngl.Context, ltwh: list[int, int, int, int], ellipse_wh: list[int, int], pixel_size: float, rgba: list[float, float, float, float]):
         # 'draw_ellipse', DrawEllipse
@@ -490,12 +1183,7 @@ class RenderObjects():
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
         program['alpha'] = rgba[3]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def draw_hollow_ellipse(self, Screen: ScreenObject, gl_context: moderngl.Context, ltwh: list[int, int, int, int], ellipse_wh: list[int, int], pixel_size: float, ellipse_thickness: int, rgba: list[float, float, float, float]):
         # 'draw_hollow_ellipse', DrawHollowEllipse
@@ -516,12 +1204,7 @@ class RenderObjects():
         program['green'] = rgba[1]
         program['blue'] = rgba[2]
         program['alpha'] = rgba[3]
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def draw_line(self, Screen: ScreenObject, gl_context: moderngl.Context, x1: int, y1: int, x2: int, y2: int, thickness: int, rgba, pixel_size: int | float = 1, circle_for_line_drawing = None, brush_style: int = LineTool.CIRCLE_BRUSH):
         # 'draw_line', DrawLine
@@ -625,12 +1308,7 @@ class RenderObjects():
         program['octant'] = int(octant)
         program['pixel_size'] = pixel_size
         program['brush_style'] = brush_style
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def draw_collision_map_tile_in_editor(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ltwh):
         # 'draw_collision_tile', DrawCollisionTile
@@ -641,12 +1319,7 @@ class RenderObjects():
         topright_x = topleft_x + ((2 * ltwh[2] * Screen.aspect) / Screen.width)
         bottomleft_y = topleft_y - ((2 * ltwh[3]) / Screen.height)
         program['aspect'] = Screen.aspect
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
     #
     def draw_rectangle(self, Screen: ScreenObject, gl_context: moderngl.Context, ltwh, border_thickness, border_color, coloring_border, inner_color, coloring_inside): # rectangle with border
         if coloring_border:
@@ -693,6 +1366,7 @@ class RenderObjects():
     #
     def draw_water_jet(self, Screen: ScreenObject, gl_context: moderngl.Context, object_name, ball_center: Iterable[float], ball_radius: float, max_length_from_center: float, current_length_from_center: float, rotation: float, minimum_water_jet_thickness: float, moment_in_wave_period: float):
         # 'draw_water_jet', DrawWaterJet
+        self.begin_pass('water jet')
         ltwh = [ball_center[0] - current_length_from_center, ball_center[1] - current_length_from_center, 2 * current_length_from_center, 2 * current_length_from_center]
         program = self.programs['draw_water_jet'].program
         renderable_object = self.renderable_objects[object_name]
@@ -715,19 +1389,18 @@ class RenderObjects():
         program['quad2'] = (45.0 <= rotation <= 225.0)
         program['quad3'] = (135 <= rotation <= 315.0)
         program['quad4'] = (225.0 <= rotation <= 360.0) or (0.0 <= rotation <= 45.0)
-        quads = gl_context.buffer(data=array('f', [topleft_x, topleft_y, 0.0, 0.0, topright_x, topleft_y, 1.0, 0.0, topleft_x, bottomleft_y, 0.0, 1.0, topright_x, bottomleft_y, 1.0, 1.0,]))
-        renderer = gl_context.vertex_array(program, [(quads, '2f 2f', 'vert', 'texcoord')])
-        renderable_object.texture.use(0)
-        renderer.render(mode=moderngl.TRIANGLE_STRIP)
-        quads.release()
-        renderer.release()
+        self._render_quad(gl_context, program, renderable_object.texture, topleft_x, topleft_y, topright_x, bottomleft_y)
+        self.end_pass()
     #
     def compute_water_jet(self, Screen: ScreenObject, gl_context: moderngl.Context, map_object: Map, player_object: Player):
         # 'compute_water_jet', ComputeWaterJet
+        self.flush_batch()
+        self.begin_pass('compute water jet')
         # get the compute shader program
         program: moderngl.ComputeShader = self.programs['compute_water_jet'].compute_shader
-        # create buffer for water jet collision positions for the output
-        counter_buffer = gl_context.buffer(struct.pack('2i', 0, 0))
+        # reset the buffer for water jet collision positions for the output
+        counter_buffer = self.water_jet_counter_buffer
+        counter_buffer.write(struct.pack('2i', 0, 0))
         counter_buffer.bind_to_storage_buffer(binding=0)
         # get collision tiles and bind them to storage buffers
         tile_references, player_position_x, player_position_y = map_object.get_collision_tile_references_for_ball(player_object)
@@ -751,32 +1424,156 @@ class RenderObjects():
         program["tile_size"] = Map.TILE_WH
         # run the compute shader
         program.run(group_x=(2 * Map.TILE_WH), group_y=(2 * Map.TILE_WH), group_z=1)
+        self.end_pass()
         # get the collision values from the buffer
         distance_from_ball, distance_from_center_of_stream = struct.unpack('2i', counter_buffer.read())
         # print(distance_from_ball, distance_from_center_of_stream)
         return str(distance_from_ball)
     #
+    def create_tile_map(self, gl_context: moderngl.Context, tiles_across: int, tiles_high: int, tile_wh: int):
+        # tile slots, plus a tile index (2 bytes) and uniform color (4 bytes) for every tile
+        self.make_room_for_texture(TileMap.TILE_TEXTURES_NAME, (4 * (tile_wh ** 2) * TileMap.INITIAL_SLOTS) + (6 * tiles_across * tiles_high))
+        self.gl_objects_created += 3
+        return TileMap(gl_context, tiles_across, tiles_high, tile_wh, self.texture_registry)
+    #
+    def draw_tile_map(self, Screen: ScreenObject, gl_context: moderngl.Context, tile_map: TileMap, offset_x: int, offset_y: int):
+        # 'tile_map', DrawTileMap
+        # one quad covering the screen; which tile each pixel shows is looked up in the fragment shader
+        tile_map.upload_changes()
+        program = self.programs['tile_map'].program
+        program['aspect'] = Screen.aspect
+        program['screen_wh'] = (Screen.width, Screen.height)
+        program['offset'] = (int(offset_x), int(offset_y))
+        program['tile_wh'] = tile_map.tile_wh
+        program['tiles'] = 0
+        tile_map.tile_index_texture.use(1)
+        program['tile_indexes'] = 1
+        tile_map.uniform_color_texture.use(2)
+        program['uniform_colors'] = 2
+        self._render_quad(gl_context, program, tile_map.tile_textures, -Screen.aspect, 1.0, Screen.aspect, -1.0)
+    #
     @staticmethod
     def clear_buffer(gl_context: moderngl.Context):
         gl_context.clear()
-
-
-class DrawBasicRect():
+    #
+    def begin_pass(self, pass_name: str):
+        # everything drawn until end_pass is timed as pass_name when the gpu profiler is enabled
+        if self.gpu_profiler.enabled:
+            self.flush_batch()
+            self.gpu_profiler.begin(pass_name)
+    #
+    def end_pass(self):
+        if self.gpu_profiler.pass_stack:
+            self.flush_batch()
+            self.gpu_profiler.end()
+    #
+    def begin_panel(self, Screen: ScreenObject, gl_context: moderngl.Context, panel_name: str, ltwh, redraw: bool):
+        # everything drawn until end_panel goes into the panel's texture, which covers ltwh on the screen; anything drawn outside of ltwh is cut off
+        # when redraw is False nothing is drawn and the texture from an earlier frame is used
+        self.flush_batch()
+        left, top = math.floor(ltwh[0]), math.floor(ltwh[1])
+        panel_ltwh = (left, top, max(1, math.ceil(ltwh[0] + ltwh[2]) - left), max(1, math.ceil(ltwh[1] + ltwh[3]) - top))
+        panel = self.panels.get(panel_name)
+        if (panel is None) or (panel[0].size != panel_ltwh[2:]):
+            if panel is not None:
+                panel[1].release()
+                panel[0].release()
+                self.texture_registry.unregister(f"panel_{panel_name}")
+            self.make_room_for_texture(f"panel_{panel_name}", 4 * panel_ltwh[2] * panel_ltwh[3])
+            texture = gl_context.texture(panel_ltwh[2:], 4)
+            panel = self.panels[panel_name] = [texture, gl_context.framebuffer(color_attachments=[texture]), panel_ltwh]
+            self.texture_registry.register(f"panel_{panel_name}", texture, subsystem='panels')
+            self.gl_objects_created += 2
+            redraw = True
+        elif panel[2] != panel_ltwh:
+            # same size in a different place
+            panel[2] = panel_ltwh
+            redraw = True
+        if not redraw:
+            self.drawing_suppressed = True
+            self.panels_reused += 1
+            return
+        # the viewport is the whole screen shifted so the panel's area lands on the texture; panels draw with screen coordinates
+        panel[1].viewport = (-left, top + panel_ltwh[3] - Screen.height, Screen.width, Screen.height)
+        panel[1].use()
+        panel[1].clear(0.0, 0.0, 0.0, 0.0)
+        gl_context.blend_func = RenderObjects._PANEL_BLEND_FUNC
+        self.panels_redrawn += 1
+    #
+    def end_panel(self, Screen: ScreenObject, gl_context: moderngl.Context, panel_name: str):
+        # draw the panel's texture onto its area of the screen as one quad
+        # 'panel', DrawPanel
+        self.flush_batch()
+        self.drawing_suppressed = False
+        Screen.use_framebuffer(gl_context)
+        gl_context.blend_func = RenderObjects._PREMULTIPLIED_BLEND_FUNC
+        program = self.programs['panel'].program
+        program['aspect'] = Screen.aspect
+        texture, _, (left, top, width, height) = self.panels[panel_name]
+        self._render_quad(gl_context, program, texture, (-1.0 + ((2 * left) / Screen.width)) * Screen.aspect, 1.0 - ((2 * top) / Screen.height), (-1.0 + ((2 * (left + width)) / Screen.width)) * Screen.aspect, 1.0 - ((2 * (top + height)) / Screen.height))
+        gl_context.blend_func = RenderObjects._DEFAULT_BLEND_FUNC
+    #
+    def draw_gpu_profile(self, Screen: ScreenObject, gl_context: moderngl.Context, lt: list[int, int], text_pixel_size: int = 2, rgba=COLORS['BLACK']):
+        # one line per pass, slowest first
+        line_height = get_text_height(text_pixel_size) + (2 * text_pixel_size)
+        top = lt[1]
+        for pass_name, milliseconds in sorted(self.gpu_profiler.get_pass_milliseconds().items(), key=lambda pass_time: -pass_time[1]):
+            self.draw_string_of_characters(Screen, gl_context, f"{pass_name}: {milliseconds:.3f} ms", [lt[0], top], text_pixel_size, rgba)
+            top += line_height
+        self.draw_string_of_characters(Screen, gl_context, f"gpu total: {self.gpu_profiler.get_total_milliseconds():.3f} ms", [lt[0], top], text_pixel_size, rgba)
+        # how long the cpu waited on the gpu before presenting, and how evenly frames were presented
+        top += 2 * line_height
+        statistics = self.frame_pacer.get_statistics()
+        for line in [f"strict sync: {'on' if statistics['strict_sync'] else 'off'} ({statistics['frames_in_flight']} frames in flight)",
+                     f"present wait: {statistics['wait_milliseconds']:.3f} ms",
+                     f"present interval: {statistics['mean_present_interval_milliseconds']:.3f} ms (worst {statistics['worst_present_interval_milliseconds']:.3f} ms)",
+                     f"present jitter: {statistics['jitter_milliseconds']:.3f} ms"]:
+            self.draw_string_of_characters(Screen, gl_context, line, [lt[0], top], text_pixel_size, rgba)
+            top += line_height
+    #
+    def end_frame(self):
+        self.gpu_profiler.end_frame()
+        self.draw_calls_last_frame = self.draw_calls
+        self.draw_calls = 0
+        self.batched_quads_last_frame = self.batched_quads
+        self.batched_quads = 0
+        self.uploaded_texture_bytes_last_frame = self.uploaded_texture_bytes
+        self.uploaded_texture_bytes = 0
+        self.gl_objects_created_last_frame = self.gl_objects_created
+        self.gl_objects_created = 0
+        self.panels_redrawn_last_frame = self.panels_redrawn
+        self.panels_redrawn = 0
+        self.panels_reused_last_frame = self.panels_reused
+        self.panels_reused = 0
+
+
+class DrawSpriteBatch():
     def __init__(self, gl_context):
         self.VERTICE_SHADER = '''
         #version 460 core
 
         uniform float aspect;
 
-        in vec2 vert;
-        in vec2 texcoord;
+        in vec2 corner;
+        in vec4 quad;
+        in vec4 uv;
+        in vec4 color;
+        in float rotation;
         out vec2 uvs;
+        out vec4 added_color;
 
         void main() {
-            uvs = texcoord;
+            uvs = mix(uv.xy, uv.zw, corner);
+            added_color = color;
+            vec2 center = vec2(quad.x + (quad.z / 2.0), quad.y - (quad.w / 2.0));
+            vec2 position = vec2(quad.x + (corner.x * quad.z), quad.y - (corner.y * quad.w)) - center;
+            position = center + vec2(
+            (position.x * cos(rotation)) - (position.y * sin(rotation)), 
+            (position.x * sin(rotation)) + (position.y * cos(rotation))
+            );
             gl_Position = vec4(
-            vert.x / aspect, 
-            vert.y, 0.0, 1.0
+            position.x / aspect, 
+            position.y, 0.0, 1.0
             );
         }
         '''
@@ -786,59 +1583,80 @@ class DrawBasicRect():
         uniform sampler2D tex;
 
         in vec2 uvs;
+        in vec4 added_color;
         out vec4 f_color;
 
         void main() {
-            f_color = texture(tex, uvs);
+            f_color = texture(tex, uvs) + added_color;
         }
         '''
         self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
 
 
-class DrawRotationRect():
+class DrawTileBatch():
     def __init__(self, gl_context):
         self.VERTICE_SHADER = '''
         #version 460 core
 
-        uniform float rotation;
-        uniform float offset_x;
-        uniform float offset_y;
         uniform float aspect;
 
-        in vec2 vert;
-        in vec2 texcoord;
+        in vec2 corner;
+        in vec4 quad;
+        in vec4 uv;
+        in vec4 color;
+        in float rotation;
         out vec2 uvs;
+        out vec4 added_color;
 
         void main() {
-            uvs = texcoord;
-            vec2 sample_pos = vec2(
-            offset_x + ((vert.x - offset_x) * cos(rotation)) - ((vert.y - offset_y) * sin(rotation)), 
-            offset_y + ((vert.x - offset_x) * sin(rotation)) + ((vert.y - offset_y) * cos(rotation))
+            uvs = mix(uv.xy, uv.zw, corner);
+            added_color = color;
+            vec2 center = vec2(quad.x + (quad.z / 2.0), quad.y - (quad.w / 2.0));
+            vec2 position = vec2(quad.x + (corner.x * quad.z), quad.y - (corner.y * quad.w)) - center;
+            position = center + vec2(
+            (position.x * cos(rotation)) - (position.y * sin(rotation)), 
+            (position.x * sin(rotation)) + (position.y * cos(rotation))
+            );
+            gl_Position = vec4(
+            position.x / aspect, 
+            position.y, 0.0, 1.0
             );
-            sample_pos.x /= aspect;
-            gl_Position = vec4(sample_pos, 0.0, 1.0);
         }
         '''
         self.FRAGMENT_SHADER = '''
         #version 460 core
 
         uniform sampler2D tex;
+        uniform sampler2D checkerboard;
+        uniform float screen_height;
+        uniform vec2 checkerboard_origin;
+        uniform float square_size;
 
         in vec2 uvs;
+        in vec4 added_color;
         out vec4 f_color;
 
         void main() {
-            f_color = vec4(texture(tex, uvs).rgba);
+            f_color = texture(tex, uvs) + added_color;
+            // the checkerboard texture is only read where the tile is see-through
+            if (f_color.a < 1.0) {
+                vec2 screen_position = vec2(gl_FragCoord.x, screen_height - gl_FragCoord.y) - checkerboard_origin;
+                vec4 checkerboard_color = texture(checkerboard, screen_position / (2.0 * square_size));
+                f_color = vec4(mix(checkerboard_color.rgb, f_color.rgb, f_color.a), 1.0);
+            }
         }
         '''
         self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
 
 
-class DrawBasicRectWithVariableColor():
+class DrawRotationRect():
     def __init__(self, gl_context):
         self.VERTICE_SHADER = '''
         #version 460 core
 
+        uniform float rotation;
+        uniform float offset_x;
+        uniform float offset_y;
         uniform float aspect;
 
         in vec2 vert;
@@ -847,31 +1665,24 @@ class DrawBasicRectWithVariableColor():
 
         void main() {
             uvs = texcoord;
-            gl_Position = vec4(
-            vert.x / aspect, 
-            vert.y, 0.0, 1.0
+            vec2 sample_pos = vec2(
+            offset_x + ((vert.x - offset_x) * cos(rotation)) - ((vert.y - offset_y) * sin(rotation)), 
+            offset_y + ((vert.x - offset_x) * sin(rotation)) + ((vert.y - offset_y) * cos(rotation))
             );
+            sample_pos.x /= aspect;
+            gl_Position = vec4(sample_pos, 0.0, 1.0);
         }
         '''
         self.FRAGMENT_SHADER = '''
         #version 460 core
 
         uniform sampler2D tex;
-        uniform float red;
-        uniform float green;
-        uniform float blue;
-        uniform float alpha;
 
         in vec2 uvs;
         out vec4 f_color;
 
         void main() {
-            f_color = vec4(
-            texture(tex, uvs).r + red, 
-            texture(tex, uvs).g + green, 
-            texture(tex, uvs).b + blue, 
-            texture(tex, uvs).a + alpha
-            );
+            f_color = vec4(texture(tex, uvs).rgba);
         }
         '''
         self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
@@ -920,22 +1731,33 @@ class DrawImageWithColor():
         self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
 
 
-class DrawText():
+class DrawTextBatch():
     def __init__(self, gl_context):
         self.VERTICE_SHADER = '''
         #version 460 core
 
         uniform float aspect;
 
-        in vec2 vert;
-        in vec2 texcoord;
+        in vec2 corner;
+        in vec4 quad;
+        in vec4 uv;
+        in vec4 color;
+        in float rotation;
         out vec2 uvs;
+        out vec4 added_color;
 
         void main() {
-            uvs = texcoord;
+            uvs = mix(uv.xy, uv.zw, corner);
+            added_color = color;
+            vec2 center = vec2(quad.x + (quad.z / 2.0), quad.y - (quad.w / 2.0));
+            vec2 position = vec2(quad.x + (corner.x * quad.z), quad.y - (corner.y * quad.w)) - center;
+            position = center + vec2(
+            (position.x * cos(rotation)) - (position.y * sin(rotation)), 
+            (position.x * sin(rotation)) + (position.y * cos(rotation))
+            );
             gl_Position = vec4(
-            vert.x / aspect, 
-            vert.y, 0.0, 1.0
+            position.x / aspect, 
+            position.y, 0.0, 1.0
             );
         }
         '''
@@ -943,20 +1765,15 @@ class DrawText():
         #version 460 core
 
         uniform sampler2D tex;
-        uniform float red;
-        uniform float green;
-        uniform float blue;
-        uniform float alpha;
 
         in vec2 uvs;
+        in vec4 added_color;
         out vec4 f_color;
 
         void main() {
             f_color = vec4(
-            texture(tex, uvs).r + red, 
-            texture(tex, uvs).g + green, 
-            texture(tex, uvs).b + blue, 
-            texture(tex, uvs).a * alpha
+            texture(tex, uvs).rgb + added_color.rgb, 
+            texture(tex, uvs).a * added_color.a
             );
         }
         '''
@@ -1525,6 +2342,97 @@ class DrawCheckerboard():
         self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
 
 
+class DrawTileMap():
+    def __init__(self, gl_context):
+        self.VERTICE_SHADER = '''
+        #version 460 core
+
+        uniform float aspect;
+
+        in vec2 vert;
+        in vec2 texcoord;
+        out vec2 uvs;
+
+        void main() {
+            uvs = texcoord;
+            gl_Position = vec4(
+            vert.x / aspect, 
+            vert.y, 0.0, 1.0
+            );
+        }
+        '''
+        self.FRAGMENT_SHADER = '''
+        #version 460 core
+
+        uniform sampler2DArray tiles;
+        uniform usampler2D tile_indexes;
+        uniform sampler2D uniform_colors;
+        uniform vec2 screen_wh;
+        uniform ivec2 offset;
+        uniform int tile_wh;
+
+        in vec2 uvs;
+        out vec4 f_color;
+
+        const uint NO_TILE = 0u;
+        const uint UNIFORM_TILE = 65535u;
+
+        void main() {
+            // pixel on the map, then the tile it is in
+            ivec2 map_xy = ivec2(floor(uvs * screen_wh)) - offset;
+            ivec2 tile_xy = map_xy / tile_wh;
+            if (any(lessThan(map_xy, ivec2(0))) || any(greaterThanEqual(tile_xy, textureSize(tile_indexes, 0)))) {
+                discard;
+            }
+            uint tile_index = texelFetch(tile_indexes, tile_xy, 0).r;
+            if (tile_index == NO_TILE) {
+                discard;
+            }
+            if (tile_index == UNIFORM_TILE) {
+                f_color = texelFetch(uniform_colors, tile_xy, 0);
+                return;
+            }
+            f_color = texelFetch(tiles, ivec3(map_xy - (tile_xy * tile_wh), int(tile_index) - 1), 0);
+        }
+        '''
+        self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
+
+
+class DrawPanel():
+    def __init__(self, gl_context):
+        self.VERTICE_SHADER = '''
+        #version 460 core
+
+        uniform float aspect;
+
+        in vec2 vert;
+        in vec2 texcoord;
+        out vec2 uvs;
+
+        void main() {
+            uvs = texcoord;
+            gl_Position = vec4(
+            vert.x / aspect, 
+            vert.y, 0.0, 1.0
+            );
+        }
+        '''
+        self.FRAGMENT_SHADER = '''
+        #version 460 core
+
+        uniform sampler2D tex;
+
+        in vec2 uvs;
+        out vec4 f_color;
+
+        void main() {
+            // framebuffer textures are stored bottom to top; the color is already premultiplied
+            f_color = texture(tex, vec2(uvs.x, 1.0 - uvs.y));
+        }
+        '''
+        self.program = gl_context.program(vertex_shader = self.VERTICE_SHADER, fragment_shader = self.FRAGMENT_SHADER)
+
+
 class DrawInvertWhite():
     def __init__(self, gl_context):
         self.VERTICE_SHADER = '''
@@ -0,0 +1,124 @@
+import os
+import json
+import pygame
+from Code.utilities import get_time
+from Code.application_setup import KeysClass, TimingClass, StartupTimer
+from Code.application_loop import application_frame
+
+
+class ScriptedKeyState():
+    # stands in for pygame.key.get_pressed(); indexed by pygame key constants
+    def __init__(self):
+        self.pressed: set[int] = set()
+    #
+    def __getitem__(self, key: int):
+        return key in self.pressed
+
+
+class ScriptedKeysClass(KeysClass):
+    # input read from a script instead of the keyboard and mouse
+    # [{"frame": 0, "keys": ["d", "space"], "mouse": [500, 300], "buttons": [1, 0, 0], "scroll": [0, -1]}, ...]
+    # keys, mouse and buttons stay as set until a later step changes them; scroll only lasts for the frame of its step
+    # key names are pygame key names (pygame.key.key_code)
+    FRAME = 'frame'
+    KEYS = 'keys'
+    MOUSE = 'mouse'
+    BUTTONS = 'buttons'
+    SCROLL = 'scroll'
+
+    def __init__(self, script: list[dict] | None = None):
+        super().__init__()
+        self.steps: dict[int, dict] = {step[ScriptedKeysClass.FRAME]: step for step in (script or [])}
+        self.frame: int = 0
+        self.key_state: ScriptedKeyState = ScriptedKeyState()
+        self.keys = self.key_state
+        self.left_click, self.middle_click, self.right_click = False, False, False
+        self.mouse_x_pos, self.mouse_y_pos = 0, 0
+        self.update_io_and_analog = self.update_script
+    #
+    @staticmethod
+    def load_script(script_path: str):
+        with open(script_path, 'r', encoding='utf-8') as json_file:
+            return json.load(json_file)
+    #
+    def update_script(self, Api):
+        step = self.steps.get(self.frame)
+        Api.scroll_x, Api.scroll_y = 0, 0
+        if step is not None:
+            if ScriptedKeysClass.KEYS in step:
+                self.key_state.pressed = {pygame.key.key_code(key_name) for key_name in step[ScriptedKeysClass.KEYS]}
+            if ScriptedKeysClass.MOUSE in step:
+                self.mouse_x_pos, self.mouse_y_pos = step[ScriptedKeysClass.MOUSE]
+            if ScriptedKeysClass.BUTTONS in step:
+                self.left_click, self.middle_click, self.right_click = [bool(button) for button in step[ScriptedKeysClass.BUTTONS]]
+            if ScriptedKeysClass.SCROLL in step:
+                Api.scroll_x, Api.scroll_y = step[ScriptedKeysClass.SCROLL]
+        self.scroll_x, self.scroll_y = Api.scroll_x, Api.scroll_y
+        self.frame += 1
+    #
+    def any_key_pressed(self):
+        return bool(self.key_state.pressed)
+
+
+class FixedTimingClass(TimingClass):
+    # every frame takes exactly one frame at DESIRED_FPS, so runs are repeatable and never wait on a clock
+    def __init__(self):
+        super().__init__()
+        self.delta_time = 1 / TimingClass.DESIRED_FPS
+    #
+    def update(self):
+        self.delta_time = 1 / TimingClass.DESIRED_FPS
+        self.fps = TimingClass.DESIRED_FPS
+
+
+def get_frame_time_statistics(frame_times: list[float]):
+    # frame_times in seconds
+    sorted_frame_times = sorted(frame_times)
+    percentile = lambda fraction: sorted_frame_times[min(len(sorted_frame_times) - 1, int(fraction * len(sorted_frame_times)))] * 1000
+    return {'frames': len(frame_times),
+            'total_seconds': sum(frame_times),
+            'mean_milliseconds': (sum(frame_times) / len(frame_times)) * 1000,
+            'median_milliseconds': percentile(0.5),
+            'p95_milliseconds': percentile(0.95),
+            'p99_milliseconds': percentile(0.99),
+            'max_milliseconds': sorted_frame_times[-1] * 1000}
+
+
+def run_headless(Api, PATH: str, Screen, gl_context, Render, Time, Keys, Cursor, frames: int, output_path: str, capture_every: int = 0, Startup: StartupTimer | None = None):
+    # run the application for a number of frames and write frame time statistics (and captures every capture_every frames) to output_path
+    os.makedirs(output_path, exist_ok=True)
+    # every frame is finished before the next one starts so frame times include the gpu
+    Render.frame_pacer.strict_sync = True
+    # every frame is drawn so runs measure the same work
+    Api.idle_frames.enabled = False
+    frame_times = []
+    # gl objects (textures, buffers, vertex arrays, ...) created each frame; scrolling a level should settle at none
+    gl_objects_created = []
+    for frame in range(frames):
+        if (capture_every > 0) and ((frame % capture_every) == 0):
+            Screen.capture_path = os.path.join(output_path, f"frame_{frame:05d}.png")
+        frame_start = get_time()
+        application_frame(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor)
+        frame_times.append(get_time() - frame_start)
+        gl_objects_created.append(Render.gl_objects_created_last_frame)
+        if (Startup is not None) and (not Startup.reported):
+            Startup.mark('first frame')
+            Startup.report(Render)
+        Time.update()
+    statistics = get_frame_time_statistics(frame_times)
+    statistics['api'] = Api.current_api
+    statistics['screen_wh'] = [Screen.width, Screen.height]
+    statistics['frame_milliseconds'] = [frame_time * 1000 for frame_time in frame_times]
+    statistics['gl_objects_created'] = gl_objects_created
+    # frames since the last one that created a gl object
+    statistics['frames_without_gl_allocations'] = len(gl_objects_created) - max([frame for frame, created in enumerate(gl_objects_created) if created > 0], default=-1) - 1
+    statistics['texture_pool'] = Render.texture_pool.get_statistics()
+    statistics['texture_registry'] = Render.texture_registry.get_statistics()
+    statistics['frame_pacing'] = Render.frame_pacer.get_statistics()
+    with open(os.path.join(output_path, 'frame_times.json'), 'w', encoding='utf-8') as json_file:
+        json.dump(statistics, json_file, indent=4)
+    for key in ['frames', 'mean_milliseconds', 'median_milliseconds', 'p95_milliseconds', 'p99_milliseconds', 'max_milliseconds', 'frames_without_gl_allocations']:
+        print(f"{key + ':':<24}{statistics[key]:.3f}" if isinstance(statistics[key], float) else f"{key + ':':<24}{statistics[key]}")
+    Render.texture_registry.report()
+    Api.quit()
+    return statistics
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import struct
+import logging
+import threading
+from Code.tile_codec import TileCodec
+from Code.tile_blob_store import TileBlobStore
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LevelManifest():
+    # describes a level so it can be opened without scanning its directory
+    # manifest.json is a small header:
+    # {
+    #     "version": 4,
+    #     "tile_wh": 256,
+    #     "tiles_across": 46,
+    #     "tiles_high": 23,
+    #     "map_wh": [11776, 5888],
+    #     "lod_levels": 3
+    # }
+    # manifest.tiles has one fixed size record per tile, ordered by (index_x * tiles_high) + index_y like the level pack's offset table
+    #  _________________________________________________________________________________________________
+    # | flags | encoding | uniform red, green, blue, alpha, collision | bytes | pretty hash | collision hash |
+    #  ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾
+    # uniform tiles are the same color and collision everywhere; they never need to be read from disk
+    # blob tiles are stored once in the shared TileBlobStore instead of in the level
+    # "lod_levels" is how many downsampled levels of the level have been built (see LevelOfDetail in the editor)
+    FILE_NAME = 'manifest.json'
+    TILES_FILE_NAME = 'manifest.tiles'
+    TEMPORARY_EXTENSION = '.tmp'
+    VERSION = 4
+    MIN_TIME_BETWEEN_SAVES = 1.0  # s
+
+    _READ = 'r'
+    _WRITE = 'w'
+    _READ_BYTES = 'rb'
+    _WRITE_BYTES = 'wb'
+    _ENSURE_ASCII = False
+    _INDENT = 4
+    _ENCODING = 'utf-8'
+
+    # flags, encoding, uniform, bytes, pretty hash, collision hash
+    _TILE_FORMAT = f'<BB5sxI{TileBlobStore.HASH_DIGEST_SIZE}s{TileBlobStore.HASH_DIGEST_SIZE}s'
+    _TILE_SIZE = struct.calcsize(_TILE_FORMAT)
+    _EXISTS = 1
+    _IS_UNIFORM = 2
+    _IS_BLOB = 4
+
+    # per-tile metadata keys
+    ENCODING = 'encoding'
+    BYTES = 'bytes'
+    UNIFORM = 'uniform'
+    PRETTY_HASH = 'pretty_hash'
+    COLLISION_HASH = 'collision_hash'
+    BLOB = 'blob'
+    UNIFORM_ALPHA_INDEX = 3
+    UNIFORM_COLLISION_INDEX = 4
+
+    def __init__(self, level_path: str, tile_wh: int, tiles_across: int, tiles_high: int, tile_records: bytearray | None = None, lod_levels: int = 0):
+        self.path: str = f"{level_path}{LevelManifest.FILE_NAME}"
+        self.tiles_path: str = f"{level_path}{LevelManifest.TILES_FILE_NAME}"
+        self.tile_wh: int = tile_wh
+        self.tiles_across: int = tiles_across
+        self.tiles_high: int = tiles_high
+        self.map_wh: list[int, int] = [tiles_across * tile_wh, tiles_high * tile_wh]
+        self.tile_records: bytearray = bytearray(tiles_across * tiles_high * LevelManifest._TILE_SIZE) if tile_records is None else tile_records
+        self.lod_levels: int = lod_levels
+        self.changed: bool = False
+        self.last_save_time: float = 0.0
+        # the editor saves from the tile writer's thread and from the gl thread
+        self.save_lock: threading.Lock = threading.Lock()
+    #
+    @staticmethod
+    def open(level_path: str, level_pack=None, writable: bool = False):
+        # read the manifest; levels saved before manifests existed get one created
+        # only a writable manifest is saved when it had to be created, so opening a level in the game never changes it
+        # reading every tile to create a manifest is slow, so a read-only manifest is only the header and its tiles have no metadata
+        manifest_path = f"{level_path}{LevelManifest.FILE_NAME}"
+        tiles_path = f"{level_path}{LevelManifest.TILES_FILE_NAME}"
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, LevelManifest._READ, encoding=LevelManifest._ENCODING) as json_file:
+                data = json.load(json_file)
+            if data['version'] > LevelManifest.VERSION:
+                raise ValueError(f"{manifest_path} is version {data['version']}; expected version {LevelManifest.VERSION} or lower")
+            # older manifests are missing metadata, so they are recreated below
+            if (data['version'] == LevelManifest.VERSION) and os.path.isfile(tiles_path):
+                with open(tiles_path, LevelManifest._READ_BYTES) as file:
+                    tile_records = bytearray(file.read())
+                if len(tile_records) == (data['tiles_across'] * data['tiles_high'] * LevelManifest._TILE_SIZE):
+                    return LevelManifest(level_path, data['tile_wh'], data['tiles_across'], data['tiles_high'], tile_records, data.get('lod_levels', 0))
+        if not writable:
+            LOGGER.info("%s has no manifest; opening it without tile metadata", level_path)
+            return LevelManifest.create(level_path, level_pack, scan_tiles=False)
+        LOGGER.warning("%s has no manifest; creating one by reading every tile", level_path)
+        manifest = LevelManifest.create(level_path, level_pack)
+        manifest.save()
+        return manifest
+    #
+    @staticmethod
+    def create(level_path: str, level_pack=None, scan_tiles: bool = True):
+        # without scan_tiles only the level's size is found; every tile record is left empty
+        if level_pack is not None:
+            manifest = LevelManifest(level_path, level_pack.tile_wh, level_pack.tiles_across, level_pack.tiles_high)
+            for index_x in range(manifest.tiles_across if scan_tiles else 0):
+                for index_y in range(manifest.tiles_high):
+                    if level_pack.has_tile(index_x, index_y):
+                        manifest.update_tile(index_x, index_y, level_pack.get_tile(index_x, index_y))
+        else:
+            tile_paths = {}
+            for directory_entry in os.scandir(level_path):
+                indexes = directory_entry.name[1:].split('_')
+                # other files in the level (images, text files) are skipped
+                if (not directory_entry.name.startswith('t')) or (len(indexes) != 2) or not all(index.isdigit() for index in indexes):
+                    continue
+                index_x, index_y = [int(index) for index in indexes]
+                tile_paths[(index_x, index_y)] = directory_entry.path
+            tiles_across = max((index_x + 1 for index_x, _ in tile_paths), default=0)
+            tiles_high = max((index_y + 1 for _, index_y in tile_paths), default=0)
+            manifest = LevelManifest(level_path, TileCodec.TILE_WH, tiles_across, tiles_high)
+            for (index_x, index_y), tile_path in (tile_paths.items() if scan_tiles else []):
+                with open(tile_path, LevelManifest._READ_BYTES) as file:
+                    manifest.update_tile(index_x, index_y, file.read())
+        manifest.changed = False
+        return manifest
+    #
+    def _get_record_offset(self, index_x: int, index_y: int):
+        return ((index_x * self.tiles_high) + index_y) * LevelManifest._TILE_SIZE
+    #
+    def update_tile(self, index_x: int, index_y: int, tile_bytes, pretty_bytearray=None, collision_bytearray=None):
+        if pretty_bytearray is None:
+            pretty_bytearray, collision_bytearray = TileCodec.decode(tile_bytes)
+        uniform = TileCodec.get_uniform(pretty_bytearray, collision_bytearray)
+        # a newly saved tile is always stored in its own level, so it is never a blob
+        flags = LevelManifest._EXISTS | (0 if uniform is None else LevelManifest._IS_UNIFORM)
+        struct.pack_into(LevelManifest._TILE_FORMAT, self.tile_records, self._get_record_offset(index_x, index_y),
+                         flags,
+                         TileCodec.get_version(tile_bytes),
+                         bytes(uniform or ()),
+                         len(tile_bytes),
+                         bytes.fromhex(TileBlobStore.hash_map(pretty_bytearray)),
+                         bytes.fromhex(TileBlobStore.hash_map(collision_bytearray)))
+        self.changed = True
+    #
+    def set_blob(self, index_x: int, index_y: int, pretty_hash: str, collision_hash: str):
+        record_offset = self._get_record_offset(index_x, index_y)
+        flags, encoding, uniform, tile_bytes, _, _ = struct.unpack_from(LevelManifest._TILE_FORMAT, self.tile_records, record_offset)
+        struct.pack_into(LevelManifest._TILE_FORMAT, self.tile_records, record_offset, flags | LevelManifest._IS_BLOB, encoding, uniform, tile_bytes, bytes.fromhex(pretty_hash), bytes.fromhex(collision_hash))
+        self.changed = True
+    #
+    def get_tile_indexes(self):
+        # (index_x, index_y) of every tile the level has
+        for record_offset in range(0, len(self.tile_records), LevelManifest._TILE_SIZE):
+            if self.tile_records[record_offset] & LevelManifest._EXISTS:
+                yield divmod(record_offset // LevelManifest._TILE_SIZE, self.tiles_high)
+    #
+    def get_tile(self, index_x: int, index_y: int):
+        if not ((0 <= index_x < self.tiles_across) and (0 <= index_y < self.tiles_high)):
+            return None
+        flags, encoding, uniform, tile_bytes, pretty_hash, collision_hash = struct.unpack_from(LevelManifest._TILE_FORMAT, self.tile_records, self._get_record_offset(index_x, index_y))
+        if not flags & LevelManifest._EXISTS:
+            return None
+        return {LevelManifest.ENCODING: encoding,
+                LevelManifest.BYTES: tile_bytes,
+                LevelManifest.UNIFORM: list(uniform) if flags & LevelManifest._IS_UNIFORM else None,
+                LevelManifest.PRETTY_HASH: pretty_hash.hex(),
+                LevelManifest.COLLISION_HASH: collision_hash.hex(),
+                LevelManifest.BLOB: bool(flags & LevelManifest._IS_BLOB)}
+    #
+    def get_uniform(self, index_x: int, index_y: int):
+        if not ((0 <= index_x < self.tiles_across) and (0 <= index_y < self.tiles_high)):
+            return None
+        record_offset = self._get_record_offset(index_x, index_y)
+        if not (self.tile_records[record_offset] & LevelManifest._IS_UNIFORM):
+            return None
+        return list(self.tile_records[record_offset + 2:record_offset + 7])
+    #
+    def save_if_changed(self):
+        if self.changed and ((time.perf_counter() - self.last_save_time) >= LevelManifest.MIN_TIME_BETWEEN_SAVES):
+            self.save()
+    #
+    def save(self):
+        data = {'version': LevelManifest.VERSION,
+                'tile_wh': self.tile_wh,
+                'tiles_across': self.tiles_across,
+                'tiles_high': self.tiles_high,
+                'map_wh': self.map_wh,
+                'lod_levels': self.lod_levels}
+        # write to temporary files first so a crash never leaves a partial manifest
+        with self.save_lock:
+            temporary_path = f"{self.tiles_path}{LevelManifest.TEMPORARY_EXTENSION}"
+            with open(temporary_path, LevelManifest._WRITE_BYTES) as file:
+                file.write(self.tile_records)
+            os.replace(temporary_path, self.tiles_path)
+            temporary_path = f"{self.path}{LevelManifest.TEMPORARY_EXTENSION}"
+            with open(temporary_path, LevelManifest._WRITE, encoding=LevelManifest._ENCODING) as json_file:
+                json.dump(data, json_file, ensure_ascii=LevelManifest._ENSURE_ASCII, indent=LevelManifest._INDENT)
+            os.replace(temporary_path, self.path)
+            self.changed = False
+            self.last_save_time = time.perf_counter()
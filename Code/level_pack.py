@@ -0,0 +1,231 @@
+import os
+import mmap
+import struct
+import threading
+from array import array
+from Code.tile_codec import TileCodec
+
+
+class LevelPack():
+    # a level pack is a single file holding every tile of a level
+    #  ______________________________________________
+    # | header | offset table | tile | tile | ... |
+    #  ‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾‾
+    # the offset table has one (offset, length) pair per tile, ordered by (index_x * tiles_high) + index_y
+    # a tile with a length of 0 does not exist in the pack
+    # tiles may be raw or compressed (see TileCodec)
+    # an edited tile is written to an unused slot or the end of the pack, then its offset and length are published together,
+    # so a crash leaves either the old or the new tile in the table; the old slot is reused once the table has been flushed
+    # slots left unused by edits and deduplication are dropped by compact
+    # reading and writing may happen on different threads
+    FILE_NAME = 'level.pack'
+    TEMPORARY_EXTENSION = '.tmp'
+    MAGIC = b'HBBL'
+    VERSION = 1
+
+    # magic, version, tile width/height, tile count, tiles across, tiles high, map width, map height
+    _HEADER_FORMAT = '<4sIIIIIII'
+    _HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+    _OFFSET_TABLE_FORMAT = 'Q'
+    _OFFSET_TABLE_VALUE_SIZE = struct.calcsize(_OFFSET_TABLE_FORMAT)
+    _OFFSET_TABLE_ENTRY_SIZE = 2 * _OFFSET_TABLE_VALUE_SIZE
+    # offset and length in the offset table's native byte order
+    _OFFSET_TABLE_ENTRY_FORMAT = '=QQ'
+    # the file grows by at least this fraction when a tile does not fit, so the pack is rarely mapped again
+    _GROWTH = 0.25
+
+    _READ = 'rb'
+    _READ_WRITE = 'r+b'
+    _WRITE = 'wb'
+
+    def __init__(self, level_path: str, writable: bool = False):
+        self.path: str = f"{level_path}{LevelPack.FILE_NAME}"
+        self.writable: bool = writable
+        self.file_reference = open(self.path, mode=LevelPack._READ_WRITE if writable else LevelPack._READ)
+        self.mmap: mmap.mmap = mmap.mmap(self.file_reference.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        self.view: memoryview = memoryview(self.mmap)
+        magic, version, self.tile_wh, self.tile_count, self.tiles_across, self.tiles_high, map_width, map_height = struct.unpack_from(LevelPack._HEADER_FORMAT, self.mmap, 0)
+        if (magic != LevelPack.MAGIC) or (version != LevelPack.VERSION):
+            raise ValueError(f"{self.path} is not a version {LevelPack.VERSION} level pack")
+        self.map_wh: array[int, int] = array('i', [map_width, map_height])
+        # the offset table is read in place so opening a level does not depend on the number of tiles
+        self.offset_table: memoryview = self._get_offset_table()
+        # only needed when writing; calculated on the first write
+        # table index: (offset, capacity)
+        self.slots: dict[int, tuple[int, int]] | None = None
+        # (offset, capacity) of slots no tile uses; freed slots can be reused once the table no longer pointing at them is flushed
+        self.free_slots: list[tuple[int, int]] = []
+        self.freed_slots: list[tuple[int, int]] = []
+        self.end_offset: int = 0
+        # mappings replaced after the pack grew; closed once no tile holds a slice of them
+        self.retired_mmaps: list = []
+        self.lock: threading.Lock = threading.Lock()
+    #
+    def _get_offset_table(self):
+        return self.view[LevelPack._HEADER_SIZE:LevelPack._HEADER_SIZE + (self.tiles_across * self.tiles_high * LevelPack._OFFSET_TABLE_ENTRY_SIZE)].cast(LevelPack._OFFSET_TABLE_FORMAT)
+    #
+    @staticmethod
+    def open(level_path: str, writable: bool = False):
+        # returns None when the level has not been packed
+        if not os.path.isfile(f"{level_path}{LevelPack.FILE_NAME}"):
+            return None
+        return LevelPack(level_path, writable)
+    #
+    def has_tile(self, index_x: int, index_y: int):
+        if not ((0 <= index_x < self.tiles_across) and (0 <= index_y < self.tiles_high)):
+            return False
+        return self.offset_table[(((index_x * self.tiles_high) + index_y) * 2) + 1] > 0
+    #
+    def get_tile(self, index_x: int, index_y: int):
+        # zero-copy slice of the tile's bytes
+        table_index = ((index_x * self.tiles_high) + index_y) * 2
+        with self.lock:
+            offset = self.offset_table[table_index]
+            return self.view[offset:offset + self.offset_table[table_index + 1]]
+    #
+    def write_tile(self, index_x: int, index_y: int, tile_bytes):
+        # the tile never overwrites the tile it replaces
+        with self.lock:
+            if self.slots is None:
+                self._calculate_slots()
+            table_index = ((index_x * self.tiles_high) + index_y) * 2
+            offset, capacity = self._allocate_slot(len(tile_bytes))
+            self.view[offset:offset + len(tile_bytes)] = tile_bytes
+            # publish the offset and length with one 16 byte store so the entry is never half written
+            entry_offset = LevelPack._HEADER_SIZE + (table_index * LevelPack._OFFSET_TABLE_VALUE_SIZE)
+            self.view[entry_offset:entry_offset + LevelPack._OFFSET_TABLE_ENTRY_SIZE] = struct.pack(LevelPack._OFFSET_TABLE_ENTRY_FORMAT, offset, len(tile_bytes))
+            old_slot = self.slots.get(table_index)
+            if old_slot is not None:
+                self.freed_slots.append(old_slot)
+            self.slots[table_index] = (offset, capacity)
+    #
+    def _calculate_slots(self):
+        # a slot reaches up to the start of the next tile in the file
+        slots = sorted((self.offset_table[table_index], table_index) for table_index in range(0, len(self.offset_table), 2) if self.offset_table[table_index + 1] > 0)
+        self.slots = {}
+        for slot_index, (offset, table_index) in enumerate(slots):
+            next_offset = slots[slot_index + 1][0] if (slot_index + 1) < len(slots) else (offset + self.offset_table[table_index + 1])
+            self.slots[table_index] = (offset, next_offset - offset)
+        self.end_offset = (slots[-1][0] + self.offset_table[slots[-1][1] + 1]) if slots else (LevelPack._HEADER_SIZE + self.offset_table.nbytes)
+    #
+    def _allocate_slot(self, length: int):
+        # reuse the smallest unused slot the tile fits in, otherwise add a slot at the end of the pack
+        fitting_slots = [slot for slot in self.free_slots if slot[1] >= length]
+        if fitting_slots:
+            slot = min(fitting_slots, key=lambda slot: slot[1])
+            self.free_slots.remove(slot)
+            return slot
+        offset = self.end_offset
+        self.end_offset += length
+        if self.end_offset > len(self.mmap):
+            self._grow(self.end_offset)
+        return offset, length
+    #
+    def _grow(self, minimum_size: int):
+        self.mmap.flush()
+        self.file_reference.truncate(max(minimum_size, int(len(self.mmap) * (1 + LevelPack._GROWTH))))
+        # map the grown file; the old mapping stays open until no tile holds a slice of it
+        self.retired_mmaps.append((self.mmap, self.view, self.offset_table))
+        self.mmap = mmap.mmap(self.file_reference.fileno(), 0, access=mmap.ACCESS_WRITE)
+        self.view = memoryview(self.mmap)
+        self.offset_table = self._get_offset_table()
+        self._release_retired_mmaps()
+    #
+    def _release_retired_mmaps(self):
+        still_used_mmaps = []
+        for retired_mmap, retired_view, retired_offset_table in self.retired_mmaps:
+            try:
+                retired_offset_table.release()
+                retired_view.release()
+                retired_mmap.close()
+            except BufferError:
+                # a tile still holds a slice of this mapping
+                still_used_mmaps.append((retired_mmap, retired_view, retired_offset_table))
+        self.retired_mmaps = still_used_mmaps
+    #
+    def get_unused_bytes(self):
+        # bytes that compact would free
+        with self.lock:
+            if self.slots is None:
+                self._calculate_slots()
+            used_bytes = LevelPack._HEADER_SIZE + self.offset_table.nbytes + sum(self.offset_table[table_index + 1] for table_index in range(0, len(self.offset_table), 2))
+            return len(self.mmap) - used_bytes
+    #
+    def flush(self):
+        if self.writable:
+            with self.lock:
+                self.mmap.flush()
+                # the flushed table no longer points at freed slots, so they can be reused
+                self.free_slots.extend(self.freed_slots)
+                self.freed_slots = []
+                self._release_retired_mmaps()
+    #
+    def close(self):
+        self._release_retired_mmaps()
+        self.offset_table.release()
+        self.view.release()
+        self.mmap.close()
+        self.file_reference.close()
+    #
+    @staticmethod
+    def build(level_path: str, tile_wh: int = 256, compress: bool = False, level_manifest=None):
+        # pack the loose t{x}_{y} tile files of a level into a single level pack
+        # tiles the level manifest marks as uniform or blob are left out since they are never read from the pack
+        tile_paths = {}
+        for file_name in os.listdir(level_path):
+            if (not file_name.startswith('t')) or ('.' in file_name):
+                continue
+            index_x, index_y = file_name[1:].split('_')
+            tile_paths[(int(index_x), int(index_y))] = f"{level_path}{file_name}"
+        tiles_across = max(index_x for index_x, _ in tile_paths) + 1
+        tiles_high = max(index_y for _, index_y in tile_paths) + 1
+        def read_tile(index_x: int, index_y: int):
+            if (index_x, index_y) not in tile_paths:
+                return None
+            with open(tile_paths[(index_x, index_y)], LevelPack._READ) as tile_file:
+                tile_bytes = tile_file.read()
+            return TileCodec.encode(*TileCodec.decode(tile_bytes)) if compress else tile_bytes
+        temporary_path = LevelPack._write(level_path, tile_wh, tiles_across, tiles_high, read_tile, level_manifest)
+        # replace the old pack only once the new one is complete
+        os.replace(temporary_path, f"{level_path}{LevelPack.FILE_NAME}")
+    #
+    @staticmethod
+    def compact(level_path: str, level_manifest=None):
+        # rewrite the pack without the slots left unused by edits; tiles the level manifest marks as uniform or blob are dropped too
+        # the pack must not be open anywhere else
+        level_pack = LevelPack(level_path)
+        temporary_path = LevelPack._write(level_path, level_pack.tile_wh, level_pack.tiles_across, level_pack.tiles_high, lambda index_x, index_y: bytes(level_pack.get_tile(index_x, index_y)) if level_pack.has_tile(index_x, index_y) else None, level_manifest)
+        bytes_freed = len(level_pack.mmap) - os.path.getsize(temporary_path)
+        level_pack.close()
+        os.replace(temporary_path, f"{level_path}{LevelPack.FILE_NAME}")
+        return bytes_freed
+    #
+    @staticmethod
+    def _write(level_path: str, tile_wh: int, tiles_across: int, tiles_high: int, read_tile, level_manifest=None):
+        # writes a new pack to a temporary file and returns its path; read_tile(index_x, index_y) returns the tile's bytes or None
+        offset_table = array(LevelPack._OFFSET_TABLE_FORMAT, [0]) * (tiles_across * tiles_high * 2)
+        offset = LevelPack._HEADER_SIZE + (tiles_across * tiles_high * LevelPack._OFFSET_TABLE_ENTRY_SIZE)
+        temporary_path = f"{level_path}{LevelPack.FILE_NAME}{LevelPack.TEMPORARY_EXTENSION}"
+        tile_count = 0
+        with open(temporary_path, LevelPack._WRITE) as file:
+            file.seek(offset)
+            for index_x in range(tiles_across):
+                for index_y in range(tiles_high):
+                    if level_manifest is not None:
+                        tile_metadata = level_manifest.get_tile(index_x, index_y)
+                        if (tile_metadata is not None) and ((tile_metadata[level_manifest.UNIFORM] is not None) or tile_metadata[level_manifest.BLOB]):
+                            continue
+                    tile_bytes = read_tile(index_x, index_y)
+                    if tile_bytes is None:
+                        continue
+                    table_index = ((index_x * tiles_high) + index_y) * 2
+                    offset_table[table_index] = offset
+                    offset_table[table_index + 1] = len(tile_bytes)
+                    file.write(tile_bytes)
+                    offset += len(tile_bytes)
+                    tile_count += 1
+            header = struct.pack(LevelPack._HEADER_FORMAT, LevelPack.MAGIC, LevelPack.VERSION, tile_wh, tile_count, tiles_across, tiles_high, tiles_across * tile_wh, tiles_high * tile_wh)
+            file.seek(0)
+            file.write(header)
+            file.write(offset_table.tobytes())
+        return temporary_path
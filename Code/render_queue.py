@@ -0,0 +1,76 @@
+from operator import attrgetter
+
+
+class RenderCommand():
+    __slots__ = ('sort_key', 'render_function_reference', 'kwargs')
+
+    def __init__(self):
+        self.sort_key: int = RenderQueue.UNUSED_SORT_KEY
+        self.render_function_reference = None
+        self.kwargs: dict | None = None
+
+
+class RenderQueue():
+    # draws that are made after everything else in a frame
+    # commands are sorted by (layer, program, texture) so draws of the same kind end up next to each other and can be batched
+    # lower layers are drawn first; within the same layer, program and texture, commands are drawn in the order they were added
+    # the command records are allocated once and reused every frame
+    CAPACITY = 256
+    DEFAULT_LAYER = 0
+    UNUSED_SORT_KEY = 1 << 64
+
+    # sort key bits; layer | program | texture | order added
+    _LAYER_SHIFT = 48
+    _PROGRAM_SHIFT = 32
+    _TEXTURE_SHIFT = 16
+    _ID_MASK = 0xFFFF
+    _GET_SORT_KEY = attrgetter('sort_key')
+
+    def __init__(self, capacity: int = CAPACITY):
+        self.commands: list[RenderCommand] = [RenderCommand() for _ in range(capacity)]
+        self.command_count: int = 0
+        # render function or texture name: small number used in sort keys
+        self.program_ids: dict = {}
+        self.texture_ids: dict = {None: 0}
+        # statistics
+        self.commands_last_frame: int = 0
+        self.program_changes_last_frame: int = 0
+    #
+    def add(self, layer: int, render_function_reference, kwargs: dict):
+        # render_function_reference is a RenderObjects draw method; it is called with (Screen, gl_context, **kwargs)
+        if self.command_count == len(self.commands):
+            # only happens until the queue is big enough for the busiest frame
+            self.commands.extend(RenderCommand() for _ in range(len(self.commands)))
+        render_function = getattr(render_function_reference, '__func__', render_function_reference)
+        program_id = self.program_ids.get(render_function)
+        if program_id is None:
+            program_id = self.program_ids[render_function] = len(self.program_ids)
+        texture_name = kwargs.get('object_name')
+        texture_id = self.texture_ids.get(texture_name)
+        if texture_id is None:
+            texture_id = self.texture_ids[texture_name] = len(self.texture_ids)
+        command = self.commands[self.command_count]
+        command.sort_key = (layer << RenderQueue._LAYER_SHIFT) | (program_id << RenderQueue._PROGRAM_SHIFT) | (texture_id << RenderQueue._TEXTURE_SHIFT) | self.command_count
+        command.render_function_reference = render_function_reference
+        command.kwargs = kwargs
+        self.command_count += 1
+    #
+    def draw(self, Screen, gl_context):
+        # unused commands have the largest sort key so they stay at the end
+        if self.command_count > 1:
+            self.commands.sort(key=RenderQueue._GET_SORT_KEY)
+        program_changes = 0
+        last_program_id = -1
+        for command_index in range(self.command_count):
+            command = self.commands[command_index]
+            program_id = (command.sort_key >> RenderQueue._PROGRAM_SHIFT) & RenderQueue._ID_MASK
+            if program_id != last_program_id:
+                program_changes += 1
+                last_program_id = program_id
+            command.render_function_reference(Screen, gl_context, **command.kwargs)
+            command.sort_key = RenderQueue.UNUSED_SORT_KEY
+            command.render_function_reference = None
+            command.kwargs = None
+        self.commands_last_frame = self.command_count
+        self.program_changes_last_frame = program_changes
+        self.command_count = 0
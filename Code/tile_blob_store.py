@@ -0,0 +1,88 @@
+import os
+import hashlib
+from Code.tile_codec import TileCodec
+
+
+class TileBlobStore():
+    # identical tiles from every level of every project are stored once, named by the hashes of their pretty and collision maps
+    # Projects\blobs\{pretty_hash}_{collision_hash}
+    DIRECTORY_NAME = 'blobs'
+    TEMPORARY_EXTENSION = '.tmp'
+    HASH_DIGEST_SIZE = 16
+
+    _READ = 'rb'
+    _WRITE = 'wb'
+
+    def __init__(self, store_path: str):
+        self.store_path: str = store_path
+    #
+    @staticmethod
+    def get_store_path(level_path: str):
+        # levels are in Projects\{project}\{level}\, so the store is Projects\blobs\
+        separator = '\\' if '\\' in level_path else '/'
+        projects_path = level_path.rstrip(separator).rsplit(separator, 2)[0]
+        return f"{projects_path}{separator}{TileBlobStore.DIRECTORY_NAME}{separator}"
+    #
+    @staticmethod
+    def hash_map(map_bytearray):
+        return hashlib.blake2b(map_bytearray, digest_size=TileBlobStore.HASH_DIGEST_SIZE).hexdigest()
+    #
+    def get_blob_path(self, pretty_hash: str, collision_hash: str):
+        return f"{self.store_path}{pretty_hash}_{collision_hash}"
+    #
+    def has_blob(self, pretty_hash: str, collision_hash: str):
+        return os.path.isfile(self.get_blob_path(pretty_hash, collision_hash))
+    #
+    def read_blob(self, pretty_hash: str, collision_hash: str):
+        with open(self.get_blob_path(pretty_hash, collision_hash), TileBlobStore._READ) as file:
+            return file.read()
+    #
+    def write_blob(self, pretty_hash: str, collision_hash: str, tile_bytes):
+        # blobs never change once written; returns whether a new blob was written
+        if self.has_blob(pretty_hash, collision_hash):
+            return False
+        os.makedirs(self.store_path, exist_ok=True)
+        blob_path = self.get_blob_path(pretty_hash, collision_hash)
+        temporary_path = f"{blob_path}{TileBlobStore.TEMPORARY_EXTENSION}"
+        with open(temporary_path, TileBlobStore._WRITE) as file:
+            file.write(tile_bytes)
+        os.replace(temporary_path, blob_path)
+        return True
+    #
+    def deduplicate_level(self, level_path: str, level_manifest, compress: bool = True, level_pack=None):
+        # move the tiles of a level into the blob store; tiles that already have a blob cost no extra disk space
+        # uniform tiles are skipped since they are never read
+        # loose tiles are removed; a packed tile's slot is left unused until the pack is compacted
+        moved_tile_paths = []
+        tiles_moved = 0
+        blobs_written = 0
+        bytes_freed = 0
+        for index_x, index_y in level_manifest.get_tile_indexes():
+            tile_metadata = level_manifest.get_tile(index_x, index_y)
+            tile_path = f"{level_path}t{index_x}_{index_y}"
+            if (tile_metadata[level_manifest.UNIFORM] is not None) or tile_metadata[level_manifest.BLOB]:
+                continue
+            if (level_pack is not None) and level_pack.has_tile(index_x, index_y):
+                tile_bytes = bytes(level_pack.get_tile(index_x, index_y))
+                tile_path = None
+            elif os.path.isfile(tile_path):
+                with open(tile_path, TileBlobStore._READ) as file:
+                    tile_bytes = file.read()
+            else:
+                continue
+            pretty_bytearray, collision_bytearray = TileCodec.decode(tile_bytes)
+            pretty_hash, collision_hash = TileBlobStore.hash_map(pretty_bytearray), TileBlobStore.hash_map(collision_bytearray)
+            blob_bytes = TileCodec.encode(pretty_bytearray, collision_bytearray, compress)
+            if self.write_blob(pretty_hash, collision_hash, blob_bytes):
+                blobs_written += 1
+                bytes_freed -= len(blob_bytes)
+            level_manifest.set_blob(index_x, index_y, pretty_hash, collision_hash)
+            tiles_moved += 1
+            if tile_path is not None:
+                moved_tile_paths.append(tile_path)
+                bytes_freed += len(tile_bytes)
+        # the manifest is saved before the loose tiles are removed so every tile can always be found
+        level_manifest.save()
+        for tile_path in moved_tile_paths:
+            os.remove(tile_path)
+        return tiles_moved, blobs_written, bytes_freed
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+
+
+class TileResidencyCache():
+    # keeps loaded tiles (cpu byte arrays and gpu textures) resident after they leave the view
+    # least recently used tiles are unloaded once the byte budget is exceeded
+    DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+    # hysteresis; once over budget, evict down to this fraction of the budget so eviction does not run every frame
+    LOW_WATER_FRACTION = 0.75
+
+    _RESIDENT_BYTES = 0
+    _LAST_USED_FRAME = 1
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes: int = budget_bytes
+        self.low_water_bytes: int = int(budget_bytes * TileResidencyCache.LOW_WATER_FRACTION)
+        # tile: [resident_bytes, last_used_frame]; ordered from least to most recently used
+        self.resident_tiles: OrderedDict = OrderedDict()
+        self.resident_bytes: int = 0
+        self.last_requested_frame: dict = {}
+        self.frame: int = 0
+        # statistics
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.evicted_bytes: int = 0
+    #
+    def add(self, tile):
+        # called when a tile finishes loading
+        if tile in self.resident_tiles:
+            self.resident_tiles.move_to_end(tile)
+            self.resident_tiles[tile][TileResidencyCache._LAST_USED_FRAME] = self.frame
+            return
+        resident_bytes = tile.get_resident_bytes()
+        self.resident_tiles[tile] = [resident_bytes, self.frame]
+        self.resident_bytes += resident_bytes
+    #
+    def discard(self, tile):
+        # called when a tile is unloaded
+        entry = self.resident_tiles.pop(tile, None)
+        if entry is not None:
+            self.resident_bytes -= entry[TileResidencyCache._RESIDENT_BYTES]
+    #
+    def request(self, tile):
+        # called every frame for every tile in view; a tile coming back into view is a hit if it is still resident
+        newly_requested = self.last_requested_frame.get(tile, -2) < (self.frame - 1)
+        self.last_requested_frame[tile] = self.frame
+        if tile in self.resident_tiles:
+            self.resident_tiles.move_to_end(tile)
+            self.resident_tiles[tile][TileResidencyCache._LAST_USED_FRAME] = self.frame
+            if newly_requested:
+                self.hits += 1
+            return True
+        if newly_requested:
+            self.misses += 1
+        return False
+    #
+    def end_frame(self, render_instance):
+        if self.resident_bytes > self.budget_bytes:
+            self._evict(render_instance)
+        self.frame += 1
+    #
+    def _evict(self, render_instance):
+        while self.resident_bytes > self.low_water_bytes:
+            if self._evict_least_recently_used(render_instance) == 0:
+                return
+    #
+    def evict_bytes(self, render_instance, evict_bytes: int):
+        # called when a new texture would go over the gpu texture budget (see RenderObjects.make_room_for_texture)
+        evicted_bytes = 0
+        while evicted_bytes < evict_bytes:
+            resident_bytes = self._evict_least_recently_used(render_instance)
+            if resident_bytes == 0:
+                break
+            evicted_bytes += resident_bytes
+        return evicted_bytes
+    #
+    def _evict_least_recently_used(self, render_instance):
+        # returns the evicted tile's bytes, or 0 when every remaining tile was used this frame
+        if not self.resident_tiles:
+            return 0
+        tile, (resident_bytes, last_used_frame) = next(iter(self.resident_tiles.items()))
+        if last_used_frame == self.frame:
+            return 0
+        self.discard(tile)
+        tile.unload(render_instance)
+        self.evictions += 1
+        self.evicted_bytes += resident_bytes
+        return resident_bytes
+    #
+    def get_hit_rate(self):
+        return self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 1.0
+    #
+    def get_statistics(self):
+        return {'resident_tiles': len(self.resident_tiles),
+                'resident_bytes': self.resident_bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.get_hit_rate(),
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes}
@@ -0,0 +1,113 @@
+import re
+import sys
+import time
+import zlib
+import struct
+
+
+class TileCodec():
+    # tiles are stored in one of two layouts
+    # raw (version 0):        pretty map (256*256*4) | newline | collision map (256*256)
+    # compressed (version 1): header | zlib pretty map | run-length encoded collision map
+    # a tile is raw exactly when it is RAW_TILE_BYTES long; compressed tiles are only written when they are smaller
+    TILE_WH = 256
+    PRETTY_MAP_BYTES_PER_TILE = TILE_WH * TILE_WH * 4
+    COLLISION_MAP_BYTES_PER_TILE = TILE_WH * TILE_WH * 1
+    NEWLINE = b'\n'
+    RAW_TILE_BYTES = PRETTY_MAP_BYTES_PER_TILE + len(NEWLINE) + COLLISION_MAP_BYTES_PER_TILE
+
+    MAGIC = b'HBBT'
+    VERSION_RAW = 0
+    VERSION_COMPRESSED = 1
+    ZLIB_LEVEL = 6
+
+    # magic, version, compressed pretty map length, encoded collision map length
+    _HEADER_FORMAT = '<4sBxxxII'
+    _HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+    # run length, collision value
+    _RUN_FORMAT = '<IB'
+    _RUN = re.compile(rb'(.)\1*', re.DOTALL)
+    # raised by decode for a damaged or truncated tile
+    DECODE_ERRORS = (ValueError, zlib.error, struct.error)
+
+    @staticmethod
+    def get_version(tile_bytes):
+        return TileCodec.VERSION_RAW if len(tile_bytes) == TileCodec.RAW_TILE_BYTES else struct.unpack_from(TileCodec._HEADER_FORMAT, tile_bytes, 0)[1]
+
+    @staticmethod
+    def decode(tile_bytes):
+        # returns (pretty map, collision map); raw tiles are returned as zero-copy slices
+        if len(tile_bytes) == TileCodec.RAW_TILE_BYTES:
+            tile_view = memoryview(tile_bytes)
+            return tile_view[:TileCodec.PRETTY_MAP_BYTES_PER_TILE], tile_view[TileCodec.PRETTY_MAP_BYTES_PER_TILE + len(TileCodec.NEWLINE):]
+        magic, version, pretty_length, collision_length = struct.unpack_from(TileCodec._HEADER_FORMAT, tile_bytes, 0)
+        if (magic != TileCodec.MAGIC) or (version != TileCodec.VERSION_COMPRESSED):
+            raise ValueError(f"unknown tile encoding (magic={magic}, version={version})")
+        pretty_start = TileCodec._HEADER_SIZE
+        collision_start = pretty_start + pretty_length
+        pretty_bytearray = zlib.decompress(tile_bytes[pretty_start:collision_start])
+        collision_bytearray = TileCodec._run_length_decode(tile_bytes[collision_start:collision_start + collision_length])
+        return pretty_bytearray, collision_bytearray
+
+    @staticmethod
+    def get_uniform(pretty_bytearray, collision_bytearray):
+        # returns [red, green, blue, alpha, collision] when every pixel of the tile is the same, otherwise None
+        if (bytes(pretty_bytearray[:4]) * (len(pretty_bytearray) // 4) != pretty_bytearray) or (bytes(collision_bytearray[:1]) * len(collision_bytearray) != collision_bytearray):
+            return None
+        return [*pretty_bytearray[:4], collision_bytearray[0]]
+
+    @staticmethod
+    def encode(pretty_bytearray, collision_bytearray, compress: bool = True):
+        # falls back to the raw layout when compression does not make the tile smaller
+        raw_tile = bytes(pretty_bytearray) + TileCodec.NEWLINE + bytes(collision_bytearray)
+        if not compress:
+            return raw_tile
+        compressed_pretty = zlib.compress(pretty_bytearray, TileCodec.ZLIB_LEVEL)
+        encoded_collision = TileCodec._run_length_encode(collision_bytearray)
+        compressed_tile = struct.pack(TileCodec._HEADER_FORMAT, TileCodec.MAGIC, TileCodec.VERSION_COMPRESSED, len(compressed_pretty), len(encoded_collision)) + compressed_pretty + encoded_collision
+        return compressed_tile if len(compressed_tile) < TileCodec.RAW_TILE_BYTES else raw_tile
+
+    @staticmethod
+    def _run_length_encode(collision_bytearray):
+        return b''.join([struct.pack(TileCodec._RUN_FORMAT, run.end() - run.start(), run.group(1)[0]) for run in TileCodec._RUN.finditer(bytes(collision_bytearray))])
+
+    @staticmethod
+    def _run_length_decode(encoded_collision):
+        return b''.join([bytes((value,)) * run_length for run_length, value in struct.iter_unpack(TileCodec._RUN_FORMAT, encoded_collision)])
+
+
+def benchmark(level_path: str, repeats: int = 3):
+    # compares reading raw tiles from disk against reading and decoding compressed tiles
+    # usage: python -m Code.tile_codec <level_path>
+    import os
+    tile_paths = [f"{level_path}{file_name}" for file_name in os.listdir(level_path) if file_name.startswith('t') and ('.' not in file_name)]
+    raw_tiles = []
+    for tile_path in tile_paths:
+        with open(tile_path, 'rb') as file:
+            raw_tiles.append(file.read())
+    compressed_tiles = [TileCodec.encode(*TileCodec.decode(raw_tile)) for raw_tile in raw_tiles]
+    raw_bytes = sum(len(raw_tile) for raw_tile in raw_tiles)
+    compressed_bytes = sum(len(compressed_tile) for compressed_tile in compressed_tiles)
+    # raw read (the files are in the page cache after the first pass)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for tile_path in tile_paths:
+            with open(tile_path, 'rb') as file:
+                TileCodec.decode(file.read())
+    raw_read_time = (time.perf_counter() - start) / (repeats * len(tile_paths))
+    # decode only
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for compressed_tile in compressed_tiles:
+            TileCodec.decode(compressed_tile)
+    decode_time = (time.perf_counter() - start) / (repeats * len(compressed_tiles))
+    print(f"tiles:                 {len(tile_paths)}")
+    print(f"raw size:              {raw_bytes / (1024 ** 2):.1f} MB")
+    print(f"compressed size:       {compressed_bytes / (1024 ** 2):.1f} MB ({100 * compressed_bytes / raw_bytes:.1f}%)")
+    print(f"raw read per tile:     {raw_read_time * 1000:.3f} ms")
+    print(f"decode per tile:       {decode_time * 1000:.3f} ms")
+    return {'tiles': len(tile_paths), 'raw_bytes': raw_bytes, 'compressed_bytes': compressed_bytes, 'raw_read_time': raw_read_time, 'decode_time': decode_time}
+
+
+if __name__ == '__main__':
+    benchmark(sys.argv[1])
@@ -0,0 +1,152 @@
+import os
+import time
+import queue
+import logging
+import threading
+from Code.tile_codec import TileCodec
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TileWriter():
+    # write-behind saving of edited tiles
+    # editing a tile only marks it dirty; flushing copies the maps of every dirty tile and hands them to a background thread
+    # a tile edited on many frames is written once per flush
+    # loose tiles are written to a temporary file and renamed, and tiles in a level pack are written to an unused slot before the offset table is switched,
+    # so a crash never leaves a partly written tile
+    # a tile that fails to write keeps its copy in pending maps and is written again on the next flush
+    TEMPORARY_EXTENSION = '.tmp'
+
+    _WRITE = 'wb'
+    _STOP = None
+
+    def __init__(self, level_path: str, level_pack=None, level_manifest=None, compress: bool = True):
+        self.level_path: str = level_path
+        self.level_pack = level_pack
+        self.level_manifest = level_manifest
+        self.compress: bool = compress
+        # (column, row): tile
+        self.dirty_tiles: dict[tuple[int, int], object] = {}
+        # (column, row): (pretty map, collision map); copies that are flushed but not written yet
+        self.pending_maps: dict[tuple[int, int], tuple[bytes, bytes]] = {}
+        # (column, row): (pretty map, collision map); copies that failed to write
+        self.failed_maps: dict[tuple[int, int], tuple[bytes, bytes]] = {}
+        self.lock: threading.Lock = threading.Lock()
+        self.write_queue: queue.Queue = queue.Queue()
+        self.thread: threading.Thread = threading.Thread(target=self._write_batches, daemon=True)
+        self.thread.start()
+        self.last_flush_time: float = time.perf_counter()
+        # statistics
+        self.edits: int = 0
+        self.flushes: int = 0
+        self.tiles_written: int = 0
+        self.bytes_written: int = 0
+        self.write_errors: int = 0
+    #
+    def mark_dirty(self, tile):
+        self.dirty_tiles[(tile.column, tile.row)] = tile
+        self.edits += 1
+    #
+    def is_dirty(self, tile):
+        return (tile.column, tile.row) in self.dirty_tiles
+    #
+    def get_time_since_flush(self):
+        return time.perf_counter() - self.last_flush_time
+    #
+    def flush(self):
+        self.last_flush_time = time.perf_counter()
+        with self.lock:
+            # retry tiles that failed to write; a newer copy from a dirty tile replaces them
+            batch = self.failed_maps
+            self.failed_maps = {}
+        if not self.dirty_tiles and not batch:
+            return
+        self._enqueue(list(self.dirty_tiles.values()), batch)
+        self.dirty_tiles = {}
+    #
+    def flush_tile(self, tile):
+        # used when a dirty tile is about to be unloaded
+        if self.dirty_tiles.pop((tile.column, tile.row), None) is not None:
+            self._enqueue([tile], {})
+    #
+    def _enqueue(self, tiles: list, batch: dict):
+        for tile in tiles:
+            pretty_bytearray, collision_bytearray = tile.read_maps()
+            batch[(tile.column, tile.row)] = (bytes(pretty_bytearray), bytes(collision_bytearray))
+        with self.lock:
+            self.pending_maps.update(batch)
+        self.write_queue.put(batch)
+        self.flushes += 1
+    #
+    def get_pending_maps(self, column: int, row: int):
+        # a tile that is reloaded before it was written must use the copy waiting to be written
+        with self.lock:
+            return self.pending_maps.get((column, row))
+    #
+    def close(self):
+        # write everything that was flushed and stop the background thread; returns the tiles that could not be written
+        self.flush()
+        self.write_queue.put(TileWriter._STOP)
+        self.thread.join()
+        with self.lock:
+            unwritten_tiles = sorted(self.pending_maps)
+        if unwritten_tiles:
+            LOGGER.error("%d edited tiles could not be written to %s: %s", len(unwritten_tiles), self.level_path, ', '.join(f"t{column}_{row}" for column, row in unwritten_tiles))
+        return unwritten_tiles
+    #
+    def _write_batches(self):
+        while True:
+            batch = self.write_queue.get()
+            if batch is TileWriter._STOP:
+                return
+            for (column, row), maps in batch.items():
+                try:
+                    self._write_tile(column, row, *maps)
+                except Exception:
+                    LOGGER.exception("could not write tile %d_%d", column, row)
+                    self.write_errors += 1
+                    with self.lock:
+                        # keep the copy pending so reloads still see the edit
+                        if self.pending_maps.get((column, row)) is maps:
+                            self.failed_maps[(column, row)] = maps
+                    continue
+                with self.lock:
+                    # a newer copy of the tile may have been flushed in the meantime
+                    if self.pending_maps.get((column, row)) is maps:
+                        del self.pending_maps[(column, row)]
+            try:
+                if self.level_pack is not None:
+                    self.level_pack.flush()
+                if self.level_manifest is not None:
+                    with self.lock:
+                        self.level_manifest.save()
+            except Exception:
+                LOGGER.exception("could not save the tile index of %s", self.level_path)
+                self.write_errors += 1
+    #
+    def _write_tile(self, column: int, row: int, pretty_bytearray: bytes, collision_bytearray: bytes):
+        tile_bytes = TileCodec.encode(pretty_bytearray, collision_bytearray, self.compress)
+        if self.level_pack is not None:
+            self.level_pack.write_tile(column, row, tile_bytes)
+        else:
+            tile_path = f"{self.level_path}t{column}_{row}"
+            temporary_path = f"{tile_path}{TileWriter.TEMPORARY_EXTENSION}"
+            with open(temporary_path, TileWriter._WRITE) as file:
+                file.write(tile_bytes)
+            os.replace(temporary_path, tile_path)
+        if self.level_manifest is not None:
+            with self.lock:
+                # also records whether the tile is uniform
+                self.level_manifest.update_tile(column, row, tile_bytes, pretty_bytearray, collision_bytearray)
+        self.tiles_written += 1
+        self.bytes_written += len(tile_bytes)
+    #
+    def get_statistics(self):
+        return {'edits': self.edits,
+                'flushes': self.flushes,
+                'dirty_tiles': len(self.dirty_tiles),
+                'pending_tiles': len(self.pending_maps),
+                'tiles_written': self.tiles_written,
+                'bytes_written': self.bytes_written,
+                'write_errors': self.write_errors}
@@ -11,6 +11,9 @@ import math
 
 
 MAX_PYGAME_COLOR = 255
+PROJECTS_FOLDER = 'Projects'
+DEFAULT_PROJECT = 'Project1'
+DEFAULT_LEVEL = 'Level1'
 ONE_FRAME_AT_60_FPS = 1 / 60
 OFF_SCREEN = -99999
 FILE_TYPES = {
@@ -213,6 +216,11 @@ COLORS = {
     }
 
 
+def get_level_path(level: str, project: str = DEFAULT_PROJECT):
+    # level folders end with a separator; tile files are appended directly to the path
+    return os.path.join(PATH, PROJECTS_FOLDER, project, level, '')
+
+
 def get_text_height(text_pixel_size: (int | float)):
     return text_pixel_size * 7
 
@@ -248,142 +256,145 @@ LOADED_IN_MENU = 'LOADED_IN_MENU'
 IMAGE_PATHS = {
     # key: [Bool, path, draw_function_key]; 'always' to not unload image
     # blank images
-    ' ': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\blanks\\blank_character.png'],
+    ' ': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'blanks', 'blank_character.png')],
     # pixels
-    'black_pixel': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\pixels\\black_pixel.png'],
-    'blank_pixel': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\pixels\\blank_pixel.png'],
-    'white_pixel': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\pixels\\white_pixel.png'],
+    'black_pixel': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'pixels', 'black_pixel.png')],
+    'blank_pixel': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'pixels', 'blank_pixel.png')],
+    'white_pixel': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'pixels', 'white_pixel.png')],
     # lower case letters
-    'a': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\a.png'],
-    'b': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\b.png'],
-    'c': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\c.png'],
-    'd': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\d.png'],
-    'e': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\e.png'],
-    'f': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\f.png'],
-    'g': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\g.png'],
-    'h': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\h.png'],
-    'i': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\i.png'],
-    'j': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\j.png'],
-    'k': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\k.png'],
-    'l': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\l.png'],
-    'm': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\m.png'],
-    'n': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\n.png'],
-    'o': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\o.png'],
-    'p': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\p.png'],
-    'q': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\q.png'],
-    'r': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\r.png'],
-    's': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\s.png'],
-    't': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\t.png'],
-    'u': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\u.png'],
-    'v': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\v.png'],
-    'w': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\w.png'],
-    'x': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\x.png'],
-    'y': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\y.png'],
-    'z': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\lower_case\\z.png'],
+    'a': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'a.png')],
+    'b': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'b.png')],
+    'c': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'c.png')],
+    'd': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'd.png')],
+    'e': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'e.png')],
+    'f': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'f.png')],
+    'g': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'g.png')],
+    'h': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'h.png')],
+    'i': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'i.png')],
+    'j': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'j.png')],
+    'k': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'k.png')],
+    'l': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'l.png')],
+    'm': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'm.png')],
+    'n': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'n.png')],
+    'o': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'o.png')],
+    'p': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'p.png')],
+    'q': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'q.png')],
+    'r': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'r.png')],
+    's': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 's.png')],
+    't': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 't.png')],
+    'u': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'u.png')],
+    'v': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'v.png')],
+    'w': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'w.png')],
+    'x': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'x.png')],
+    'y': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'y.png')],
+    'z': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'lower_case', 'z.png')],
     # upper case letters
-    'A': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\a.png'],
-    'B': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\b.png'],
-    'C': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\c.png'],
-    'D': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\d.png'],
-    'E': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\e.png'],
-    'F': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\f.png'],
-    'G': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\g.png'],
-    'H': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\h.png'],
-    'I': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\i.png'],
-    'J': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\j.png'],
-    'K': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\k.png'],
-    'L': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\l.png'],
-    'M': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\m.png'],
-    'N': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\n.png'],
-    'O': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\o.png'],
-    'P': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\p.png'],
-    'Q': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\q.png'],
-    'R': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\r.png'],
-    'S': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\s.png'],
-    'T': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\t.png'],
-    'U': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\u.png'],
-    'V': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\v.png'],
-    'W': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\w.png'],
-    'X': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\x.png'],
-    'Y': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\y.png'],
-    'Z': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\upper_case\\z.png'],
+    'A': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'a.png')],
+    'B': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'b.png')],
+    'C': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'c.png')],
+    'D': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'd.png')],
+    'E': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'e.png')],
+    'F': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'f.png')],
+    'G': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'g.png')],
+    'H': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'h.png')],
+    'I': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'i.png')],
+    'J': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'j.png')],
+    'K': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'k.png')],
+    'L': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'l.png')],
+    'M': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'm.png')],
+    'N': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'n.png')],
+    'O': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'o.png')],
+    'P': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'p.png')],
+    'Q': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'q.png')],
+    'R': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'r.png')],
+    'S': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 's.png')],
+    'T': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 't.png')],
+    'U': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'u.png')],
+    'V': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'v.png')],
+    'W': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'w.png')],
+    'X': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'x.png')],
+    'Y': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'y.png')],
+    'Z': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'upper_case', 'z.png')],
     # numbers
-    '0': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n0.png'],
-    '1': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n1.png'],
-    '2': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n2.png'],
-    '3': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n3.png'],
-    '4': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n4.png'],
-    '5': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n5.png'],
-    '6': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n6.png'],
-    '7': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n7.png'],
-    '8': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n8.png'],
-    '9': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\numbers\\n9.png'],
+    '0': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n0.png')],
+    '1': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n1.png')],
+    '2': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n2.png')],
+    '3': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n3.png')],
+    '4': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n4.png')],
+    '5': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n5.png')],
+    '6': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n6.png')],
+    '7': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n7.png')],
+    '8': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n8.png')],
+    '9': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'numbers', 'n9.png')],
     # symbols
-    "'": [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\apostraphe.png'],
-    '*': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\asterisk.png'],
-    '^': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\circumflex.png'],
-    ':': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\colon.png'],
-    ',': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\comma.png'],
-    '=': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\equals.png'],
-    '!': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\explanation.png'],
-    '>': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\greater_than.png'],
-    '[': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\left_bracket.png'],
-    '(': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\left_parentheses.png'],
-    '<': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\less_than.png'],
-    '-': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\minus.png'],
-    '×': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\multiplication.png'],
-    '.': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\period.png'],
-    '+': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\plus.png'],
-    '?': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\question.png'],
-    '"': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\quote.png'],
-    ']': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\right_bracket.png'],
-    ')': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\right_parentheses.png'],
-    ';': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\semi_colon.png'],
-    '_': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\underscore.png'],
-    '%': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\percent.png'],
-    '#': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\pound.png'],
-    '\\': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\back_slash.png'],
-    '/': [[ALWAYS_LOADED], PATH + '\\Images\\always_loaded\\symbols\\forward_slash.png'],
+    "'": [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'apostraphe.png')],
+    '*': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'asterisk.png')],
+    '^': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'circumflex.png')],
+    ':': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'colon.png')],
+    ',': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'comma.png')],
+    '=': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'equals.png')],
+    '!': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'explanation.png')],
+    '>': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'greater_than.png')],
+    '[': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'left_bracket.png')],
+    '(': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'left_parentheses.png')],
+    '<': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'less_than.png')],
+    '-': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'minus.png')],
+    '×': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'multiplication.png')],
+    '.': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'period.png')],
+    '+': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'plus.png')],
+    '?': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'question.png')],
+    '"': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'quote.png')],
+    ']': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'right_bracket.png')],
+    ')': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'right_parentheses.png')],
+    ';': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'semi_colon.png')],
+    '_': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'underscore.png')],
+    '%': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'percent.png')],
+    '#': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'pound.png')],
+    '\\': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'back_slash.png')],
+    '/': [[ALWAYS_LOADED], os.path.join(PATH, 'Images', 'always_loaded', 'symbols', 'forward_slash.png')],
     # editor cursors
-    'cursor_arrow': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_arrow.png'],
-    'cursor_crosshair': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_crosshair.png'],
-    'cursor_big_crosshair': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_big_crosshair.png'],
-    'cursor_nesw': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_nesw.png'],
-    'cursor_eyedrop': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_eyedrop.png'],
-    'cursor_i_beam': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_i_beam.png'],
-    'cursor_dot': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\cursors\\cursor_dot.png'],
+    'cursor_arrow': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_arrow.png')],
+    'cursor_crosshair': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_crosshair.png')],
+    'cursor_big_crosshair': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_big_crosshair.png')],
+    'cursor_nesw': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_nesw.png')],
+    'cursor_eyedrop': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_eyedrop.png')],
+    'cursor_i_beam': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_i_beam.png')],
+    'cursor_dot': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'cursor_dot.png')],
     # common
-    'editor_circle': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\common\\circle.png'],
-    'level_dimensions': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\common\\level_dimensions.png'],
+    'editor_circle': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'common', 'circle.png')],
+    'level_dimensions': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'common', 'level_dimensions.png')],
     # editor tools on right side of screen
-    'Marquee rectangle': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Marquee rectangle.png'],
-    'Lasso':             [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Lasso.png'],
-    'Pencil':            [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Pencil.png'],
-    'Eraser':            [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Eraser.png'],
-    'Spray':             [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Spray.png'],
-    'Hand':              [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Hand.png'],
-    'Bucket':            [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Bucket.png'],
-    'Line':              [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Line.png'],
-    'Curvy line':        [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Curvy line.png'],
-    'Empty rectangle':   [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Empty rectangle.png'],
-    'Blur':              [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Blur.png'],
-    'Jumble':            [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Jumble.png'],
-    'Eyedropper':        [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tools\\Eyedropper.png'],
+    'Marquee rectangle': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Marquee rectangle.png')],
+    'Lasso':             [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Lasso.png')],
+    'Pencil':            [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Pencil.png')],
+    'Eraser':            [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Eraser.png')],
+    'Spray':             [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Spray.png')],
+    'Hand':              [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Hand.png')],
+    'Bucket':            [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Bucket.png')],
+    'Line':              [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Line.png')],
+    'Curvy line':        [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Curvy line.png')],
+    'Empty rectangle':   [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Empty rectangle.png')],
+    'Blur':              [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Blur.png')],
+    'Jumble':            [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Jumble.png')],
+    'Eyedropper':        [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tools', 'Eyedropper.png')],
     # tool attributes
-    'tool_attribute_outline': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tool_attributes\\tool_attribute_outline.png'],
-    'tool_attribute_clock': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\tool_attributes\\clock.png'],
+    'tool_attribute_outline': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tool_attributes', 'tool_attribute_outline.png')],
+    'tool_attribute_clock': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'tool_attributes', 'clock.png')],
     # editor modes
-    'pretty_mode': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\modes\\pretty_mode.png'],
-    'collision_mode': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\modes\\collision_mode.png'],
-    'draw_mode': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\modes\\draw_mode.png'],
-    'block_mode': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\modes\\block_mode.png'],
-    'object_mode': [[LOADED_IN_EDITOR], PATH + '\\Images\\not_always_loaded\\editor\\modes\\object_mode.png'],
+    'pretty_mode': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'modes', 'pretty_mode.png')],
+    'collision_mode': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'modes', 'collision_mode.png')],
+    'draw_mode': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'modes', 'draw_mode.png')],
+    'block_mode': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'modes', 'block_mode.png')],
+    'object_mode': [[LOADED_IN_EDITOR], os.path.join(PATH, 'Images', 'not_always_loaded', 'editor', 'modes', 'object_mode.png')],
     # test
     # 'map': [[LOADED_IN_EDITOR], 'C:\\Users\\Kayle\\Desktop\\OLD_HAMSTER\\HAMSTER_BALL_BLITZ\\data\\Images\\Forest\\Forest1.png']
     # player
-    'player_ball_front': [[LOADED_IN_GAME], PATH + '\\Images\\not_always_loaded\\game\\player\\ball_front.png'],
-    'classic_spout': [[LOADED_IN_GAME], PATH + '\\Images\\not_always_loaded\\game\\player\\classic_spout.png'],
+    'player_ball_front': [[LOADED_IN_GAME], os.path.join(PATH, 'Images', 'not_always_loaded', 'game', 'player', 'ball_front.png')],
+    'classic_spout': [[LOADED_IN_GAME], os.path.join(PATH, 'Images', 'not_always_loaded', 'game', 'player', 'classic_spout.png')],
     # game cursors
-    'classic_cursor1': [[LOADED_IN_GAME], PATH + '\\Images\\not_always_loaded\\cursors\\classic_cursor1.png'],
-    'classic_cursor2': [[LOADED_IN_GAME], PATH + '\\Images\\not_always_loaded\\cursors\\classic_cursor2.png'],
-}
\ No newline at end of file
+    'classic_cursor1': [[LOADED_IN_GAME], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'classic_cursor1.png')],
+    'classic_cursor2': [[LOADED_IN_GAME], os.path.join(PATH, 'Images', 'not_always_loaded', 'cursors', 'classic_cursor2.png')],
+}
+
+# characters drawn as text; these are packed into the glyph atlas (see RenderObjects.build_glyph_atlas)
+TEXT_CHARACTERS = ' abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789\'*^:,=!>[(<-×.+?"]);_%#\\/'
\ No newline at end of file
@@ -0,0 +1,100 @@
+if __name__ == '__main__':
+    # time the numpy ball collision sampler against reading the collision map pixel by pixel
+    # python CollisionBenchmark.py --samples 2000
+    import os
+    import math
+    import random
+    import argparse
+    from types import SimpleNamespace
+    PATH = os.getcwd()
+    #
+    # arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    # the player's inner ball is 69 pixels across; the outer ball is one pixel further out on every side
+    parser.add_argument('--ball-diameter', type=int, default=69)
+    arguments = parser.parse_args()
+    #
+    from Code.utilities import get_time, atan2
+    from Code.Game.game_utilities import Map, BallCollisionMask, BallCollisionSampler
+    #
+    def get_ring_collision_data(diameter: int, offset: int):
+        # the edge pixels of a disc with their angles from its center, laid out like Player's ball collision data
+        radius = diameter / 2
+        def in_disc(index_x: int, index_y: int):
+            return (0 <= index_x < diameter) and (0 <= index_y < diameter) and ((((index_x + 0.5 - radius) ** 2) + ((index_y + 0.5 - radius) ** 2)) <= (radius ** 2))
+        collision_data = {}
+        for index_x in range(diameter):
+            for index_y in range(diameter):
+                if in_disc(index_x, index_y) and not all(in_disc(index_x + step_x, index_y + step_y) for step_x, step_y in [(-1, 0), (1, 0), (0, -1), (0, 1)]):
+                    angle_from_center = atan2((index_x + 0.5 - radius), -(index_y + 0.5 - radius))
+                    collision_data[(index_x + offset, index_y + offset)] = (angle_from_center, math.cos(math.radians(angle_from_center)), math.sin(math.radians(angle_from_center)))
+        return collision_data
+    #
+    def get_ball_collisions_per_pixel(map_object, x_pos: int, y_pos: int, collision_data):
+        # how the collision map was read before BallCollisionSampler
+        number_of_collisions = 0
+        cumulative_x = 0
+        cumulative_y = 0
+        for (offset_x, offset_y), (_, cos_angle, sin_angle) in collision_data.items():
+            tile_x, pixel_x = divmod(x_pos+offset_x, Map.TILE_WH)
+            tile_y, pixel_y = divmod(y_pos+offset_y, Map.TILE_WH)
+            pixel_collision = map_object.tiles[tile_x][tile_y].collision_bytearray[(pixel_y * Map.TILE_WH) + pixel_x]
+            if (pixel_collision == Map.COLLISION) or (pixel_collision == Map.GRAPPLEABLE):
+                cumulative_x += cos_angle
+                cumulative_y += sin_angle
+                number_of_collisions += 1
+        return number_of_collisions, cumulative_x, cumulative_y
+    #
+    # a 4x4 tile map with a slope across it and scattered collision pixels
+    random.seed(arguments.seed)
+    tiles_across, tiles_high = 4, 4
+    map_wh = tiles_across * Map.TILE_WH
+    collision_map = bytearray(map_wh * map_wh)
+    for x in range(map_wh):
+        ground = (map_wh // 2) + int((x - (map_wh // 2)) * 0.4)
+        for y in range(ground, map_wh):
+            collision_map[(y * map_wh) + x] = Map.COLLISION
+    for _ in range(map_wh * 8):
+        collision_map[random.randrange(map_wh * map_wh)] = random.choice([Map.NO_COLLISION, Map.COLLISION, Map.GRAPPLEABLE])
+    tiles = []
+    for index_x in range(tiles_across):
+        tiles.append([])
+        for index_y in range(tiles_high):
+            tile_rows = []
+            for row in range(Map.TILE_WH):
+                row_start = (((index_y * Map.TILE_WH) + row) * map_wh) + (index_x * Map.TILE_WH)
+                tile_rows.append(collision_map[row_start:row_start + Map.TILE_WH])
+            tiles[index_x].append(SimpleNamespace(collision_bytearray=bytes(b''.join(tile_rows))))
+    map_object = SimpleNamespace(tiles=tiles)
+    #
+    # ball masks shaped like the player's, made without loading the player
+    inner_ball_collision_data = get_ring_collision_data(arguments.ball_diameter, 0)
+    outer_ball_collision_data = get_ring_collision_data(arguments.ball_diameter + 2, -1)
+    #
+    # ball positions follow a random walk, like the steps of a moving ball
+    positions = []
+    x_pos, y_pos = map_wh // 2, map_wh // 2
+    for _ in range(arguments.samples):
+        x_pos = min(max(x_pos + random.randint(-3, 3), 2), map_wh - arguments.ball_diameter - 2)
+        y_pos = min(max(y_pos + random.randint(-3, 3), 2), map_wh - arguments.ball_diameter - 2)
+        positions.append((x_pos, y_pos))
+    #
+    for mask_name, collision_data in [('inner', inner_ball_collision_data), ('outer', outer_ball_collision_data)]:
+        mask = BallCollisionMask(collision_data)
+        start_time = get_time()
+        per_pixel_results = [get_ball_collisions_per_pixel(map_object, x_pos, y_pos, collision_data) for x_pos, y_pos in positions]
+        per_pixel_seconds = get_time() - start_time
+        sampler = BallCollisionSampler()
+        start_time = get_time()
+        sampler_results = [sampler.sample(map_object, x_pos, y_pos, mask)[1:] for x_pos, y_pos in positions]
+        sampler_seconds = get_time() - start_time
+        # both paths must find the same collisions
+        for (per_pixel_number, per_pixel_x, per_pixel_y), (sampler_number, sampler_x, sampler_y) in zip(per_pixel_results, sampler_results):
+            if (per_pixel_number != sampler_number) or (not math.isclose(per_pixel_x, sampler_x, abs_tol=1e-6)) or (not math.isclose(per_pixel_y, sampler_y, abs_tol=1e-6)):
+                raise AssertionError(f"{mask_name} ball: per pixel {(per_pixel_number, per_pixel_x, per_pixel_y)} != sampler {(sampler_number, sampler_x, sampler_y)}")
+        print(f"{mask_name} ball ({len(collision_data)} pixels, {len(positions)} samples)")
+        print(f"    per pixel: {(per_pixel_seconds / len(positions)) * 1000000:.1f} us per sample")
+        print(f"    sampler:   {(sampler_seconds / len(positions)) * 1000000:.1f} us per sample ({sampler.window_copies} window copies)")
+        print(f"    speedup:   {per_pixel_seconds / sampler_seconds:.1f}x")
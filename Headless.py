@@ -0,0 +1,57 @@
+if __name__ == '__main__':
+    # run the editor or game without a window for a number of frames and write frame time statistics
+    # python Headless.py --frames 600 --api Game --level Level1 --script input.json --output headless_output --capture-every 60 --texture-budget-mb 512
+    import os
+    import argparse
+    PATH = os.getcwd()
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    #
+    # arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--api', default='Editor', choices=['Editor', 'Game'])
+    parser.add_argument('--level', default='Level1')
+    parser.add_argument('--script', default=None)
+    parser.add_argument('--output', default=os.path.join(PATH, 'headless_output'))
+    parser.add_argument('--capture-every', type=int, default=0)
+    parser.add_argument('--width', type=int, default=1000)
+    parser.add_argument('--height', type=int, default=700)
+    parser.add_argument('--texture-budget-mb', type=float, default=None)
+    arguments = parser.parse_args()
+    #
+    # time startup
+    from Code.application_setup import StartupTimer
+    Startup = StartupTimer()
+    #
+    # initialize visuals
+    from Code.drawing_functions import initialize_display
+    Screen, Render, gl_context = initialize_display(headless=True, width=arguments.width, height=arguments.height)
+    if arguments.texture_budget_mb is not None:
+        Render.texture_registry.budget_bytes = int(arguments.texture_budget_mb * 1048576)
+    Startup.mark('display')
+    #
+    # initialize time and scripted keys
+    import pygame
+    pygame.init()
+    from Code.application_setup import CursorClass
+    from Code.headless import FixedTimingClass, ScriptedKeysClass, run_headless
+    Time = FixedTimingClass()
+    Keys = ScriptedKeysClass(ScriptedKeysClass.load_script(arguments.script) if arguments.script else None)
+    Cursor = CursorClass(Render)
+    Startup.mark('setup')
+    #
+    # load permanently loaded images
+    from Code.utilities import IMAGE_PATHS, loading_and_unloading_images_manager, ALWAYS_LOADED
+    loading_and_unloading_images_manager(Screen, Render, gl_context, IMAGE_PATHS, [ALWAYS_LOADED], [])
+    Render.build_glyph_atlas(Screen, gl_context)
+    Startup.mark('images')
+    #
+    # initialize Api
+    from Code.application_setup import ApiObject
+    Api = ApiObject(Render)
+    Api.current_api = arguments.api
+    Api.level = arguments.level
+    Startup.mark('api')
+    #
+    # run
+    run_headless(Api, PATH, Screen, gl_context, Render, Time, Keys, Cursor, arguments.frames, arguments.output, arguments.capture_every, Startup)
@@ -0,0 +1,58 @@
+if __name__ == '__main__':
+    # build and maintain level files outside the editor
+    # python LevelTools.py pack --level Level1 --compress
+    # python LevelTools.py deduplicate --level Level1
+    # python LevelTools.py compact --level Level1
+    # the level must not be open in the editor while a command runs
+    import os
+    import argparse
+    PATH = os.getcwd()
+    #
+    # arguments
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    level_parser = argparse.ArgumentParser(add_help=False)
+    level_parser.add_argument('--level', default='Level1')
+    pack_parser = subparsers.add_parser('pack', parents=[level_parser])
+    pack_parser.add_argument('--compress', action='store_true')
+    subparsers.add_parser('deduplicate', parents=[level_parser])
+    subparsers.add_parser('compact', parents=[level_parser])
+    arguments = parser.parse_args()
+    #
+    from Code.utilities import get_level_path
+    from Code.level_manifest import LevelManifest
+    from Code.level_pack import LevelPack
+    from Code.tile_blob_store import TileBlobStore
+    level_path = get_level_path(arguments.level)
+    #
+    if arguments.command == 'pack':
+        # pack the loose tiles of a level; edits to a packed level are written into the pack, so it is never rebuilt from loose tiles
+        if os.path.isfile(f"{level_path}{LevelPack.FILE_NAME}"):
+            raise SystemExit(f"{level_path} is already packed")
+        # tiles the manifest marks as uniform are left out of the pack
+        level_manifest = LevelManifest.open(level_path, writable=True)
+        LevelPack.build(level_path, level_manifest.tile_wh, arguments.compress, level_manifest)
+        level_pack = LevelPack.open(level_path)
+        print(f"packed {level_pack.tile_count} tiles into {level_pack.path} ({os.path.getsize(level_pack.path)} bytes)")
+        level_pack.close()
+    #
+    if arguments.command == 'deduplicate':
+        # move the level's tiles into the shared blob store; identical tiles of every level are stored once
+        level_pack = LevelPack.open(level_path)
+        level_manifest = LevelManifest.open(level_path, level_pack, writable=True)
+        blob_store = TileBlobStore(TileBlobStore.get_store_path(level_path))
+        tiles_moved, blobs_written, bytes_freed = blob_store.deduplicate_level(level_path, level_manifest, level_pack=level_pack)
+        print(f"moved {tiles_moved} tiles into {blob_store.store_path} ({blobs_written} new blobs, {bytes_freed} bytes freed)")
+        if level_pack is not None:
+            print("packed tiles keep their space in the pack until it is compacted")
+            level_pack.close()
+    #
+    if arguments.command == 'compact':
+        # drop the space of tiles that were edited, deduplicated or made uniform since the level was packed
+        level_pack = LevelPack.open(level_path)
+        if level_pack is None:
+            raise SystemExit(f"{level_path} is not packed")
+        level_manifest = LevelManifest.open(level_path, level_pack, writable=True)
+        level_pack.close()
+        bytes_freed = LevelPack.compact(level_path, level_manifest)
+        print(f"compacted {level_path}{LevelPack.FILE_NAME} ({bytes_freed} bytes freed)")